@@ -0,0 +1,164 @@
+import os
+import logging
+from types import MappingProxyType
+
+class AcceptorConfig:
+    """
+    Configuração do conjunto de acceptors usada nas contas de quórum.
+    Com a variável ACCEPTORS definida, o conjunto é fixo e versionado
+    (ACCEPTOR_CONFIG_VERSION) e os quóruns não mudam quando o gossip deixa de
+    ver um acceptor. Os quóruns das fases 1 e 2 podem ser configurados
+    separadamente (Flexible Paxos), desde que todo quórum de fase 1 intersecte
+    todo quórum de fase 2: PHASE1_QUORUM + PHASE2_QUORUM > N.
+    Sem ACCEPTORS, os acceptors vistos pelo gossip são usados com maioria simples.
+    """
+
+    def __init__(self, gossip, logger=None):
+        """
+        Inicializa a configuração a partir das variáveis de ambiente.
+
+        Args:
+            gossip (GossipProtocol): Protocolo Gossip (usado sem configuração fixa)
+            logger (Logger, optional): Logger do nó
+
+        Raises:
+            ValueError: Se a configuração ou os quóruns forem inválidos
+        """
+        self.gossip = gossip
+        self.logger = logger or logging.getLogger("[AcceptorConfig]")
+
+        self.version = int(os.environ.get('ACCEPTOR_CONFIG_VERSION', 1))
+        self.members = self._parse_members(os.environ.get('ACCEPTORS', ''))
+        self.static = bool(self.members)
+
+        # Cache das listas de destino: (membros, {caminho: ((acceptor_id, url), ...)})
+        self._targets_cache = (None, {})
+
+        phase1 = os.environ.get('PHASE1_QUORUM')
+        phase2 = os.environ.get('PHASE2_QUORUM')
+
+        if not self.static:
+            if phase1 or phase2:
+                raise ValueError("PHASE1_QUORUM/PHASE2_QUORUM require a fixed ACCEPTORS configuration")
+            self.logger.warning("ACCEPTORS não definido: quóruns calculados a partir dos acceptors ativos no gossip")
+            return
+
+        size = len(self.members)
+        majority = size // 2 + 1
+        self.phase1 = int(phase1) if phase1 else majority
+        self.phase2 = int(phase2) if phase2 else majority
+
+        if not (1 <= self.phase1 <= size and 1 <= self.phase2 <= size):
+            raise ValueError(f"Quorum sizes must be between 1 and {size}")
+        if self.phase1 + self.phase2 <= size:
+            raise ValueError(f"PHASE1_QUORUM + PHASE2_QUORUM must exceed the number of acceptors ({size})")
+
+        self.logger.info(f"Configuração de acceptors v{self.version}: {sorted(self.members)} "
+                         f"(quórum fase 1: {self.phase1}, fase 2: {self.phase2})")
+
+    @staticmethod
+    def _parse_members(acceptors_str):
+        """
+        Interpreta a lista de acceptors no formato "id:endereço:porta,...".
+
+        Args:
+            acceptors_str (str): Valor da variável ACCEPTORS
+
+        Returns:
+            MappingProxyType: {acceptor_id: {id, role, address, port}}
+        """
+        members = {}
+        for node_str in acceptors_str.split(','):
+            if not node_str.strip():
+                continue
+            parts = node_str.strip().split(':')
+            if len(parts) != 3:
+                raise ValueError(f"Invalid ACCEPTORS entry: {node_str}")
+            members[parts[0]] = {
+                'id': int(parts[0]),
+                'role': 'acceptor',
+                'address': parts[1],
+                'port': int(parts[2])
+            }
+        return MappingProxyType(members)
+
+    def get_members(self):
+        """
+        Obtém os acceptors da configuração.
+
+        Returns:
+            Mapping: {acceptor_id: nó}
+        """
+        if self.static:
+            return self.members
+        return self.gossip.get_nodes_by_role('acceptor')
+
+    def size(self):
+        """Número de acceptors da configuração"""
+        return len(self.get_members())
+
+    def phase1_quorum(self):
+        """Tamanho do quórum de promises (fase 1)"""
+        if self.static:
+            return self.phase1
+        return self.size() // 2 + 1
+
+    def phase2_quorum(self):
+        """Tamanho do quórum de accepts (fase 2), usado também pelos learners"""
+        if self.static:
+            return self.phase2
+        return self.size() // 2 + 1
+
+    def is_member(self, acceptor_id):
+        """
+        Verifica se um acceptor pertence à configuração.
+
+        Args:
+            acceptor_id (int ou str): ID do acceptor
+
+        Returns:
+            bool: True se suas respostas contam para o quórum
+        """
+        return not self.static or str(acceptor_id) in self.members
+
+    def targets(self, path):
+        """
+        Lista pré-calculada de destinos de um endpoint nos acceptors.
+        Sem configuração fixa, a lista é recalculada apenas quando o snapshot
+        de membros do gossip muda.
+
+        Args:
+            path (str): Caminho do endpoint (ex.: "/accept")
+
+        Returns:
+            tuple: ((acceptor_id, url), ...)
+        """
+        members = self.get_members()
+        cache = self._targets_cache
+        if cache[0] is not members:
+            cache = (members, {})
+            self._targets_cache = cache
+
+        targets = cache[1].get(path)
+        if targets is None:
+            targets = tuple(
+                (acceptor_id, f"http://{node['address']}:{node['port']}{path}")
+                for acceptor_id, node in members.items()
+            )
+            cache[1][path] = targets
+        return targets
+
+    def stats(self):
+        """
+        Retorna a configuração em uso.
+
+        Returns:
+            dict: Versão, membros e quóruns
+        """
+        return {
+            "version": self.version,
+            "static": self.static,
+            "members": sorted(self.get_members()),
+            "phase1_quorum": self.phase1_quorum(),
+            "phase2_quorum": self.phase2_quorum()
+        }
@@ -1,11 +1,14 @@
 import json
+import os
 import time
 import threading
 import logging
-import requests
-from flask import request, jsonify
+from flask import request
 
 from base_node import BaseNode
+from wire import jsonify
+from storage import create_acceptor_store
+from outbox import PeerOutbox
 
 class Acceptor(BaseNode):
     """
@@ -19,15 +22,63 @@ class Acceptor(BaseNode):
         """
         super().__init__(app)
         
+        # Armazenamento durável: promises e accepts são gravados antes da resposta
+        self.store = create_acceptor_store(self.node_id)
+        self.storage_timeout = 5  # segundos aguardando o fsync antes de responder com erro
+        state = self.store.load()
+        
         # Estado específico do acceptor
-        self.highest_promised_number = 0
-        self.accepted_proposal_number = 0
-        self.accepted_value = None
+        # A promessa vale para todos os slots (Multi-Paxos): um único prepare
+        # bem-sucedido permite ao líder executar apenas a fase 2 nos slots seguintes
+        self.highest_promised_number = state["highest_promised_number"]
+        self.accepted_proposal_number = state["accepted_proposal_number"]
+        
+        # Log replicado indexado por slot: {slot: {proposal_number, value, client_id}}
+        self.accepted_log = state["accepted_log"]
+        # Maior slot aceito, mantido a cada accept (e na reaplicação do WAL)
+        self.last_accepted_slot = state["last_accepted_slot"]
+        # Slots até compacted_slot já foram aprendidos por todos os learners e
+        # nenhum proposer ainda os recupera na fase 1: saem de accepted_log.
+        # ACCEPTOR_LOG_RETENTION slots abaixo desse limite continuam mantidos
+        # para learners atrasados que voltam a aparecer no gossip
+        self.compacted_slot = state["compacted_slot"]
+        self.log_retention = int(os.environ.get('ACCEPTOR_LOG_RETENTION', 10000))
         
         # Timeout para detecção de líderes inativos
         self.leader_timeout = 10  # segundos
+        
+        # Filas de saída por learner: {learner_id: PeerOutbox}
+        self.learner_outboxes = {}
+        self.outboxes_lock = threading.Lock()
+        self.learner_queue_limit = int(os.environ.get('LEARNER_OUTBOX_LIMIT', 10000))
+        
+        # Notificações acumuladas para um learner são enviadas juntas em um único /learn
+        self.learn_batch_size = int(os.environ.get('LEARN_BATCH_SIZE', 100))
+        self.learn_batch_linger = float(os.environ.get('LEARN_BATCH_LINGER_MS', 2)) / 1000.0
+        
+        # Lease de líder: enquanto a lease concedida a um proposer não expira,
+        # prepares de outros proposers são rejeitados. A lease não é gravada em
+        # disco; após reiniciar, o acceptor assume que uma lease concedida antes
+        # da queda ainda pode estar valendo e aguarda a duração máxima
+        self.lease_max_duration = float(os.environ.get('LEADER_LEASE_DURATION', 3.0))
+        self.lease_holder = None
+        self.lease_proposal_number = None
+        self.lease_expires = time.monotonic() + self.lease_max_duration
+        self.leases_granted = 0
+        self.prepares_blocked_by_lease = 0
+        
+        # Máximo de slots por resposta de /accepted (catch-up dos learners)
+        self.max_accepted_page = int(os.environ.get('ACCEPTED_MAX_PAGE', 1000))
+        
+        # Métricas das filas de notificação dos learners (/metrics)
+        self.learn_retries = self.metrics.counter(
+            "paxos_retries_total", "Retried sends, by call site", ("site",)).labels("learn")
+        self.metrics.gauge("paxos_outbox_queued_messages", "Messages waiting in a peer outbox",
+                           lambda: {peer: len(outbox.queue) for peer, outbox in list(self.learner_outboxes.items())},
+                           ("peer",))
     
-    def _get_default_port(self):
+    @classmethod
+    def _get_default_port(cls):
         """Porta padrão para acceptors"""
         return 4000
     
@@ -42,11 +93,95 @@ class Acceptor(BaseNode):
         def accept():
             """Receber mensagem accept de um proposer"""
             return self._handle_accept(request.json)
+        
+        @self.app.route('/lease', methods=['POST'])
+        def lease():
+            """Receber pedido de lease do líder"""
+            return self._handle_lease(request.json)
+        
+        @self.app.route('/accepted', methods=['GET'])
+        def accepted():
+            """Listar valores aceitos por slot (catch-up dos learners)"""
+            return self._handle_accepted(request.args)
     
     def _start_threads(self):
         """Iniciar threads específicas do acceptor"""
         # Thread para verificar o status do líder
         threading.Thread(target=self._check_leader_status, daemon=True).start()
+        
+        # Thread de snapshot periódico do estado durável
+        threading.Thread(target=self._snapshot_loop, daemon=True).start()
+    
+    def _snapshot_loop(self):
+        """
+        Compactar periodicamente o log e gravar um snapshot do estado,
+        descartando o WAL coberto por ele, quando o WAL atingir o tamanho
+        configurado. Apenas a rotação do WAL e a cópia do estado ocorrem com o
+        lock: a serialização e o fsync do snapshot não bloqueiam prepare,
+        accept e lease.
+        """
+        while True:
+            try:
+                self._compact_log(self._compaction_watermark())
+                
+                seq = None
+                with self.lock:
+                    if self.store.should_snapshot():
+                        seq = self.store.rotate()
+                        state = {
+                            "highest_promised_number": self.highest_promised_number,
+                            "accepted_proposal_number": self.accepted_proposal_number,
+                            "accepted_log": dict(self.accepted_log),
+                            "compacted_slot": self.compacted_slot
+                        }
+                
+                if seq is not None:
+                    self.store.snapshot(state, seq)
+            except Exception as e:
+                self.logger.error(f"Erro ao gravar snapshot: {e}")
+            
+            time.sleep(1)
+    
+    def _compaction_watermark(self):
+        """
+        Último slot que pode sair do log: aprendido por todos os learners
+        ativos e anterior ao primeiro slot que algum proposer ativo ainda pode
+        consultar na fase 1 (publicado por ele como recovery_floor_slot), menos
+        a margem de retenção. Sem learners ou proposers conhecidos, ou com um
+        nó que ainda não publicou seu progresso, nada é compactado.
+        
+        Returns:
+            int: Slot limite da compactação (0 ou negativo: nada a compactar)
+        """
+        learners = self.gossip.get_nodes_by_role('learner')
+        proposers = self.gossip.get_nodes_by_role('proposer')
+        if not learners or not proposers:
+            return 0
+        
+        slots = [(node.get('metadata') or {}).get('last_learned_slot', 0) for node in learners.values()]
+        slots.extend((node.get('metadata') or {}).get('recovery_floor_slot', 0) for node in proposers.values())
+        return min(slots) - self.log_retention
+    
+    def _compact_log(self, watermark):
+        """
+        Descarta do log os slots até o limite informado e registra a
+        compactação no WAL, para que os slots não voltem na recuperação e o
+        acceptor continue informando nas promises até onde o log foi compactado.
+        
+        Args:
+            watermark (int): Último slot a descartar
+        """
+        with self.lock:
+            if watermark <= self.compacted_slot:
+                return
+            
+            for slot in range(self.compacted_slot + 1, watermark + 1):
+                self.accepted_log.pop(slot, None)
+            self.compacted_slot = watermark
+            self.last_accepted_slot = max(self.last_accepted_slot, watermark)
+            self.store.append({"type": "compact", "slot": watermark})
+        
+        self.logger.info(f"Log compactado até o slot {watermark}")
     
     def _check_leader_status(self):
         """
@@ -97,47 +232,178 @@ class Acceptor(BaseNode):
         proposer_id = data.get('proposer_id')
         proposal_number = data.get('proposal_number')
         is_leader_election = data.get('is_leader_election', False)
+        from_slot = data.get('from_slot', 1)
         
         if not all([proposer_id, proposal_number]):
             return jsonify({"error": "Missing required information"}), 400
         
+        mismatch = self._config_mismatch(data)
+        if mismatch:
+            return mismatch
+        
+        ticket = None
+        
         with self.lock:
-            # Para eleição de líder ou se não houver líder, ser mais permissivo
-            leader_unknown = self.gossip.get_leader() is None
+            lease_conflict = self._lease_conflict(proposer_id)
             
-            # Se o número da proposta for maior que o prometido anteriormente, aceitar
-            if proposal_number > self.highest_promised_number:
+            # Outro proposer detém a lease: nenhum prepare é aceito até ela expirar
+            if lease_conflict:
+                self.prepares_blocked_by_lease += 1
+                self.logger.info(f"Rejeitado prepare {proposal_number} do proposer {proposer_id}: {lease_conflict}")
+                result = {
+                    "status": "rejected",
+                    "message": lease_conflict
+                }
+            # Apenas números maiores que o prometido: a promessa vale para todos os
+            # slots e nunca diminui, como na reconstrução a partir do WAL
+            elif proposal_number > self.highest_promised_number:
                 self.highest_promised_number = proposal_number
+                ticket = self.store.append({"type": "promise", "proposal_number": proposal_number})
                 
                 if is_leader_election:
                     self.logger.info(f"Prometido para eleição de líder com proposta {proposal_number} do proposer {proposer_id}")
                 else:
                     self.logger.info(f"Prometido para proposta normal {proposal_number} do proposer {proposer_id}")
                 
-                return jsonify({
-                    "status": "promise",
-                    "accepted_proposal_number": self.accepted_proposal_number,
-                    "accepted_value": self.accepted_value
-                }), 200
+                result = self._build_promise(from_slot)
             else:
-                # Em modo bootstrap ou se não houver líder, ser mais permissivo com propostas de eleição
-                if is_leader_election and leader_unknown:
-                    self.logger.info(f"Prometido para eleição de líder (modo bootstrap) com proposta {proposal_number} do proposer {proposer_id}")
-                    
-                    # Atualizar o maior número prometido
-                    self.highest_promised_number = proposal_number
-                    
-                    return jsonify({
-                        "status": "promise",
-                        "accepted_proposal_number": self.accepted_proposal_number,
-                        "accepted_value": self.accepted_value
-                    }), 200
-                
                 self.logger.info(f"Rejeitado proposta {proposal_number} do proposer {proposer_id} (prometido: {self.highest_promised_number})")
+                result = {
+                    "status": "rejected",
+                    "message": f"Already promised to higher proposal number: {self.highest_promised_number}",
+                    "promised_number": self.highest_promised_number
+                }
+        
+        # A promise só pode ser enviada depois de gravada em disco
+        if not self.store.wait_durable(ticket, timeout=self.storage_timeout):
+            self.logger.error(f"Timeout ao persistir promise {proposal_number}")
+            return jsonify({"error": "Storage unavailable"}), 503
+        
+        return jsonify(result), 200
+    
+    def _lease_conflict(self, proposer_id):
+        """
+        Verifica se uma lease ativa de outro proposer impede um prepare.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            proposer_id (int): ID do proposer que enviou o prepare
+        
+        Returns:
+            str: Motivo da rejeição, ou None se não houver conflito
+        """
+        if self.lease_max_duration <= 0 or time.monotonic() >= self.lease_expires:
+            return None
+        
+        if self.lease_holder is None:
+            return "Leader lease state unknown after restart"
+        
+        if int(self.lease_holder) != int(proposer_id):
+            return f"Leader lease held by proposer {self.lease_holder}"
+        
+        return None
+    
+    def _handle_lease(self, data):
+        """
+        Manipula pedidos de concessão ou renovação de lease do líder.
+        A lease é concedida se nenhum outro proposer detém uma lease ativa e o
+        número de proposta do líder não é menor que o maior prometido.
+        
+        Args:
+            data (dict): Dados do pedido (proposer_id, proposal_number, duration)
+        
+        Returns:
+            Response: Resposta HTTP
+        """
+        proposer_id = data.get('proposer_id')
+        proposal_number = data.get('proposal_number')
+        
+        if not all([proposer_id, proposal_number]):
+            return jsonify({"error": "Missing required information"}), 400
+        
+        if self.lease_max_duration <= 0:
+            return jsonify({"status": "rejected", "message": "Leader leases disabled"}), 200
+        
+        mismatch = self._config_mismatch(data)
+        if mismatch:
+            return mismatch
+        
+        duration = min(float(data.get('duration', self.lease_max_duration)), self.lease_max_duration)
+        
+        with self.lock:
+            lease_conflict = self._lease_conflict(proposer_id)
+            if lease_conflict:
+                return jsonify({"status": "rejected", "message": lease_conflict}), 200
+            
+            if proposal_number < self.highest_promised_number:
                 return jsonify({
                     "status": "rejected",
-                    "message": f"Already promised to higher proposal number: {self.highest_promised_number}"
+                    "message": f"Already promised to higher proposal number: {self.highest_promised_number}",
+                    "promised_number": self.highest_promised_number
                 }), 200
+            
+            if self.lease_holder != proposer_id or self.lease_proposal_number != proposal_number:
+                self.logger.info(f"Lease concedida ao proposer {proposer_id} (proposta {proposal_number}, {duration}s)")
+            
+            self.lease_holder = proposer_id
+            self.lease_proposal_number = proposal_number
+            # O prazo começa a contar depois do envio do pedido pelo líder, que
+            # calcula a validade da sua lease a partir desse envio
+            self.lease_expires = time.monotonic() + duration
+            self.leases_granted += 1
+        
+        # Enquanto a lease vale, uma falha de sondagem não remove o líder
+        self.gossip.hold_leader(proposer_id, duration)
+        
+        return jsonify({"status": "granted", "duration": duration}), 200
+    
+    def _config_mismatch(self, data):
+        """
+        Rejeita mensagens de proposers com outra versão da configuração de acceptors,
+        cujos quóruns podem não intersectar os da configuração local.
+        
+        Args:
+            data (dict): Dados do prepare ou accept
+        
+        Returns:
+            tuple: Resposta de rejeição, ou None se a versão for compatível
+        """
+        version = data.get('config_version')
+        if version is None or not self.acceptor_config.static or version == self.acceptor_config.version:
+            return None
+        
+        self.logger.warning(f"Rejeitada mensagem com configuração v{version} (local: v{self.acceptor_config.version})")
+        return jsonify({
+            "status": "rejected",
+            "message": f"Acceptor configuration version mismatch: {self.acceptor_config.version}"
+        }), 200
+    
+    def _build_promise(self, from_slot):
+        """
+        Monta a resposta promise com os valores já aceitos a partir de um slot.
+        Slots compactados não são listados; compacted_slot informa ao proposer
+        que eles já foram decididos e não devem ser recuperados.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            from_slot (int): Primeiro slot de interesse do proposer
+        
+        Returns:
+            dict: Corpo da resposta promise
+        """
+        accepted = [
+            {"slot": slot, **self.accepted_log[slot]}
+            for slot in range(max(from_slot, self.compacted_slot + 1, 1), self.last_accepted_slot + 1)
+            if slot in self.accepted_log
+        ]
+        
+        return {
+            "status": "promise",
+            "accepted_proposal_number": self.accepted_proposal_number,
+            "accepted": accepted,
+            "last_slot": self.last_accepted_slot,
+            "compacted_slot": self.compacted_slot
+        }
     
     def _handle_accept(self, data):
         """
@@ -154,57 +420,136 @@ class Acceptor(BaseNode):
         value = data.get('value')
         is_leader_election = data.get('is_leader_election', False)
         client_id = data.get('client_id')
+        slot = data.get('slot')
         
         if not all([proposer_id, proposal_number, value]):
             return jsonify({"error": "Missing required information"}), 400
         
+        # Propostas normais sempre pertencem a um slot do log replicado
+        if not is_leader_election and not slot:
+            return jsonify({"error": "Slot required"}), 400
+        
+        mismatch = self._config_mismatch(data)
+        if mismatch:
+            return mismatch
+        
         with self.lock:
+            # Um slot compactado já foi decidido: um novo valor não pode ser aceito nele
+            if not is_leader_election and slot <= self.compacted_slot:
+                self.logger.info(f"Rejeitou accept no slot compactado {slot}")
+                return jsonify({
+                    "status": "rejected",
+                    "message": f"Slot {slot} already decided and compacted",
+                    "promised_number": self.highest_promised_number,
+                    "compacted_slot": self.compacted_slot
+                }), 200
+            
             # Verificar se o número da proposta é maior ou igual ao prometido
-            if proposal_number >= self.highest_promised_number:
-                self.accepted_proposal_number = proposal_number
-                self.accepted_value = value
-                
-                if is_leader_election:
-                    self.logger.info(f"Aceitou proposta de eleição {proposal_number} com valor: {value}")
-                else:
-                    self.logger.info(f"Aceitou proposta normal {proposal_number} com valor: {value}")
-                
-                # Atualizar metadata no Gossip
-                self.gossip.update_local_metadata({
-                    "accepted_proposal_number": proposal_number,
-                    "accepted_value": value
-                })
-                
-                # Se for eleição de líder, atualizar informação no Gossip
-                if is_leader_election and value.startswith("leader:"):
-                    leader_id = int(value.split(":")[1])
-                    self.gossip.set_leader(leader_id)
-                    self.logger.info(f"Atualizando líder para {leader_id}")
-                
-                # Notificar learners
-                threading.Thread(target=self._notify_learners, 
-                                args=(proposal_number, value, client_id, is_leader_election)).start()
-                
-                return jsonify({"status": "accepted"}), 200
-            else:
+            if proposal_number < self.highest_promised_number:
                 self.logger.info(f"Rejeitou proposta {proposal_number} (prometido: {self.highest_promised_number})")
                 return jsonify({
                     "status": "rejected",
-                    "message": f"Already promised to higher proposal number: {self.highest_promised_number}"
+                    "message": f"Already promised to higher proposal number: {self.highest_promised_number}",
+                    "promised_number": self.highest_promised_number
                 }), 200
+            
+            # Aceitar implica prometer: propostas menores não podem mais ser aceitas
+            self.highest_promised_number = proposal_number
+            self.accepted_proposal_number = proposal_number
+            
+            if is_leader_election:
+                ticket = self.store.append({"type": "promise", "proposal_number": proposal_number})
+                self.logger.info(f"Aceitou proposta de eleição {proposal_number} com valor: {value}")
+            else:
+                self.accepted_log[slot] = {
+                    "proposal_number": proposal_number,
+                    "value": value,
+                    "client_id": client_id
+                }
+                self.last_accepted_slot = max(self.last_accepted_slot, slot)
+                ticket = self.store.append({
+                    "type": "accept",
+                    "proposal_number": proposal_number,
+                    "slot": slot,
+                    "value": value,
+                    "client_id": client_id
+                })
+                batch_size = len(value) if isinstance(value, list) else 1
+                self.logger.info(f"Aceitou proposta normal {proposal_number} no slot {slot} com {batch_size} valores")
+            
+            # Atualizar metadata no Gossip
+            self.gossip.update_local_metadata({
+                "accepted_proposal_number": proposal_number,
+                "last_accepted_slot": self.last_accepted_slot
+            })
+        
+        # O accept só pode ser confirmado (e divulgado aos learners) depois de gravado em disco
+        if not self.store.wait_durable(ticket, timeout=self.storage_timeout):
+            self.logger.error(f"Timeout ao persistir accept {proposal_number} (slot {slot})")
+            return jsonify({"error": "Storage unavailable"}), 503
+        
+        # Se for eleição de líder, atualizar informação no Gossip
+        if is_leader_election and value.startswith("leader:"):
+            leader_id = int(value.split(":")[1])
+            self.gossip.set_leader(leader_id)
+            self.logger.info(f"Atualizando líder para {leader_id}")
+        
+        # Notificar learners (apenas enfileira; a entrega é feita pelas filas de cada learner)
+        self._notify_learners(proposal_number, value, client_id, is_leader_election, slot)
+        
+        return jsonify({"status": "accepted", "slot": slot}), 200
     
-    def _notify_learners(self, proposal_number, value, client_id, is_leader_election):
+    def _handle_accepted(self, args):
         """
-        Notificar learners sobre valor aceito
+        Lista os valores aceitos a partir de um slot, no mesmo formato das
+        notificações /learn, para que learners atrasados recuperem lacunas.
+        Slots até compacted_slot não estão mais disponíveis.
+        
+        Parâmetros de consulta:
+            from_slot: primeiro slot (padrão 1)
+            limit: quantidade máxima de slots (limitada a max_accepted_page)
+        
+        Args:
+            args (MultiDict): Parâmetros da requisição
+        
+        Returns:
+            Response: Resposta HTTP
+        """
+        try:
+            from_slot = max(int(args.get('from_slot', 1)), 1)
+            limit = min(int(args.get('limit', self.max_accepted_page)), self.max_accepted_page)
+        except ValueError:
+            return jsonify({"error": "from_slot and limit must be integers"}), 400
+        
+        with self.lock:
+            last_slot = self.last_accepted_slot
+            compacted_slot = self.compacted_slot
+            entries = [
+                {"slot": slot, **self.accepted_log[slot]}
+                for slot in range(from_slot, min(from_slot + limit, last_slot + 1))
+                if slot in self.accepted_log
+            ]
+        
+        return jsonify({
+            "acceptor_id": self.node_id,
+            "entries": entries,
+            "last_slot": last_slot,
+            "compacted_slot": compacted_slot
+        }), 200
+    
+    def _notify_learners(self, proposal_number, value, client_id, is_leader_election, slot=None):
+        """
+        Notificar learners sobre valor aceito.
+        A mensagem é colocada na fila de saída de cada learner; cada fila tem sua
+        própria entrega e retry, então um learner lento não atrasa os demais.
         
         Args:
             proposal_number (int): Número da proposta
             value (str): Valor aceito
             client_id (int): ID do cliente
             is_leader_election (bool): Se esta proposta é para eleição de líder
+            slot (int, optional): Slot do log replicado (None para eleição)
         """
-        self.logger.info(f"Notificando learners sobre proposta {proposal_number}")
-        
         # Obter learners via Gossip
         learners = self.gossip.get_nodes_by_role('learner')
         
@@ -212,54 +557,109 @@ class Acceptor(BaseNode):
             self.logger.warning("Nenhum learner conhecido para notificar")
             return
         
-        self.logger.info(f"Notificando {len(learners)} learners")
-        
-        # Implementar retry com backoff para notificações
-        max_retries = 3
-        base_timeout = 1.0
-        
-        for learner_id, learner in learners.items():
-            for retry in range(max_retries):
-                try:
-                    learner_url = f"http://{learner['address']}:{learner['port']}/learn"
-                    data = {
-                        "acceptor_id": self.node_id,
-                        "proposal_number": proposal_number,
-                        "value": value,
-                        "client_id": client_id,
-                        "is_leader_election": is_leader_election
-                    }
-                    
-                    # Timeout adaptativo com backoff exponencial
-                    timeout = base_timeout * (2 ** retry)
-                    
-                    response = requests.post(learner_url, json=data, timeout=timeout)
-                    
-                    if response.status_code == 200:
-                        self.logger.debug(f"Notificação enviada com sucesso para learner {learner_id}")
-                        break  # Sucesso, sair do loop de retry
-                    else:
-                        self.logger.warning(f"Erro ao notificar learner {learner_id}: {response.text}")
-                except Exception as e:
-                    self.logger.error(f"Erro ao notificar learner {learner_id} (tentativa {retry+1}/{max_retries}): {e}")
-                    
-                    # Se não for a última tentativa, esperar antes de tentar novamente
-                    if retry < max_retries - 1:
-                        time.sleep(base_timeout * (2 ** retry) * 0.5)  # Backoff com valor reduzido
+        self.logger.info(f"Notificando {len(learners)} learners sobre proposta {proposal_number}")
+        
+        data = {
+            "proposal_number": proposal_number,
+            "slot": slot,
+            "value": value,
+            "client_id": client_id,
+            "is_leader_election": is_leader_election
+        }
+        
+        with self.outboxes_lock:
+            # Descartar filas de learners que saíram do cluster e já foram esvaziadas
+            for learner_id in list(self.learner_outboxes):
+                if learner_id not in learners and self.learner_outboxes[learner_id].is_idle():
+                    del self.learner_outboxes[learner_id]
+            
+            outboxes = []
+            for learner_id in learners:
+                if learner_id not in self.learner_outboxes:
+                    self.learner_outboxes[learner_id] = PeerOutbox(
+                        learner_id, self._send_to_learner, self.executor, self.logger,
+                        max_queue=self.learner_queue_limit,
+                        max_batch=self.learn_batch_size,
+                        linger=self.learn_batch_linger,
+                        retries=self.learn_retries
+                    )
+                outboxes.append(self.learner_outboxes[learner_id])
+        
+        for outbox in outboxes:
+            outbox.enqueue(data)
+    
+    def _send_to_learner(self, learner_id, entries, timeout):
+        """
+        Entregar um lote de notificações a um learner em um único /learn
+        (usado pelas filas de saída)
+        
+        Args:
+            learner_id (str): ID do learner
+            entries (list): Notificações, em ordem de aceitação
+            timeout (float): Timeout da requisição em segundos
+        
+        Returns:
+            bool: True se o learner confirmou o recebimento
+        """
+        learner = self.gossip.get_nodes_by_role('learner').get(learner_id)
+        if not learner:
+            self.logger.warning(f"Learner {learner_id} não é mais conhecido")
+            return False
+        
+        learner_url = f"http://{learner['address']}:{learner['port']}/learn"
+        data = {
+            "acceptor_id": self.node_id,
+            "entries": entries
+        }
+        response = self.transport.post(learner_url, json=data, timeout=timeout)
+        
+        if response.status_code == 200:
+            self.logger.debug(f"{len(entries)} notificações enviadas com sucesso para learner {learner_id}")
+            return True
+        
+        self.logger.warning(f"Erro ao notificar learner {learner_id}: {response.text}")
+        return False
     
     def _handle_view_logs(self):
-        """Manipulador para a rota view-logs"""
+        """
+        Manipulador para a rota view-logs. Mostra apenas os últimos slots
+        aceitos; o log completo é paginado por /accepted.
+        """
         learners = self.gossip.get_nodes_by_role('learner')
         
+        with self.lock:
+            first_recent = max(self.compacted_slot, self.last_accepted_slot - 10) + 1
+            recent = [
+                {"slot": slot, **self.accepted_log[slot]}
+                for slot in range(first_recent, self.last_accepted_slot + 1)
+                if slot in self.accepted_log
+            ]
+            accepted_slots_count = len(self.accepted_log)
+        
         return jsonify({
             "id": self.node_id,
             "role": self.node_role,
             "highest_promised_number": self.highest_promised_number,
-            "accepted_proposal": {
-                "number": self.accepted_proposal_number,
-                "value": self.accepted_value
+            "accepted_proposal_number": self.accepted_proposal_number,
+            "accepted_slots_count": accepted_slots_count,
+            "last_accepted_slot": self.last_accepted_slot,
+            "compacted_slot": self.compacted_slot,
+            "recent_accepted": recent,
+            "storage": self.store.stats(),
+            "lease": {
+                "holder": self.lease_holder,
+                "proposal_number": self.lease_proposal_number,
+                "remaining": round(max(0, self.lease_expires - time.monotonic()), 3),
+                "max_duration": self.lease_max_duration,
+                "granted": self.leases_granted,
+                "prepares_blocked": self.prepares_blocked_by_lease
             },
             "learners_count": len(learners),
+            "learner_outboxes": {
+                learner_id: outbox.stats() for learner_id, outbox in list(self.learner_outboxes.items())
+            },
+            "workers": self.executor.stats(),
+            "transport": self.transport.stats(),
             "known_nodes_count": len(self.gossip.get_all_nodes()),
             "current_leader": self.gossip.get_leader()
         }), 200
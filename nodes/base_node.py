@@ -4,11 +4,18 @@ import time
 import threading
 import logging
 import random
-import requests
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 
 # Importar módulo Gossip
 from gossip_protocol import GossipProtocol
+from transport import HttpTransport
+from executor import BoundedExecutor
+from acceptor_config import AcceptorConfig
+from metrics import MetricsRegistry, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from wire import WireRequest
+
+# Valor usado pelo líder para preencher lacunas do log replicado durante a recuperação
+NOOP_VALUE = "paxos:noop"
 
 class BaseNode:
     """
@@ -59,8 +66,18 @@ class BaseNode:
         # Estado comum
         self.lock = threading.Lock()
         
-        # Criar ou usar aplicação Flask fornecida
+        # Criar ou usar aplicação Flask fornecida; request.json também decodifica msgpack
         self.app = app or Flask(__name__)
+        self.app.request_class = WireRequest
+        
+        # Métricas expostas em /metrics (formato Prometheus)
+        self.metrics = MetricsRegistry({"role": self.node_role, "node_id": self.node_id})
+        
+        # Transporte HTTP com pool de conexões, compartilhado com o Gossip
+        self.transport = HttpTransport(self.logger, self.metrics)
+        
+        # Pool de workers limitado para os envios em leque (prepare, accept, notificações)
+        self.executor = BoundedExecutor(f"{self.node_role}-{self.node_id}", self.logger)
         
         # Inicializar Gossip
         self.gossip = GossipProtocol(
@@ -68,13 +85,27 @@ class BaseNode:
             self.node_role, 
             self.hostname, 
             self.port, 
-            self.seed_nodes
+            self.seed_nodes,
+            transport=self.transport,
+            executor=self.executor,
+            metrics=self.metrics
         )
         
+        # Conjunto de acceptors e tamanhos de quórum (fixos quando ACCEPTORS está definido)
+        self.acceptor_config = AcceptorConfig(self.gossip, self.logger)
+        
+        # Métricas de profundidade de filas e threads, calculadas na coleta
+        self.metrics.gauge("paxos_executor_pending_tasks", "Tasks running or queued in the worker pool",
+                           lambda: self.executor.pending)
+        self.metrics.gauge("paxos_executor_queued_tasks", "Tasks waiting for a free worker",
+                           lambda: max(0, self.executor.pending - self.executor.max_workers))
+        self.metrics.gauge("paxos_threads", "Live threads in the process", threading.active_count)
+        
         # Registrar rotas comuns
         self._register_common_routes()
     
-    def _get_default_port(self):
+    @classmethod
+    def _get_default_port(cls):
         """
         Retorna a porta padrão para este tipo de nó.
         Deve ser sobrescrito por classes filhas.
@@ -120,6 +151,11 @@ class BaseNode:
         def view_logs():
             """Visualizar logs e estado do nó"""
             return self._handle_view_logs()
+        
+        @self.app.route('/metrics', methods=['GET'])
+        def metrics():
+            """Métricas do nó no formato texto do Prometheus"""
+            return Response(self.metrics.render(), content_type=METRICS_CONTENT_TYPE)
     
     def _handle_view_logs(self):
         """
@@ -133,10 +169,9 @@ class BaseNode:
             "current_leader": self.gossip.get_leader()
         }), 200
     
-    # No método start() do BaseNode
-    def start(self):
+    def _prepare(self):
         """
-        Inicia o nó, incluindo o protocolo Gossip e o servidor Flask.
+        Inicia o protocolo Gossip, registra as rotas e inicia as threads do nó.
         """
         # Iniciar protocolo Gossip
         self.gossip.start(self.app)
@@ -148,42 +183,77 @@ class BaseNode:
         self._start_threads()
         
         self.logger.info(f"Nó {self.node_role} inicializado com ID {self.node_id}")
+    
+    def start(self):
+        """
+        Inicia o nó, incluindo o protocolo Gossip e o servidor Flask (uma thread por conexão).
+        """
+        self._prepare()
+        self.app.run(host='0.0.0.0', port=self.port, threaded=True)
+    
+    @classmethod
+    def serve(cls):
+        """
+        Cria o nó e atende requisições no servidor escolhido por SERVER_MODE:
+        - threaded: servidor do Flask/Werkzeug, com uma thread por conexão
+        - gunicorn: um único worker gthread do gunicorn; as conexões ociosas
+          (keep-alive) ficam no poller do worker e apenas as requisições em
+          andamento ocupam uma thread do pool
+        - auto (padrão): gunicorn, se instalado, senão threaded
+        
+        No gunicorn o nó é criado dentro do worker, depois do fork: threads,
+        arquivos abertos e o estado do nó existem em um único processo. Nunca
+        há mais de um worker, pois cada um teria estado Paxos próprio.
+        """
+        logger = logging.getLogger('[Server]')
+        mode = os.environ.get('SERVER_MODE', 'auto').lower()
         
-        # Verificar se gunicorn está disponível
-        try:
-            import gunicorn
-            has_gunicorn = True
-        except ImportError:
-            has_gunicorn = False
+        if mode in ('auto', 'gunicorn'):
+            try:
+                from gunicorn.app.base import BaseApplication
+                mode = 'gunicorn'
+            except ImportError:
+                if mode == 'gunicorn':
+                    logger.warning("gunicorn não está instalado; usando o servidor threaded")
+                mode = 'threaded'
         
-        # Se for o proposer1 (líder) e o gunicorn estiver disponível, usar múltiplos workers
-        if has_gunicorn and self.node_role == 'proposer' and self.node_id == 1:
-            from gunicorn.app.base import BaseApplication
-            
-            class FlaskApplication(BaseApplication):
-                def __init__(self, app, options=None):
-                    self.application = app
-                    self.options = options or {}
-                    super().__init__()
-                    
-                def load_config(self):
-                    for key, value in self.options.items():
-                        self.cfg.set(key.lower(), value)
-                        
-                def load(self):
-                    return self.application
+        if mode != 'gunicorn':
+            if mode != 'threaded':
+                logger.warning(f"SERVER_MODE desconhecido: {mode}; usando o servidor threaded")
+            cls().start()
+            return
+        
+        class NodeApplication(BaseApplication):
+            def __init__(self, options):
+                self.options = options
+                super().__init__()
             
-            gunicorn_options = {
-                'bind': '0.0.0.0:' + str(self.port),
-                'workers': 4,
-                'threads': 2,
-                'timeout': 30
-            }
+            def load_config(self):
+                for key, value in self.options.items():
+                    self.cfg.set(key, value)
             
-            FlaskApplication(self.app, gunicorn_options).run()
-        else:
-            # Iniciar servidor Flask normalmente
-            self.app.run(host='0.0.0.0', port=self.port, threaded=True)
+            def load(self):
+                # Executado no worker, após o fork
+                node = cls()
+                node._prepare()
+                return node.app
+        
+        port = int(os.environ.get('PORT', cls._get_default_port()))
+        options = {
+            'bind': f"0.0.0.0:{port}",
+            'workers': 1,
+            'worker_class': 'gthread',
+            'threads': int(os.environ.get('SERVER_THREADS', 64)),
+            'worker_connections': int(os.environ.get('SERVER_MAX_CONNECTIONS', 4096)),
+            'backlog': int(os.environ.get('SERVER_BACKLOG', 2048)),
+            # Conexões keep-alive dos pools de outros nós ficam abertas entre mensagens
+            'keepalive': int(os.environ.get('SERVER_KEEPALIVE', 30)),
+            'timeout': int(os.environ.get('SERVER_WORKER_TIMEOUT', 30)),
+            'graceful_timeout': 5
+        }
+        logger.info(f"Servidor gunicorn: 1 worker gthread, {options['threads']} threads, "
+                    f"até {options['worker_connections']} conexões")
+        NodeApplication(options).run()
     
     def _register_routes(self):
         """
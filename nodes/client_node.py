@@ -1,12 +1,15 @@
 import json
+import os
 import time
 import threading
 import logging
 import random
-import requests
-from flask import request, jsonify
+from collections import deque, OrderedDict, defaultdict
+from concurrent.futures import Future, as_completed, TimeoutError as FuturesTimeoutError
+from flask import request, Response
 
 from base_node import BaseNode
+from wire import jsonify
 
 class Client(BaseNode):
     """
@@ -21,9 +24,38 @@ class Client(BaseNode):
         super().__init__(app)
         
         # Estado específico do cliente
-        self.responses = []
+        # Respostas recebidas: apenas as mais recentes são mantidas
+        self.max_responses = int(os.environ.get('CLIENT_MAX_RESPONSES', 1000))
+        self.responses = deque(maxlen=self.max_responses)
+        
+        # Cada learner notifica os mesmos valores; as notificações já recebidas
+        # são identificadas pela posição (slot, batch_index) dentro de uma janela
+        self.dedup_window = int(os.environ.get('CLIENT_DEDUP_WINDOW', 10000))
+        self.seen_notifications = OrderedDict()
+        self.notifications_received = 0
+        self.duplicates_dropped = 0
+        
+        # Maior slot em que um valor deste cliente foi decidido (token das leituras de sessão)
+        self.session_slot = 0
+        # Envios sem wait_for_commit ainda não confirmados: uma leitura de sessão
+        # aguarda o commit deles antes de usar session_slot
+        self.session_sends = deque()
+        
+        # Envios aguardando confirmação de commit, resolvidos por /notify.
+        # O envio aguarda pelo valor até ser confirmado e, com o slot
+        # conhecido, também pela posição
+        self.commit_timeout = float(os.environ.get('SEND_COMMIT_TIMEOUT', 5.0))
+        self.position_waiters = {}  # {(slot, batch_index): waiter}
+        self.value_waiters = defaultdict(deque)  # {valor: deque(waiter)}
+        self.commits_confirmed = 0
+        self.commits_timed_out = 0
+        self.commit_latency = self.metrics.histogram(
+            "paxos_client_commit_latency_seconds", "Time from sending a value to its commit notification")
+        self.metrics.gauge("paxos_client_pending_commits", "Sends waiting for a commit notification",
+                           lambda: sum(len(w) for w in list(self.value_waiters.values())))
     
-    def _get_default_port(self):
+    @classmethod
+    def _get_default_port(cls):
         """Porta padrão para clientes"""
         return 6000
     
@@ -34,6 +66,11 @@ class Client(BaseNode):
             """Enviar valor para o sistema Paxos"""
             return self._handle_send(request.json)
         
+        @self.app.route('/send-stream', methods=['POST'])
+        def send_stream():
+            """Enviar vários valores e receber as confirmações de commit em stream"""
+            return self._handle_send_stream(request.get_data(as_text=True), request.args)
+        
         @self.app.route('/notify', methods=['POST'])
         def notify():
             """Receber notificação de learner sobre valor aprendido"""
@@ -42,17 +79,22 @@ class Client(BaseNode):
         @self.app.route('/read', methods=['GET'])
         def read():
             """Ler valores aprendidos"""
-            return self._handle_read()
+            return self._handle_read(request.args)
         
         @self.app.route('/get-responses', methods=['GET'])
         def get_responses():
             """Obter respostas recebidas"""
             with self.lock:
-                return jsonify({"responses": self.responses}), 200
+                return jsonify({"responses": list(self.responses)}), 200
     
     def _handle_send(self, data):
         """
         Manipula requisições para enviar valores ao sistema.
+        Com "wait_for_commit": true a resposta só é enviada quando um learner
+        notifica o valor aprendido, ou após "timeout" segundos (padrão
+        SEND_COMMIT_TIMEOUT), e inclui a posição decidida e a latência do commit.
+        Sem ele, a resposta segue assim que o proposer recebe o valor, e o
+        commit continua sendo acompanhado para as leituras de sessão.
         
         Args:
             data (dict): Dados da requisição
@@ -65,11 +107,290 @@ class Client(BaseNode):
         if not value:
             return jsonify({"error": "Value required"}), 400
         
+        if not data.get('wait_for_commit'):
+            waiter = self._add_waiter(value)
+            self._propose_for_waiter(waiter)
+            if waiter["future"].done() and waiter["future"].result().get("status") == "error":
+                self._remove_waiter(waiter)
+                return jsonify(waiter["sent"]), waiter["future"].result()["http_status"]
+            with self.lock:
+                self._prune_session_sends()
+                self.session_sends.append(waiter)
+            return jsonify(waiter["sent"]), 200
+        
+        try:
+            timeout = float(data.get('timeout', self.commit_timeout))
+        except (TypeError, ValueError):
+            return jsonify({"error": "timeout must be a number"}), 400
+        
+        waiter = self._add_waiter(value)
+        self._propose_for_waiter(waiter)
+        try:
+            waiter["future"].result(timeout=timeout)
+        except FuturesTimeoutError:
+            pass
+        finally:
+            self._remove_waiter(waiter)
+        
+        ack = self._commit_ack(waiter)
+        status_codes = {"committed": 200, "timeout": 504}
+        return jsonify(ack), status_codes.get(ack["status"], ack.get("http_status", 500))
+    
+    def _handle_send_stream(self, body, args):
+        """
+        Envia vários valores em uma única requisição e responde em NDJSON,
+        uma linha por valor, à medida que os commits são confirmados.
+        O corpo tem um objeto JSON por linha ({"value": ...}).
+        
+        Args:
+            body (str): Corpo da requisição em NDJSON
+            args (MultiDict): Parâmetros da requisição (timeout)
+        
+        Returns:
+            Response: Resposta HTTP
+        """
+        try:
+            values = [json.loads(line)["value"] for line in body.splitlines() if line.strip()]
+            timeout = float(args.get('timeout', self.commit_timeout))
+        except (ValueError, KeyError, TypeError):
+            return jsonify({"error": "Body must contain one JSON object with a value per line"}), 400
+        
+        if not values or not all(values):
+            return jsonify({"error": "Value required"}), 400
+        
+        waiters = {}
+        for index, value in enumerate(values):
+            waiter = self._add_waiter(value)
+            waiter["index"] = index
+            waiters[waiter["future"]] = waiter
+            # O envio ao proposer é feito pelo pool; a espera pelo commit não ocupa workers
+            if self.executor.submit(self._propose_for_waiter, waiter) is None:
+                waiter["future"].set_result({"status": "error", "error": "Client worker queue full", "http_status": 503})
+        
+        self.logger.info(f"Stream de envio com {len(values)} valores iniciado")
+        
+        def generate():
+            try:
+                for future in as_completed(waiters, timeout=timeout):
+                    yield json.dumps(self._commit_ack(waiters[future])) + "\n"
+            except FuturesTimeoutError:
+                for future, waiter in waiters.items():
+                    if not future.done():
+                        yield json.dumps(self._commit_ack(waiter)) + "\n"
+            finally:
+                for waiter in waiters.values():
+                    self._remove_waiter(waiter)
+        
+        return Response(generate(), mimetype='application/x-ndjson')
+    
+    def _add_waiter(self, value):
+        """
+        Registra um envio que aguarda confirmação de commit. O registro é feito
+        antes do envio ao proposer para não perder uma notificação rápida.
+        
+        Args:
+            value (str): Valor enviado
+        
+        Returns:
+            dict: Registro com a Future resolvida por /notify
+        """
+        waiter = {"value": value, "future": Future(), "sent_at": time.time(), "sent": None, "position": None}
+        with self.lock:
+            self.value_waiters[self._value_key(value)].append(waiter)
+        return waiter
+    
+    @staticmethod
+    def _value_key(value):
+        """Chave de um valor em value_waiters (valores JSON compostos não são hashable)"""
+        return value if isinstance(value, str) else json.dumps(value, sort_keys=True)
+    
+    def _remove_waiter(self, waiter):
+        """
+        Remove o registro de um envio que terminou ou expirou.
+        
+        Args:
+            waiter (dict): Registro do envio
+        """
+        with self.lock:
+            self._drop_waiter(waiter)
+    
+    def _drop_waiter(self, waiter):
+        """
+        Remove o registro de um envio das filas de espera por posição e por valor.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            waiter (dict): Registro do envio
+        """
+        if waiter["position"] is not None and self.position_waiters.get(waiter["position"]) is waiter:
+            del self.position_waiters[waiter["position"]]
+        self._discard_value_waiter(waiter)
+    
+    def _prune_session_sends(self):
+        """
+        Descarta do início de session_sends os envios já confirmados e os que
+        não foram confirmados dentro de SEND_COMMIT_TIMEOUT.
+        Deve ser chamado com self.lock adquirido.
+        """
+        now = time.time()
+        while self.session_sends:
+            waiter = self.session_sends[0]
+            if not waiter["future"].done() and now < waiter["sent_at"] + self.commit_timeout:
+                break
+            self.session_sends.popleft()
+            self._drop_waiter(waiter)
+    
+    def _await_session_sends(self):
+        """
+        Aguarda a notificação de commit dos envios deste cliente ainda pendentes,
+        cada um até SEND_COMMIT_TIMEOUT após o envio, para que session_slot
+        cubra todas as escritas já aceitas pelo proposer.
+        
+        Returns:
+            bool: True se nenhum envio ficou sem confirmação
+        """
+        with self.lock:
+            self._prune_session_sends()
+            pending = [waiter for waiter in self.session_sends if not waiter["future"].done()]
+        
+        for waiter in pending:
+            try:
+                waiter["future"].result(timeout=max(waiter["sent_at"] + self.commit_timeout - time.time(), 0))
+            except FuturesTimeoutError:
+                return False
+        return True
+    
+    def _propose_for_waiter(self, waiter):
+        """
+        Envia o valor de um registro ao proposer. Com o slot conhecido, o
+        registro passa a aguardar também pela posição, mas continua associado
+        ao valor até ser confirmado: se a instância falhar, o proposer
+        reenfileira o lote e o valor pode ser decidido em outro slot.
+        
+        Args:
+            waiter (dict): Registro do envio
+        """
+        result, status = self._propose(waiter["value"])
+        waiter["sent"] = result
+        
+        if status != 200:
+            waiter["future"].set_result({"status": "error", "error": result.get("error"), "http_status": status})
+            return
+        
+        slot = result.get("slot")
+        if slot is None:
+            return
+        
+        position = (slot, result.get("batch_index"))
+        with self.lock:
+            if waiter["future"].done():
+                return
+            waiter["position"] = position
+            
+            # A notificação pode ter chegado antes da resposta do proposer
+            notification = self.seen_notifications.get(position)
+            if notification is not None:
+                self._discard_value_waiter(waiter)
+                waiter["future"].set_result(notification)
+            else:
+                self.position_waiters[position] = waiter
+    
+    def _resolve_waiter(self, notification):
+        """
+        Confirma o commit do envio correspondente a uma notificação.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            notification (dict): Notificação recebida do learner
+        """
+        position = (notification.get('slot'), notification.get('batch_index'))
+        waiter = self.position_waiters.pop(position, None)
+        if waiter is None:
+            queue = self.value_waiters.get(self._value_key(notification['value']))
+            pending = [candidate for candidate in queue or [] if not candidate["future"].done()]
+            if not pending:
+                return
+            # Preferir envios cuja posição ainda é desconhecida; um envio já
+            # posicionado em outro slot foi reenfileirado pelo proposer
+            waiter = next((candidate for candidate in pending if candidate["position"] is None), pending[0])
+            if waiter["position"] is not None and self.position_waiters.get(waiter["position"]) is waiter:
+                del self.position_waiters[waiter["position"]]
+        
+        self._discard_value_waiter(waiter)
+        if not waiter["future"].done():
+            waiter["future"].set_result(notification)
+    
+    def _discard_value_waiter(self, waiter):
+        """
+        Remove um registro da fila de espera do seu valor.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            waiter (dict): Registro do envio
+        """
+        key = self._value_key(waiter["value"])
+        queue = self.value_waiters.get(key)
+        if queue is not None:
+            if waiter in queue:
+                queue.remove(waiter)
+            if not queue:
+                del self.value_waiters[key]
+    
+    def _commit_ack(self, waiter):
+        """
+        Monta a confirmação de um envio.
+        
+        Args:
+            waiter (dict): Registro do envio
+        
+        Returns:
+            dict: Status (committed, timeout ou error), posição decidida e latência
+        """
+        sent = waiter["sent"] or {}
+        ack = {"value": waiter["value"], "proposer_id": sent.get("proposer_id")}
+        if "index" in waiter:
+            ack["index"] = waiter["index"]
+        
+        if not waiter["future"].done():
+            with self.lock:
+                self.commits_timed_out += 1
+            ack.update({"status": "timeout", "slot": sent.get("slot"), "batch_index": sent.get("batch_index")})
+            return ack
+        
+        result = waiter["future"].result()
+        if result.get("status") == "error":
+            ack.update(result)
+            return ack
+        
+        with self.lock:
+            self.commits_confirmed += 1
+        latency = result["received_at"] - waiter["sent_at"]
+        self.commit_latency.observe(latency)
+        ack.update({
+            "status": "committed",
+            "slot": result.get("slot"),
+            "batch_index": result.get("batch_index"),
+            "proposal_number": result.get("proposal_number"),
+            "learner_id": result.get("learner_id"),
+            "commit_latency_ms": round(latency * 1000, 3)
+        })
+        return ack
+    
+    def _propose(self, value):
+        """
+        Envia um valor ao líder (ou a um proposer aleatório).
+        
+        Args:
+            value (str): Valor a enviar
+        
+        Returns:
+            tuple: (corpo da resposta, status HTTP)
+        """
         # Obter proposers via Gossip
         proposers = self.gossip.get_nodes_by_role('proposer')
         
         if not proposers:
-            return jsonify({"error": "No proposers available"}), 503
+            return {"error": "No proposers available"}, 503
         
         # Obter líder atual
         leader_id = self.gossip.get_leader()
@@ -92,11 +413,11 @@ class Client(BaseNode):
                 "client_id": self.node_id
             }
             
-            response = requests.post(proposer_url, json=send_data, timeout=5)
+            response = self.transport.post(proposer_url, json=send_data, timeout=5)
             
             if response.status_code == 200:
                 self.logger.info(f"Valor '{value}' enviado para proposer {target_proposer['id']}")
-                return jsonify({"status": "value sent", "proposer_id": target_proposer['id']}), 200
+                return self._value_sent(target_proposer['id'], response.json())
             elif response.status_code == 403:
                 # Não é o líder, tente o líder sugerido
                 result = response.json()
@@ -106,24 +427,49 @@ class Client(BaseNode):
                     new_target = proposers[str(new_leader)]
                     proposer_url = f"http://{new_target['address']}:{new_target['port']}/propose"
                     
-                    response = requests.post(proposer_url, json=send_data, timeout=5)
+                    response = self.transport.post(proposer_url, json=send_data, timeout=5)
                     
                     if response.status_code == 200:
                         self.logger.info(f"Valor '{value}' enviado para líder {new_target['id']}")
-                        return jsonify({"status": "value sent", "proposer_id": new_target['id']}), 200
+                        return self._value_sent(new_target['id'], response.json())
                     else:
-                        return jsonify({"error": f"Error sending to leader: {response.text}"}), 500
+                        return {"error": f"Error sending to leader: {response.text}"}, 500
                 else:
-                    return jsonify({"error": "Leader not available"}), 503
+                    return {"error": "Leader not available"}, 503
             else:
-                return jsonify({"error": f"Error sending to proposer: {response.text}"}), 500
+                return {"error": f"Error sending to proposer: {response.text}"}, 500
         except Exception as e:
             self.logger.error(f"Erro ao enviar para proposer: {e}")
-            return jsonify({"error": str(e)}), 500
+            return {"error": str(e)}, 500
+    
+    def _value_sent(self, proposer_id, result):
+        """
+        Monta a resposta de /send. O slot retornado pelo proposer é apenas o
+        slot inicial do lote (None se o lote aguarda na fila) e não serve como
+        token de leitura: o proposer pode reenfileirar o lote em outro slot.
+        O token é o slot informado pelo learner na notificação de commit.
+        
+        Args:
+            proposer_id (int): ID do proposer que recebeu o valor
+            result (dict): Resposta do /propose
+        
+        Returns:
+            tuple: (corpo da resposta, status HTTP)
+        """
+        return {
+            "status": "value sent",
+            "proposer_id": proposer_id,
+            "slot": result.get("slot"),
+            "batch_index": result.get("batch_index")
+        }, 200
     
     def _handle_notify(self, data):
         """
         Manipula notificações de valores aprendidos dos learners.
+        Aceita uma notificação única ou um lote no formato
+        {"learner_id", "notifications": [{proposal_number, slot, batch_index, value, learned_at}]}.
+        Notificações repetidas (enviadas por outros learners) são descartadas;
+        as que não trazem slot e batch_index não são deduplicadas.
         
         Args:
             data (dict): Dados da notificação
@@ -132,32 +478,89 @@ class Client(BaseNode):
             Response: Resposta HTTP
         """
         learner_id = data.get('learner_id')
-        proposal_number = data.get('proposal_number')
-        value = data.get('value')
-        learned_at = data.get('learned_at')
+        notifications = data.get('notifications') if 'notifications' in data else [data]
         
-        if not all([learner_id, proposal_number, value]):
+        if not learner_id:
             return jsonify({"error": "Missing required information"}), 400
         
+        valid = [n for n in notifications or [] if n.get('proposal_number') and n.get('value')]
+        if not valid:
+            return jsonify({"error": "Missing required information"}), 400
+        
+        now = time.time()
+        received_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        accepted = 0
+        
         with self.lock:
-            self.responses.append({
-                "learner_id": learner_id,
-                "proposal_number": proposal_number,
-                "value": value,
-                "learned_at": learned_at,
-                "received_at": time.strftime("%Y-%m-%d %H:%M:%S")
-            })
+            for notification in valid:
+                self.notifications_received += 1
+                position = (notification.get('slot'), notification.get('batch_index'))
+                # Sem posição (learners antigos), a notificação não pode ser deduplicada
+                positioned = None not in position
+                if positioned and position in self.seen_notifications:
+                    self.duplicates_dropped += 1
+                    continue
+                
+                learned = {
+                    "learner_id": learner_id,
+                    "proposal_number": notification['proposal_number'],
+                    "slot": notification.get('slot'),
+                    "batch_index": notification.get('batch_index'),
+                    "value": notification['value'],
+                    "learned_at": notification.get('learned_at'),
+                    "received_at": now
+                }
+                if positioned:
+                    self.seen_notifications[position] = learned
+                    if len(self.seen_notifications) > self.dedup_window:
+                        self.seen_notifications.popitem(last=False)
+                
+                self.responses.append({**learned, "received_at": received_at})
+                self._resolve_waiter(learned)
+                # Slot em que o valor foi de fato decidido: token das leituras de sessão
+                if learned["slot"] is not None:
+                    self.session_slot = max(self.session_slot, learned["slot"])
+                accepted += 1
         
-        self.logger.info(f"Notificação recebida do learner {learner_id}: valor '{value}' foi aprendido")
-        return jsonify({"status": "acknowledged"}), 200
+        self.logger.info(f"Notificação recebida do learner {learner_id}: {accepted} valores aprendidos ({len(valid) - accepted} repetidos)")
+        return jsonify({"status": "acknowledged", "count": accepted}), 200
     
-    def _handle_read(self):
+    def _handle_read(self, args=None):
         """
         Manipula requisições para ler valores do sistema.
+        Os parâmetros offset, since, limit e stream são repassados ao learner;
+        como os índices do log são iguais em todos os learners, um cursor obtido
+        de um learner vale para qualquer outro. Com consistency=linearizable a
+        leitura é servida pelo líder a partir do seu estado protegido por lease.
+        O parâmetro min_slot (slot confirmado por /send com wait_for_commit)
+        garante que a leitura inclua a escrita correspondente; com
+        consistency=session é usado o maior slot em que um valor deste
+        cliente foi decidido, segundo as notificações dos learners, depois de
+        aguardar o commit dos envios feitos sem wait_for_commit.
+        
+        Args:
+            args (MultiDict, optional): Parâmetros da requisição
         
         Returns:
             Response: Resposta HTTP
         """
+        params = {k: v for k, v in (args or {}).items() if k in ('offset', 'since', 'limit', 'stream', 'min_slot')}
+        consistency = (args or {}).get('consistency', '').lower()
+        
+        if consistency == 'session' and not self._await_session_sends():
+            return jsonify({"error": "Previous writes of this session not yet committed"}), 504
+        
+        if consistency == 'session' and self.session_slot:
+            try:
+                params['min_slot'] = max(int(params.get('min_slot', 0)), self.session_slot)
+            except ValueError:
+                return jsonify({"error": "min_slot must be an integer"}), 400
+        
+        if consistency == 'linearizable':
+            if params.pop('stream', '').lower() == 'true':
+                return jsonify({"error": "Streaming is not supported for linearizable reads"}), 400
+            return self._read_from_leader(params)
+        
         # Encontrar learners via Gossip
         learners = self.gossip.get_nodes_by_role('learner')
         
@@ -170,18 +573,85 @@ class Client(BaseNode):
         
         try:
             learner_url = f"http://{learner['address']}:{learner['port']}/get-values"
-            response = requests.get(learner_url, timeout=5)
+            
+            # Modo stream: repassar o NDJSON do learner sem montar a lista em memória
+            if params.get('stream', '').lower() == 'true':
+                response = self.transport.get(learner_url, params=params, timeout=5, stream=True)
+                if response.status_code != 200:
+                    return jsonify({"error": f"Error reading from learner: {response.text}"}), 500
+                
+                self.logger.info(f"Leitura em stream iniciada a partir do learner {learner_id}")
+                return Response(response.iter_content(chunk_size=None), mimetype='application/x-ndjson')
+            
+            response = self.transport.get(learner_url, params=params, timeout=5)
             
             if response.status_code == 200:
-                values = response.json().get("values", [])
+                result = response.json()
+                values = result.get("values", [])
                 self.logger.info(f"Leitura concluída: {len(values)} valores obtidos do learner {learner_id}")
-                return jsonify({"values": values}), 200
+                return jsonify({
+                    "values": values,
+                    "offset": result.get("offset"),
+                    "next_offset": result.get("next_offset"),
+                    "next_cursor": result.get("next_cursor"),
+                    "has_more": result.get("has_more", False),
+                    "total": result.get("total"),
+                    "learner_id": learner['id']
+                }), 200
+            elif response.status_code == 503:
+                # O learner não alcançou min_slot e nenhum outro learner conhecido o alcançou
+                return jsonify({"error": f"Error reading from learner: {response.text}"}), 503
             else:
                 return jsonify({"error": f"Error reading from learner: {response.text}"}), 500
         except Exception as e:
             self.logger.error(f"Erro ao ler do learner: {e}")
             return jsonify({"error": str(e)}), 500
     
+    def _read_from_leader(self, params):
+        """
+        Lê valores do líder, que responde a partir do seu estado local enquanto
+        detém a lease. Se o nó consultado indicar outro líder, a leitura é
+        repetida uma vez nesse líder. Valores anteriores à cauda mantida pelo
+        líder são servidos por um learner, para o qual o líder redireciona a
+        leitura com min_slot igual ao último slot aplicado pelo líder.
+        
+        Args:
+            params (dict): Parâmetros de paginação
+        
+        Returns:
+            Response: Resposta HTTP
+        """
+        leader_id = self.gossip.get_leader()
+        
+        for _ in range(2):
+            if leader_id is None:
+                return jsonify({"error": "No leader available"}), 503
+            
+            leader = self.gossip.get_node_info(str(leader_id))
+            if not leader:
+                return jsonify({"error": f"Leader {leader_id} not found"}), 503
+            
+            try:
+                leader_url = f"http://{leader['address']}:{leader['port']}/read"
+                response = self.transport.get(leader_url, params=params, timeout=5)
+            except Exception as e:
+                self.logger.error(f"Erro ao ler do líder {leader_id}: {e}")
+                return jsonify({"error": str(e)}), 500
+            
+            result = response.json()
+            if response.status_code == 403 and result.get("current_leader") not in (None, leader_id):
+                self.logger.info(f"Proposer {leader_id} não é o líder, repetindo leitura no líder {result['current_leader']}")
+                leader_id = result["current_leader"]
+                continue
+            
+            if response.status_code != 200:
+                return jsonify({"error": f"Error reading from leader: {result.get('error')}"}), response.status_code
+            
+            self.logger.info(f"Leitura linearizável concluída: {len(result.get('values', []))} valores obtidos do líder {leader_id}")
+            return jsonify(result), 200
+        
+        return jsonify({"error": "Leader changed during read"}), 503
+    
     def _handle_view_logs(self):
         """Manipulador para a rota view-logs"""
         proposers = self.gossip.get_nodes_by_role('proposer')
@@ -191,7 +661,16 @@ class Client(BaseNode):
             "role": self.node_role,
             "proposers_count": len(proposers),
             "responses_count": len(self.responses),
-            "recent_responses": self.responses[-10:] if self.responses else [],
+            "max_responses": self.max_responses,
+            "notifications_received": self.notifications_received,
+            "duplicates_dropped": self.duplicates_dropped,
+            "commit_waiters": sum(len(queue) for queue in self.value_waiters.values()),
+            "commits_confirmed": self.commits_confirmed,
+            "commits_timed_out": self.commits_timed_out,
+            "session_slot": self.session_slot,
+            "recent_responses": list(self.responses)[-10:],
+            "workers": self.executor.stats(),
+            "transport": self.transport.stats(),
             "known_nodes_count": len(self.gossip.get_all_nodes()),
             "current_leader": self.gossip.get_leader()
         }), 200
@@ -0,0 +1,125 @@
+import os
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+class BoundedExecutor:
+    """
+    Pool de workers compartilhado para os envios em leque (prepare, accept,
+    notificações de learners e de clientes). Limita o número de threads e a
+    profundidade da fila, recusando tarefas quando o limite é atingido em vez
+    de criar uma thread por mensagem.
+    """
+
+    def __init__(self, name, logger=None):
+        """
+        Inicializa o executor.
+
+        Args:
+            name (str): Prefixo dos nomes das threads do pool
+            logger (Logger, optional): Logger do nó dono do executor
+        """
+        self.logger = logger or logging.getLogger("[Executor]")
+
+        # Configurações do pool
+        self.max_workers = int(os.environ.get('WORKER_POOL_SIZE', 64))
+        self.max_queue = int(os.environ.get('WORKER_QUEUE_LIMIT', 1000))
+
+        self.pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+
+        # Tarefas pendentes = em execução + aguardando na fila do pool
+        self.lock = threading.Lock()
+        self.pending = 0
+
+        # Métricas
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.max_pending = 0
+        self.total_wait_time = 0.0
+        self.last_rejection_log = 0
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Agenda uma tarefa no pool.
+
+        Args:
+            fn (callable): Função a executar
+            *args: Argumentos posicionais da função
+            **kwargs: Argumentos nomeados da função
+
+        Returns:
+            Future: Future da tarefa, ou None se a fila estiver cheia
+        """
+        with self.lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                # Evitar inundar o log quando a fila fica cheia por um período
+                now = time.time()
+                if now - self.last_rejection_log > 1:
+                    self.last_rejection_log = now
+                    self.logger.warning(f"Fila de workers cheia ({self.pending} tarefas pendentes), descartando {getattr(fn, '__name__', fn)}")
+                return None
+            self.pending += 1
+            self.submitted += 1
+            self.max_pending = max(self.max_pending, self.pending)
+
+        return self.pool.submit(self._run, time.time(), fn, args, kwargs)
+
+    def _run(self, queued_at, fn, args, kwargs):
+        """
+        Executa a tarefa atualizando as métricas do pool.
+
+        Args:
+            queued_at (float): Momento em que a tarefa foi agendada
+            fn (callable): Função a executar
+            args (tuple): Argumentos posicionais
+            kwargs (dict): Argumentos nomeados
+        """
+        started_at = time.time()
+        try:
+            result = fn(*args, **kwargs)
+            with self.lock:
+                self.completed += 1
+            return result
+        except Exception as e:
+            with self.lock:
+                self.failed += 1
+            self.logger.error(f"Erro em tarefa do pool ({getattr(fn, '__name__', fn)}): {e}")
+        finally:
+            with self.lock:
+                self.pending -= 1
+                self.total_wait_time += started_at - queued_at
+
+    def stats(self):
+        """
+        Retorna métricas do executor.
+
+        Returns:
+            dict: Tamanho do pool, profundidade da fila e contadores
+        """
+        with self.lock:
+            finished = self.completed + self.failed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self.pending,
+                "queued": max(0, self.pending - self.max_workers),
+                "max_pending": self.max_pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_queue_wait_ms": round(self.total_wait_time / finished * 1000, 3) if finished else 0
+            }
+
+    def shutdown(self, wait=False):
+        """
+        Encerra o pool.
+
+        Args:
+            wait (bool): Aguardar as tarefas pendentes
+        """
+        self.pool.shutdown(wait=wait)
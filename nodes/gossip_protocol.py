@@ -3,9 +3,16 @@ import time
 import threading
 import logging
 import random
-import requests
 import os
-from flask import request, jsonify
+import math
+import heapq
+from types import MappingProxyType
+from concurrent.futures import wait as wait_futures, FIRST_COMPLETED
+from flask import request
+
+from transport import HttpTransport
+from wire import jsonify
+from metrics import MetricsRegistry
 
 class GossipProtocol:
     """
@@ -13,7 +20,8 @@ class GossipProtocol:
     manutenção de estado distribuído em um sistema Paxos.
     """
     
-    def __init__(self, node_id, node_role, hostname, port, seed_nodes=None):
+    def __init__(self, node_id, node_role, hostname, port, seed_nodes=None, transport=None, executor=None,
+                 metrics=None):
         """
         Inicializa o protocolo Gossip.
         
@@ -23,6 +31,9 @@ class GossipProtocol:
             hostname (str): Nome de host ou endereço IP do nó
             port (int): Porta em que o nó está ouvindo
             seed_nodes (list, optional): Lista de nós sementes para bootstrap inicial
+            transport (HttpTransport, optional): Transporte HTTP compartilhado com o nó
+            executor (BoundedExecutor, optional): Pool de workers do nó (probes indiretos)
+            metrics (MetricsRegistry, optional): Registro de métricas do nó
         """
         # Configuração de logging
         self.logger = logging.getLogger(f"[Gossip-{node_role.capitalize()}-{node_id}]")
@@ -33,10 +44,15 @@ class GossipProtocol:
         self.hostname = hostname
         self.port = port
         
+        # Transporte HTTP (pool de conexões compartilhado com o nó)
+        self.transport = transport or HttpTransport(self.logger)
+        self.executor = executor
+        
         # Estado da rede
-        self.known_nodes = {}  # {node_id: {id, role, address, port, last_seen, metadata, version}}
+        self.known_nodes = {}  # {node_id: {id, role, address, port, last_seen, metadata, generation, version, heartbeat}}
         self.leader_id = None
-        self.lock = threading.Lock()
+        # RLock: set_leader e _handle_gossip chamam update_local_metadata com o lock adquirido
+        self.lock = threading.RLock()
         
         # Configurações do protocolo
         self.gossip_interval = 10.0  # segundos
@@ -44,8 +60,66 @@ class GossipProtocol:
         self.node_timeout = 30.0  # segundos
         self.fanout = 3  # número de nós para enviar em cada rodada
         
-        # Mecanismo anti-entropia baseado em versões
+        # Detecção de falhas no estilo SWIM: a cada período um membro é sondado
+        # diretamente e, sem resposta, indiretamente por k outros membros. Sem
+        # resposta de nenhum, o membro fica suspeito e, se não refutar dentro do
+        # timeout de suspeita, é declarado morto e sai das visões de membros.
+        # Como no SWIM (e no memberlist), o prazo de suspeita é multiplicador ·
+        # max(1, log10(N)) períodos de sondagem: com o multiplicador padrão 4,
+        # um membro tem cerca de 4 s para refutar em clusters de até 10 nós, o
+        # bastante para uma pausa de GC ou um worker ocupado de alguns segundos,
+        # e o prazo cresce com o cluster, em que a refutação leva mais rodadas
+        # de disseminação. Uma falha real é detectada em cerca de 5 s.
+        self.probe_interval = float(os.environ.get('SWIM_PROBE_INTERVAL', 1.0))  # segundos
+        self.probe_timeout = float(os.environ.get('SWIM_PROBE_TIMEOUT', 0.5))  # segundos
+        self.indirect_probes = int(os.environ.get('SWIM_INDIRECT_PROBES', 3))
+        # SWIM_SUSPICION_TIMEOUT fixa o prazo de suspeita, ignorando o tamanho do cluster
+        suspicion_timeout = os.environ.get('SWIM_SUSPICION_TIMEOUT')
+        self.suspicion_timeout = float(suspicion_timeout) if suspicion_timeout else None  # segundos
+        self.suspicion_multiplier = float(os.environ.get('SWIM_SUSPICION_MULTIPLIER', 4))
+        # Líder cuja lease ainda vale neste nó: (node_id, válida até em time.monotonic()).
+        # Enquanto valer, um veredito de morte do líder é adiado
+        self.leader_hold = None
+        self.incarnation = 0  # incrementada por este nó para refutar suspeitas
+        self.member_status = {}  # {node_id: {status, incarnation, since}}
+        self.dead_nodes = {}  # {node_id: {incarnation, generation, heartbeat, at}}
+        self.swim_updates = {}  # {node_id: [atualização, transmissões restantes]}
+        self.probe_order = []
+        self.probes_sent = 0
+        self.indirect_probes_sent = 0
+        self.suspicions = 0
+        self.deaths = 0
+        self.refutations = 0
+        
+        # Mecanismo anti-entropia baseado em versões: (generation, version) ordena
+        # o estado de um nó. A geração muda a cada reinício, para que o estado novo
+        # prevaleça sobre o anterior; a versão só aumenta quando os metadados mudam.
+        # O contador de heartbeat aumenta a cada rodada e indica apenas atividade.
+        self.generation = int(time.time() * 1000)
         self.self_version = 0  # Versão do estado deste nó
+        self.heartbeat = 0
+        
+        # Índice por papel dos nós ativos, publicado como snapshot imutável
+        # (por papel, todos, válido até): leitores não adquirem o lock enquanto o
+        # snapshot for válido. O heap de expiração indica quando o próximo nó pode
+        # se tornar inativo; entradas desatualizadas são descartadas ao serem retiradas.
+        self._expiry_heap = []  # [(expira_em, node_id)]
+        self._views = ({}, MappingProxyType({}), 0)
+        self._views_dirty = True
+        
+        # Métricas de tráfego do gossip
+        self.rounds = 0
+        self.deltas_sent = 0
+        self.deltas_received = 0
+        
+        # Bytes enviados aparecem em paxos_rpc_sent_bytes_total (rotas /gossip*) do transporte
+        self.metrics = metrics or MetricsRegistry()
+        self.rounds_metric = self.metrics.counter("paxos_gossip_rounds_total", "Gossip rounds started by this node")
+        received_bytes = self.metrics.counter(
+            "paxos_gossip_received_bytes_total", "Gossip payload bytes received, by message kind", ("kind",))
+        self.received_bytes = {kind: received_bytes.labels(kind) for kind in ("digest", "delta", "ping", "ping_req")}
+        self.retries_metric = self.metrics.counter(
+            "paxos_retries_total", "Retried sends, by call site", ("site",)).labels("gossip")
         
         # Adicionar este nó à lista de nós conhecidos
         with self.lock:
@@ -56,8 +130,11 @@ class GossipProtocol:
                 'port': port,
                 'last_seen': time.time(),
                 'metadata': {},  # metadados específicos do nó (como status de líder)
-                'version': self.self_version
+                'generation': self.generation,
+                'version': self.self_version,
+                'heartbeat': self.heartbeat
             }
+            self._schedule_expiry(str(node_id))
         
         # Adicionar nós sementes (se fornecidos)
         if seed_nodes:
@@ -72,8 +149,11 @@ class GossipProtocol:
                             'port': node.get('port'),
                             'last_seen': time.time(),
                             'metadata': node.get('metadata', {}),
-                            'version': 0
+                            'generation': 0,
+                            'version': 0,
+                            'heartbeat': 0
                         }
+                        self._schedule_expiry(node_id_str)
                         self.logger.debug(f"Adicionado nó semente: {node_id_str} ({node.get('role')}) em {node.get('address')}:{node.get('port')}")
         
         self.logger.info(f"Protocolo Gossip inicializado. ID: {node_id}, Papel: {node_role}, Endereço: {hostname}:{port}")
@@ -85,11 +165,29 @@ class GossipProtocol:
         Args:
             app (Flask): Aplicação Flask para registrar rotas
         """
-        # Adicionar endpoint para receber informações (push)
+        # Adicionar endpoint para receber o digest de versões (responde com os deltas)
         @app.route('/gossip', methods=['POST'])
         def receive_gossip():
+            self.received_bytes["digest"].inc(request.content_length or 0)
             return self._handle_gossip(request.json)
         
+        # Adicionar endpoint para receber as entradas solicitadas na resposta ao digest
+        @app.route('/gossip/delta', methods=['POST'])
+        def receive_gossip_delta():
+            self.received_bytes["delta"].inc(request.content_length or 0)
+            return self._handle_gossip_delta(request.json)
+        
+        # Adicionar endpoints de sondagem direta e indireta (SWIM)
+        @app.route('/gossip/ping', methods=['POST'])
+        def receive_ping():
+            self.received_bytes["ping"].inc(request.content_length or 0)
+            return self._handle_ping(request.json)
+        
+        @app.route('/gossip/ping-req', methods=['POST'])
+        def receive_ping_req():
+            self.received_bytes["ping_req"].inc(request.content_length or 0)
+            return self._handle_ping_req(request.json)
+        
         # Adicionar endpoint para consulta de nós
         @app.route('/gossip/nodes', methods=['GET'])
         def get_nodes():
@@ -99,7 +197,23 @@ class GossipProtocol:
                 return jsonify({
                     "total": len(active_nodes),
                     "nodes": active_nodes,
-                    "leader_id": self.leader_id
+                    "leader_id": self.leader_id,
+                    "stats": {
+                        "rounds": self.rounds,
+                        "version": self.self_version,
+                        "deltas_sent": self.deltas_sent,
+                        "deltas_received": self.deltas_received
+                    },
+                    "swim": {
+                        "incarnation": self.incarnation,
+                        "suspects": [k for k, v in self.member_status.items() if v['status'] == 'suspect'],
+                        "dead": list(self.dead_nodes),
+                        "probes_sent": self.probes_sent,
+                        "indirect_probes_sent": self.indirect_probes_sent,
+                        "suspicions": self.suspicions,
+                        "deaths": self.deaths,
+                        "refutations": self.refutations
+                    }
                 })
         
         # Iniciar thread para gossip periódico
@@ -110,6 +224,11 @@ class GossipProtocol:
         threading.Thread(target=self._cleanup_loop, daemon=True).start()
         self.logger.debug("Thread de limpeza iniciada")
         
+        # Iniciar thread de sondagem (detecção de falhas)
+        if self.probe_interval > 0:
+            threading.Thread(target=self._probe_loop, daemon=True).start()
+            self.logger.debug("Thread de sondagem iniciada")
+        
         self.logger.info(f"Protocolo Gossip iniciado para {self.node_role} {self.node_id}")
     
     def _gossip_loop(self):
@@ -155,20 +274,26 @@ class GossipProtocol:
         
         # Preparar dados para envio
         with self.lock:
-            # Aumentar a versão deste nó
-            self.self_version += 1
-            self.known_nodes[str(self.node_id)]['version'] = self.self_version
+            # Aumentar apenas o heartbeat; a versão muda somente com os metadados
+            self.heartbeat += 1
+            self.rounds += 1
+            self.rounds_metric.inc()
+            self.known_nodes[str(self.node_id)]['heartbeat'] = self.heartbeat
             self.known_nodes[str(self.node_id)]['last_seen'] = time.time()
+            self._schedule_expiry(str(self.node_id))
             
             # Se for líder, atualizar heartbeat
             if self.leader_id == self.node_id and self.node_role == 'proposer':
-                self.known_nodes[str(self.node_id)]['metadata']['last_heartbeat'] = time.time()
-                self.known_nodes[str(self.node_id)]['metadata']['is_leader'] = True
+                self.update_local_metadata({
+                    "is_leader": True,
+                    "last_heartbeat": time.time()
+                })
             
+            # Enviar apenas o digest {node_id: [geração, versão, heartbeat, idade]}
             gossip_data = {
                 "sender_id": self.node_id,
                 "sender_role": self.node_role,
-                "nodes": self.known_nodes,
+                "digest": self._build_digest(),
                 "leader_id": self.leader_id,
                 "timestamp": time.time()
             }
@@ -176,16 +301,7 @@ class GossipProtocol:
         # Enviar para cada nó alvo
         for target in targets:
             try:
-                # MODIFICAÇÃO: Usar nome de serviço para comunicação interna
-                target_address = target['address']
-                # Garantir que estamos usando o nome de serviço correto
-                if not ('svc.cluster.local' in target_address) and '-' in target_address:
-                    # Extrair o nome do serviço antes do primeiro hífen
-                    service_name = target_address.split('-')[0]
-                    target_address = f"{service_name}.{os.environ.get('NAMESPACE', 'paxos')}.svc.cluster.local"
-                    self.logger.debug(f"Convertendo endereço de {target['address']} para {target_address}")
-                
-                target_url = f"http://{target_address}:{target['port']}/gossip"
+                target_url = self._node_url(target, "/gossip")
                 self.logger.debug(f"Enviando gossip para {target['role']} {target['id']} em {target_url}")
                 
                 # MODIFICAÇÃO: Implementar retry com backoff mais agressivo
@@ -200,10 +316,11 @@ class GossipProtocol:
                         # MODIFICAÇÃO: Log mais detalhado para debug
                         self.logger.debug(f"Tentativa {retry+1}/{max_retries} para {target['role']} {target['id']} (timeout: {timeout+jitter:.2f}s)")
                         
-                        response = requests.post(target_url, json=gossip_data, timeout=timeout + jitter)
+                        response = self.transport.post(target_url, json=gossip_data, timeout=timeout + jitter)
                         
                         if response.status_code == 200:
                             result = response.json()
+                            self._handle_gossip_ack(target, target_url, result)
                             self.logger.debug(f"Gossip enviado com sucesso para {target['id']}. Atualizações: {result.get('updates', 0)}")
                             break  # Sucesso, saímos do loop
                         else:
@@ -215,13 +332,133 @@ class GossipProtocol:
                         
                         # Esperar antes de tentar novamente
                         if retry < max_retries - 1:
+                            self.retries_metric.inc()
                             time.sleep(base_timeout * (1.5 ** retry) + jitter)
             except Exception as e:
                 self.logger.warning(f"Erro ao configurar gossip para {target['id']}: {e}")
     
+    def _build_digest(self):
+        """
+        Monta o digest dos nós ativos: {node_id: [geração, versão, heartbeat, idade]}.
+        A idade (segundos desde a última atividade observada) permite ao receptor
+        estimar o last_seen sem depender do relógio do remetente.
+        Deve ser chamado com self.lock adquirido.
+        
+        Returns:
+            dict: Digest de versões
+        """
+        now = time.time()
+        return {
+            node_id: [info.get('generation', 0), info.get('version', 0), info.get('heartbeat', 0),
+                      round(now - info['last_seen'], 3)]
+            for node_id, info in self.known_nodes.items()
+            if now - info['last_seen'] <= self.node_timeout
+        }
+    
+    def _wire_entry(self, info, now):
+        """
+        Converte uma entrada de known_nodes para envio.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            info (dict): Entrada local
+            now (float): Momento atual
+        
+        Returns:
+            dict: Entrada com cópia dos metadados e idade no lugar de last_seen
+        """
+        return {
+            'id': info['id'],
+            'role': info['role'],
+            'address': info['address'],
+            'port': info['port'],
+            'metadata': dict(info.get('metadata', {})),
+            'generation': info.get('generation', 0),
+            'version': info.get('version', 0),
+            'heartbeat': info.get('heartbeat', 0),
+            'age': round(now - info['last_seen'], 3)
+        }
+    
+    def _touch(self, node_id, heartbeat, age, now):
+        """
+        Registra um heartbeat mais recente de um nó já conhecido, na mesma geração.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            node_id (str): ID do nó
+            heartbeat (int): Contador de heartbeat recebido
+            age (float): Idade da informação no remetente, em segundos
+            now (float): Momento atual
+        """
+        local = self.known_nodes[node_id]
+        local['heartbeat'] = heartbeat
+        local['last_seen'] = max(local['last_seen'], now - age)
+        self._schedule_expiry(node_id)
+        
+        # Um nó que já havia expirado do índice volta a ficar ativo
+        if node_id not in self._views[1]:
+            self._views_dirty = True
+    
+    def _merge_nodes(self, nodes):
+        """
+        Incorpora entradas completas recebidas de outro nó, mantendo apenas as
+        mais recentes por (geração, versão).
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            nodes (dict): {node_id: entrada}
+        
+        Returns:
+            int: Número de entradas atualizadas
+        """
+        now = time.time()
+        updates = 0
+        
+        for node_id, node_info in nodes.items():
+            # Ignorar informações sobre este nó e sobre nós que o remetente não vê há muito tempo
+            age = node_info.get('age', 0)
+            if node_id == str(self.node_id) or age > self.node_timeout:
+                continue
+            
+            received = (node_info.get('generation', 0), node_info.get('version', 0))
+            local = self.known_nodes.get(node_id)
+            
+            # Um nó declarado morto só volta com sinal de vida posterior à declaração
+            if node_id in self.dead_nodes:
+                dead = self.dead_nodes[node_id]
+                if (received[0] <= dead['generation'] and
+                        node_info.get('heartbeat', 0) <= dead['heartbeat']):
+                    continue
+                del self.dead_nodes[node_id]
+            
+            if local is None or received > (local.get('generation', 0), local.get('version', 0)):
+                # Nó desconhecido ou versão mais recente
+                self.known_nodes[node_id] = {
+                    'id': node_info.get('id'),
+                    'role': node_info.get('role'),
+                    'address': node_info.get('address'),
+                    'port': node_info.get('port'),
+                    'last_seen': max(now - age, local['last_seen'] if local else 0),
+                    'metadata': node_info.get('metadata', {}),
+                    'generation': received[0],
+                    'version': received[1],
+                    'heartbeat': node_info.get('heartbeat', 0)
+                }
+                self._schedule_expiry(node_id)
+                self._views_dirty = True
+                updates += 1
+                self.logger.debug(f"Atualizado nó: {node_info.get('role')} {node_id} (versão {received})")
+            elif received[0] == local.get('generation', 0) and node_info.get('heartbeat', 0) > local.get('heartbeat', 0):
+                self._touch(node_id, node_info['heartbeat'], age, now)
+        
+        self.deltas_received += len(nodes)
+        return updates
+    
     def _handle_gossip(self, data):
         """
-        Processa informações recebidas de outros nós.
+        Processa o digest recebido de outro nó.
+        Responde com as entradas que o remetente não tem ou tem desatualizadas,
+        os heartbeats mais recentes e a lista de nós que este nó precisa receber.
         
         Args:
             data (dict): Dados recebidos de outro nó
@@ -231,69 +468,45 @@ class GossipProtocol:
         """
         sender_id = data.get("sender_id")
         sender_role = data.get("sender_role")
-        received_nodes = data.get("nodes", {})
+        digest = data.get("digest", {})
         received_leader = data.get("leader_id")
-        timestamp = data.get("timestamp", time.time())
         
         if not sender_id:
             return jsonify({"status": "error", "message": "Missing sender_id"}), 400
         
-        self.logger.debug(f"Recebido gossip de {sender_role} {sender_id} com {len(received_nodes)} nós")
+        self.logger.debug(f"Recebido digest de {sender_role} {sender_id} com {len(digest)} nós")
         
-        updates = 0
+        requested = []
+        deltas = {}
+        heartbeats = {}
         
         with self.lock:
-            # Atualizar informações do remetente
-            sender_node = received_nodes.get(str(sender_id), {})
-            if sender_node:
-                self.known_nodes[str(sender_id)] = {
-                    'id': sender_id,
-                    'role': sender_role,
-                    'address': sender_node.get('address'),
-                    'port': sender_node.get('port'),
-                    'last_seen': time.time(),
-                    'metadata': sender_node.get('metadata', {}),
-                    'version': sender_node.get('version', 0)
-                }
-                self.logger.debug(f"Atualizado remetente: {sender_role} {sender_id}")
+            now = time.time()
             
-            # Processar informações sobre outros nós
-            for node_id, node_info in received_nodes.items():
+            # Comparar o digest recebido com o estado local
+            for node_id, (generation, version, heartbeat, age) in digest.items():
                 if node_id == str(self.node_id):
-                    # Ignorar informações sobre este nó
                     continue
                 
-                # Verificar se o nó é desconhecido ou se a versão recebida é mais recente
-                if (node_id not in self.known_nodes or 
-                    node_info.get('version', 0) > self.known_nodes[node_id].get('version', 0)):
-                    # Nó desconhecido ou versão mais recente
-                    self.known_nodes[node_id] = {
-                        'id': node_info.get('id'),
-                        'role': node_info.get('role'),
-                        'address': node_info.get('address'),
-                        'port': node_info.get('port'),
-                        'last_seen': timestamp,
-                        'metadata': node_info.get('metadata', {}),
-                        'version': node_info.get('version', 0)
-                    }
-                    updates += 1
-                    self.logger.debug(f"Atualizado nó: {node_info.get('role')} {node_id} (versão {node_info.get('version', 0)})")
-                else:
-                    # Mesmo que a versão não seja mais recente, atualizar o last_seen
-                    self.known_nodes[node_id]['last_seen'] = max(self.known_nodes[node_id]['last_seen'], timestamp)
-                    
-                    # Se o nó é o líder conhecido, verificar heartbeat
-                    if str(self.leader_id) == node_id:
-                        # Verificar se há heartbeat mais recente
-                        received_metadata = node_info.get('metadata', {})
-                        current_metadata = self.known_nodes[node_id].get('metadata', {})
-                        
-                        received_heartbeat = received_metadata.get('last_heartbeat', 0)
-                        current_heartbeat = current_metadata.get('last_heartbeat', 0)
-                        
-                        if received_heartbeat > current_heartbeat:
-                            self.known_nodes[node_id]['metadata']['last_heartbeat'] = received_heartbeat
-                            self.logger.debug(f"Atualizado heartbeat do líder {node_id}: {current_heartbeat} -> {received_heartbeat}")
+                local = self.known_nodes.get(node_id)
+                if local is None or (generation, version) > (local.get('generation', 0), local.get('version', 0)):
+                    requested.append(node_id)
+                elif generation == local.get('generation', 0) and heartbeat > local.get('heartbeat', 0):
+                    self._touch(node_id, heartbeat, age, now)
+            
+            # Entradas que o remetente não conhece ou conhece em versão anterior
+            for node_id, local in self.known_nodes.items():
+                if now - local['last_seen'] > self.node_timeout:
+                    continue
+                
+                local_version = (local.get('generation', 0), local.get('version', 0))
+                remote = digest.get(node_id)
+                if remote is None or local_version > (remote[0], remote[1]):
+                    deltas[node_id] = self._wire_entry(local, now)
+                elif local_version[0] == remote[0] and local.get('heartbeat', 0) > remote[2]:
+                    heartbeats[node_id] = [local['heartbeat'], round(now - local['last_seen'], 3)]
+            
+            self.deltas_sent += len(deltas)
             
             # Atualizar informações de líder (se recebido)
             if received_leader is not None:
@@ -317,32 +530,489 @@ class GossipProtocol:
                             self.update_local_metadata({
                                 "is_leader": False
                             })
-                
-                # Verificar heartbeat do líder nas metadatas
-                leader_metadata = None
-                if str(received_leader) in received_nodes:
-                    leader_metadata = received_nodes[str(received_leader)].get('metadata', {})
-                
-                # Se recebemos metadados do líder com heartbeat atualizado, atualizar
-                if leader_metadata and 'last_heartbeat' in leader_metadata:
-                    received_heartbeat = leader_metadata['last_heartbeat']
-                    
-                    # Atualizar informações do líder em nossos nós conhecidos
-                    if str(received_leader) in self.known_nodes:
-                        current_leader_metadata = self.known_nodes[str(received_leader)].get('metadata', {})
-                        current_heartbeat = current_leader_metadata.get('last_heartbeat', 0)
-                        
-                        # Atualizar apenas se o heartbeat recebido for mais recente
-                        if received_heartbeat > current_heartbeat:
-                            self.known_nodes[str(received_leader)]['metadata'] = leader_metadata
-                            self.logger.debug(f"Heartbeat do líder atualizado: {current_heartbeat} -> {received_heartbeat}")
         
         return jsonify({
             "status": "ok",
-            "updates": updates,
-            "node_count": len(self.known_nodes)
+            "node_count": len(self.known_nodes),
+            "nodes": deltas,
+            "heartbeats": heartbeats,
+            "request": requested
         }), 200
     
+    def _handle_gossip_ack(self, target, target_url, result):
+        """
+        Processa a resposta a um digest: incorpora os deltas recebidos e envia
+        ao alvo as entradas que ele solicitou.
+        
+        Args:
+            target (dict): Nó alvo
+            target_url (str): URL do endpoint /gossip do alvo
+            result (dict): Resposta do alvo
+        """
+        with self.lock:
+            now = time.time()
+            result['updates'] = self._merge_nodes(result.get('nodes', {}))
+            
+            for node_id, (heartbeat, age) in result.get('heartbeats', {}).items():
+                local = self.known_nodes.get(node_id)
+                if local and node_id != str(self.node_id) and heartbeat > local.get('heartbeat', 0):
+                    self._touch(node_id, heartbeat, age, now)
+            
+            requested = {
+                node_id: self._wire_entry(self.known_nodes[node_id], now)
+                for node_id in result.get('request', [])
+                if node_id in self.known_nodes
+            }
+            self.deltas_sent += len(requested)
+        
+        if requested:
+            delta_data = {
+                "sender_id": self.node_id,
+                "nodes": requested
+            }
+            self.transport.post(f"{target_url}/delta", json=delta_data, timeout=2.0)
+            self.logger.debug(f"Enviadas {len(requested)} entradas solicitadas por {target['id']}")
+    
+    def _handle_gossip_delta(self, data):
+        """
+        Processa as entradas enviadas em resposta à lista de solicitação.
+        
+        Args:
+            data (dict): Dados recebidos de outro nó
+        
+        Returns:
+            Response: Resposta HTTP
+        """
+        if not data.get("sender_id"):
+            return jsonify({"status": "error", "message": "Missing sender_id"}), 400
+        
+        with self.lock:
+            updates = self._merge_nodes(data.get("nodes", {}))
+        
+        return jsonify({"status": "ok", "updates": updates}), 200
+    
+    def _node_url(self, node, path):
+        """
+        Monta a URL de um endpoint de outro nó.
+        
+        Args:
+            node (dict): Nó de destino
+            path (str): Caminho do endpoint
+        
+        Returns:
+            str: URL completa
+        """
+        # MODIFICAÇÃO: Usar nome de serviço para comunicação interna
+        target_address = node['address']
+        # Garantir que estamos usando o nome de serviço correto
+        if not ('svc.cluster.local' in target_address) and '-' in target_address:
+            # Extrair o nome do serviço antes do primeiro hífen
+            service_name = target_address.split('-')[0]
+            target_address = f"{service_name}.{os.environ.get('NAMESPACE', 'paxos')}.svc.cluster.local"
+            self.logger.debug(f"Convertendo endereço de {node['address']} para {target_address}")
+        
+        return f"http://{target_address}:{node['port']}{path}"
+    
+    def _probe_loop(self):
+        """Thread que sonda um membro por período e verifica suspeitas vencidas."""
+        while True:
+            started = time.time()
+            try:
+                target = self._next_probe_target()
+                if target:
+                    self._probe(target)
+                self._expire_suspicions()
+            except Exception as e:
+                self.logger.error(f"Erro durante sondagem: {e}")
+            time.sleep(max(0, self.probe_interval - (time.time() - started)))
+    
+    def _next_probe_target(self):
+        """
+        Escolhe o próximo membro a sondar, percorrendo os membros em ordem
+        aleatória (round-robin embaralhado), como no SWIM. Sementes das quais
+        ainda não se recebeu estado (geração 0) não são sondadas: podem não ter
+        iniciado ainda e continuam sujeitas apenas ao node_timeout.
+        
+        Returns:
+            dict: Nó a sondar ou None
+        """
+        members = self.get_all_nodes()
+        while self.probe_order:
+            node_id = self.probe_order.pop()
+            if node_id in members:
+                return members[node_id]
+        
+        self.probe_order = [k for k, n in members.items()
+                            if k != str(self.node_id) and n.get('generation', 0) > 0]
+        random.shuffle(self.probe_order)
+        return members[self.probe_order.pop()] if self.probe_order else None
+    
+    def _probe(self, target):
+        """
+        Sonda um membro diretamente e, sem resposta, por meio de outros membros.
+        
+        Args:
+            target (dict): Nó a sondar
+        """
+        node_id = str(target['id'])
+        alive = self._ping(target, self.probe_timeout)
+        
+        if not alive:
+            alive = self._indirect_probe(target)
+        
+        with self.lock:
+            if alive:
+                self._mark_alive(node_id)
+            else:
+                self._suspect(node_id)
+    
+    def _ping(self, target, timeout):
+        """
+        Envia um ping direto, levando as atualizações de membros pendentes.
+        
+        Args:
+            target (dict): Nó de destino
+            timeout (float): Timeout em segundos
+        
+        Returns:
+            bool: True se o nó respondeu
+        """
+        with self.lock:
+            self.probes_sent += 1
+            ping_data = {
+                "sender_id": self.node_id,
+                "incarnation": self.incarnation,
+                "updates": self._pick_swim_updates()
+            }
+        
+        try:
+            response = self.transport.post(self._node_url(target, "/gossip/ping"), json=ping_data, timeout=timeout)
+            if response.status_code != 200:
+                return False
+            result = response.json()
+        except Exception as e:
+            self.logger.debug(f"Sem resposta ao ping de {target['id']}: {e}")
+            return False
+        
+        with self.lock:
+            for update in result.get("updates", []):
+                self._apply_swim_update(update)
+        return True
+    
+    def _indirect_probe(self, target):
+        """
+        Pede a até k outros membros que sondem o alvo (ping-req).
+        
+        Args:
+            target (dict): Nó a sondar
+        
+        Returns:
+            bool: True se algum membro obteve resposta do alvo
+        """
+        helpers = [n for k, n in self.get_all_nodes().items()
+                   if k not in (str(self.node_id), str(target['id']))]
+        helpers = random.sample(helpers, min(self.indirect_probes, len(helpers)))
+        if not helpers:
+            return False
+        
+        request_data = {
+            "sender_id": self.node_id,
+            "target": {"id": target['id'], "address": target['address'], "port": target['port']},
+            "timeout": self.probe_timeout
+        }
+        
+        def ask(helper):
+            response = self.transport.post(self._node_url(helper, "/gossip/ping-req"), json=request_data,
+                                           timeout=self.probe_timeout * 2)
+            return response.status_code == 200
+        
+        with self.lock:
+            self.indirect_probes_sent += len(helpers)
+        
+        if self.executor is None:
+            for helper in helpers:
+                try:
+                    if ask(helper):
+                        return True
+                except Exception:
+                    continue
+            return False
+        
+        pending = {f for f in (self.executor.submit(ask, helper) for helper in helpers) if f}
+        deadline = time.time() + self.probe_timeout * 2
+        while pending:
+            done, pending = wait_futures(pending, timeout=max(0, deadline - time.time()),
+                                         return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            if any(not f.exception() and f.result() for f in done):
+                return True
+        return False
+    
+    def _handle_ping(self, data):
+        """
+        Responde a um ping direto, aplicando as atualizações recebidas.
+        
+        Args:
+            data (dict): Dados do ping
+        
+        Returns:
+            Response: Resposta HTTP
+        """
+        sender_id = str(data.get("sender_id"))
+        
+        with self.lock:
+            for update in data.get("updates", []):
+                self._apply_swim_update(update)
+            
+            # O remetente está ativo
+            if sender_id in self.known_nodes:
+                self._mark_alive(sender_id)
+            
+            return jsonify({
+                "status": "ack",
+                "node_id": self.node_id,
+                "incarnation": self.incarnation,
+                "updates": self._pick_swim_updates()
+            }), 200
+    
+    def _handle_ping_req(self, data):
+        """
+        Sonda um nó em nome de outro membro (probe indireto).
+        
+        Args:
+            data (dict): Dados do ping-req
+        
+        Returns:
+            Response: Resposta HTTP (200 se o alvo respondeu, 504 caso contrário)
+        """
+        target = data.get("target")
+        if not target:
+            return jsonify({"status": "error", "message": "Missing target"}), 400
+        
+        if self._ping(target, float(data.get("timeout", self.probe_timeout))):
+            return jsonify({"status": "ack"}), 200
+        return jsonify({"status": "nack"}), 504
+    
+    def _mark_alive(self, node_id):
+        """
+        Registra que um membro respondeu, encerrando uma suspeita local.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            node_id (str): ID do nó
+        """
+        node = self.known_nodes.get(node_id)
+        if not node:
+            return
+        
+        node['last_seen'] = time.time()
+        self._schedule_expiry(node_id)
+        if node_id not in self._views[1]:
+            self._views_dirty = True
+        
+        status = self.member_status.get(node_id)
+        if status and status['status'] == 'suspect':
+            status['status'] = 'alive'
+            self.logger.info(f"Nó {node_id} respondeu e deixou de ser suspeito")
+    
+    def _suspect(self, node_id):
+        """
+        Marca um membro como suspeito e dissemina a suspeita.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            node_id (str): ID do nó
+        """
+        status = self.member_status.setdefault(node_id, {"status": "alive", "incarnation": 0, "since": 0})
+        if status['status'] == 'suspect':
+            return
+        
+        status.update(status='suspect', since=time.time())
+        self.suspicions += 1
+        self.logger.warning(f"Nó {node_id} não respondeu às sondagens e está suspeito")
+        self._queue_swim_update({"id": node_id, "status": "suspect", "incarnation": status['incarnation']})
+    
+    def _current_suspicion_timeout(self):
+        """
+        Prazo para refutar uma suspeita antes de o membro ser declarado morto.
+        Deve ser chamado com self.lock adquirido.
+        
+        Returns:
+            float: Prazo em segundos
+        """
+        if self.suspicion_timeout is not None:
+            return self.suspicion_timeout
+        # known_nodes inclui este nó
+        members = len(self.known_nodes)
+        return self.suspicion_multiplier * max(1.0, math.log10(members)) * self.probe_interval
+    
+    def _expire_suspicions(self):
+        """Declara mortos os membros cuja suspeita não foi refutada a tempo."""
+        with self.lock:
+            now = time.time()
+            timeout = self._current_suspicion_timeout()
+            for node_id, status in list(self.member_status.items()):
+                if status['status'] == 'suspect' and now - status['since'] >= timeout:
+                    if self._declare_dead(node_id, status['incarnation']):
+                        self._queue_swim_update({"id": node_id, "status": "dead", "incarnation": status['incarnation']})
+    
+    def hold_leader(self, leader_id, duration):
+        """
+        Registra que o líder detém uma lease válida neste nó pelos próximos
+        duration segundos (lease concedida por este acceptor ou anunciada no
+        heartbeat do líder). Enquanto isso, vereditos SWIM de morte do líder
+        são adiados: o líder segue suspeito e só é declarado morto depois.
+        
+        Args:
+            leader_id (int): ID do líder
+            duration (float): Validade restante da lease em segundos
+        """
+        with self.lock:
+            until = time.monotonic() + duration
+            if self.leader_hold and self.leader_hold[0] == str(leader_id):
+                until = max(until, self.leader_hold[1])
+            self.leader_hold = (str(leader_id), until)
+    
+    def _leader_held(self, node_id):
+        """
+        Verifica se o nó é o líder e sua lease ainda vale neste nó.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            node_id (str): ID do nó
+        
+        Returns:
+            bool: True se a morte do nó deve ser adiada
+        """
+        return (self.leader_hold is not None and self.leader_hold[0] == node_id and
+                self.leader_id is not None and str(self.leader_id) == node_id and
+                time.monotonic() < self.leader_hold[1])
+    
+    def _declare_dead(self, node_id, incarnation):
+        """
+        Remove um membro morto das visões, lembrando seu último estado para
+        que o gossip não o traga de volta sem um sinal de vida mais recente.
+        O líder com lease válida permanece como suspeito, com a suspeita já
+        vencida: é declarado morto na primeira verificação após a lease expirar,
+        a menos que refute antes.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            node_id (str): ID do nó
+            incarnation (int): Encarnação declarada morta
+        
+        Returns:
+            bool: True se o nó foi declarado morto
+        """
+        if self._leader_held(node_id):
+            status = self.member_status.get(node_id)
+            if not status or status['status'] != 'suspect' or status['since'] != 0:
+                self.logger.warning(f"Líder {node_id} sem resposta, mas com lease válida: declaração de morte adiada")
+            self.member_status[node_id] = {"status": "suspect", "incarnation": incarnation, "since": 0}
+            return False
+        
+        self.member_status.pop(node_id, None)
+        node = self.known_nodes.pop(node_id, None)
+        if not node:
+            return False
+        
+        self.dead_nodes[node_id] = {
+            "incarnation": incarnation,
+            "generation": node.get('generation', 0),
+            "heartbeat": node.get('heartbeat', 0),
+            "at": time.time()
+        }
+        self._views_dirty = True
+        self.deaths += 1
+        self.logger.warning(f"Nó {node_id} ({node['role']}) declarado morto")
+        
+        # Se o nó morto era o líder, limpar a informação de líder
+        if self.leader_id and str(self.leader_id) == node_id:
+            self.logger.warning(f"Líder {node_id} declarado morto")
+            self.leader_id = None
+        return True
+    
+    def _apply_swim_update(self, update):
+        """
+        Aplica uma atualização de membro recebida (alive, suspect ou dead).
+        Atualizações sobre este nó são refutadas com uma nova encarnação.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            update (dict): {id, status, incarnation}
+        """
+        node_id = str(update.get("id"))
+        state = update.get("status")
+        incarnation = update.get("incarnation", 0)
+        
+        if node_id == str(self.node_id):
+            if state in ('suspect', 'dead') and incarnation >= self.incarnation:
+                self.incarnation = incarnation + 1
+                self.refutations += 1
+                self.logger.warning(f"Refutando suspeita sobre este nó (encarnação {self.incarnation})")
+                self._queue_swim_update({"id": node_id, "status": "alive", "incarnation": self.incarnation})
+            return
+        
+        status = self.member_status.get(node_id, {"status": "alive", "incarnation": 0, "since": 0})
+        
+        if state == 'alive':
+            dead = self.dead_nodes.get(node_id)
+            if dead and incarnation > dead['incarnation']:
+                # Refutação: o gossip pode voltar a incluir o nó
+                del self.dead_nodes[node_id]
+            elif dead or incarnation <= status['incarnation']:
+                return
+            self.member_status[node_id] = {"status": "alive", "incarnation": incarnation, "since": 0}
+        elif state == 'suspect':
+            if node_id not in self.known_nodes or incarnation < status['incarnation']:
+                return
+            if status['status'] == 'suspect' and incarnation == status['incarnation']:
+                return
+            self.member_status[node_id] = {"status": "suspect", "incarnation": incarnation, "since": time.time()}
+            self.logger.info(f"Nó {node_id} suspeito segundo outro membro")
+        elif state == 'dead':
+            if node_id not in self.known_nodes or incarnation < status['incarnation']:
+                return
+            if not self._declare_dead(node_id, incarnation):
+                return
+        else:
+            return
+        
+        self._queue_swim_update({"id": node_id, "status": state, "incarnation": incarnation})
+    
+    def _queue_swim_update(self, update):
+        """
+        Enfileira uma atualização de membro para ser levada nos próximos pings.
+        Cada atualização é retransmitida cerca de 3·log2(N) vezes.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            update (dict): {id, status, incarnation}
+        """
+        transmissions = 3 * max(1, math.ceil(math.log2(len(self.known_nodes) + 1)))
+        self.swim_updates[update['id']] = [update, transmissions]
+    
+    def _pick_swim_updates(self, limit=8):
+        """
+        Seleciona as atualizações menos transmitidas para levar em uma mensagem.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            limit (int): Máximo de atualizações por mensagem
+        
+        Returns:
+            list: Atualizações de membros
+        """
+        chosen = sorted(self.swim_updates.items(), key=lambda item: -item[1][1])[:limit]
+        updates = []
+        for node_id, entry in chosen:
+            updates.append(entry[0])
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self.swim_updates[node_id]
+        return updates
+    
     def _remove_inactive_nodes(self):
         """Remove nós que não enviaram heartbeat por muito tempo."""
         current_time = time.time()
@@ -358,6 +1028,7 @@ class GossipProtocol:
                     node_info = self.known_nodes[node_id]
                     self.logger.info(f"Removendo nó inativo: {node_id} ({node_info['role']})")
                     del self.known_nodes[node_id]
+                    self._views_dirty = True
                     removed += 1
                     
                     # Se o nó removido era o líder, limpar a informação de líder
@@ -365,6 +1036,13 @@ class GossipProtocol:
                         self.logger.warning(f"Líder {node_id} removido por inatividade")
                         self.leader_id = None
         
+            # Esquecer nós mortos há mais tempo que o timeout: nenhum peer os anuncia mais
+            for node_id in [k for k, v in self.dead_nodes.items() if current_time - v['at'] > 2 * self.node_timeout]:
+                del self.dead_nodes[node_id]
+            
+            # Descartar do heap as entradas vencidas e republicar o índice
+            self._refresh_views(current_time)
+        
         if removed > 0:
             self.logger.info(f"Removidos {removed} nós inativos")
     
@@ -378,9 +1056,16 @@ class GossipProtocol:
         with self.lock:
             node_info = self.known_nodes.get(str(self.node_id))
             if node_info:
-                node_info['metadata'].update(metadata_dict)
+                # Sem mudança real, a versão não aumenta e nada é propagado
+                if all(node_info['metadata'].get(k) == v and k in node_info['metadata']
+                       for k, v in metadata_dict.items()):
+                    return
+                # Novo dicionário: entradas já enviadas por referência não são alteradas
+                node_info['metadata'] = {**node_info['metadata'], **metadata_dict}
                 self.self_version += 1
                 node_info['version'] = self.self_version
+                # O índice publicado guarda cópias: a entrada deste nó é republicada
+                self._publish_local_entry(node_info)
                 self.logger.debug(f"Metadados locais atualizados: {metadata_dict}, nova versão: {self.self_version}")
     
     def set_leader(self, leader_id):
@@ -420,36 +1105,116 @@ class GossipProtocol:
         with self.lock:
             return self.leader_id
     
+    def _schedule_expiry(self, node_id):
+        """
+        Registra no heap o momento em que um nó passará a ser considerado inativo.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            node_id (str): ID do nó
+        """
+        heapq.heappush(self._expiry_heap, (self.known_nodes[node_id]['last_seen'] + self.node_timeout, node_id))
+    
+    def _refresh_views(self, now):
+        """
+        Retira do heap os nós expirados e, se o conjunto de nós ativos ou seus
+        metadados mudaram, publica um novo snapshot do índice por papel. O
+        snapshot guarda cópias rasas das entradas: last_seen, heartbeat e
+        metadata continuam mudando em known_nodes sem afetar os leitores.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            now (float): Momento atual
+        """
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, node_id = heapq.heappop(self._expiry_heap)
+            node = self.known_nodes.get(node_id)
+            # Entradas desatualizadas (nó visto de novo depois) são apenas descartadas
+            if node and now - node['last_seen'] > self.node_timeout and node_id in self._views[1]:
+                self._views_dirty = True
+        
+        valid_until = self._expiry_heap[0][0] if self._expiry_heap else float('inf')
+        
+        if self._views_dirty:
+            active = {}
+            by_role = {}
+            for node_id, node in self.known_nodes.items():
+                if now - node['last_seen'] <= self.node_timeout:
+                    node = dict(node)
+                    active[node_id] = node
+                    by_role.setdefault(node['role'], {})[node_id] = node
+            
+            self._views = (
+                {role: MappingProxyType(nodes) for role, nodes in by_role.items()},
+                MappingProxyType(active),
+                valid_until
+            )
+            self._views_dirty = False
+        else:
+            self._views = (self._views[0], self._views[1], valid_until)
+    
+    def _publish_local_entry(self, node_info):
+        """
+        Republica apenas a entrada deste nó no índice, sem reconstruí-lo.
+        Os metadados locais mudam a cada accept ou slot aprendido; reconstruir
+        o índice inteiro nesses casos faria cada consulta por papel no caminho
+        das mensagens refazê-lo sob o lock. Os mapeamentos já publicados não
+        são alterados: o novo snapshot copia apenas os dicionários afetados.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            node_info (dict): Entrada deste nó em known_nodes
+        """
+        node_id = str(self.node_id)
+        by_role, active, valid_until = self._views
+        if self._views_dirty or node_id not in active:
+            # Uma reconstrução já pendente (ou a primeira) inclui a entrada
+            self._views_dirty = True
+            return
+        
+        node = dict(node_info)
+        role = node['role']
+        by_role = dict(by_role)
+        by_role[role] = MappingProxyType({**by_role.get(role, {}), node_id: node})
+        self._views = (by_role, MappingProxyType({**active, node_id: node}), valid_until)
+    
+    def _get_views(self):
+        """
+        Obtém o snapshot atual do índice, reconstruindo-o apenas quando algum
+        nó entrou, saiu ou expirou desde a última publicação.
+        
+        Returns:
+            tuple: (nós ativos por papel, todos os nós ativos, válido até)
+        """
+        views = self._views
+        now = time.time()
+        if not self._views_dirty and now < views[2]:
+            return views
+        
+        with self.lock:
+            self._refresh_views(now)
+            return self._views
+    
     def get_nodes_by_role(self, role):
         """
-        Filtra nós conhecidos pelo papel.
+        Obtém os nós ativos com um papel.
         
         Args:
             role (str): Papel a filtrar (proposer, acceptor, learner, client)
         
         Returns:
-            dict: Dicionário de nós filtrados por papel
+            Mapping: Mapeamento imutável {node_id: nó} dos nós com o papel
         """
-        with self.lock:
-            current_time = time.time()
-            result = {k: v for k, v in self.known_nodes.items() 
-                    if v['role'] == role and 
-                    current_time - v['last_seen'] <= self.node_timeout}
-            self.logger.debug(f"Encontrados {len(result)} nós com papel '{role}'")
-            return result
+        return self._get_views()[0].get(role, MappingProxyType({}))
     
     def get_all_nodes(self):
         """
         Obtém todos os nós ativos conhecidos.
         
         Returns:
-            dict: Dicionário de todos os nós ativos
+            Mapping: Mapeamento imutável {node_id: nó} de todos os nós ativos
         """
-        with self.lock:
-            current_time = time.time()
-            result = {k: v for k, v in self.known_nodes.items() 
-                    if current_time - v['last_seen'] <= self.node_timeout}
-            return result
+        return self._get_views()[1]
     
     def get_node_info(self, node_id):
         """
@@ -1,12 +1,16 @@
 import json
+import os
 import time
 import threading
 import logging
-import requests
-from flask import request, jsonify
-from collections import defaultdict
+from urllib.parse import urlencode
+from concurrent.futures import wait as wait_futures
+from flask import request, Response, redirect
 
-from base_node import BaseNode
+from base_node import BaseNode, NOOP_VALUE
+from wire import jsonify
+from storage import create_learner_log
+from outbox import PeerOutbox
 
 class Learner(BaseNode):
     """
@@ -20,15 +24,81 @@ class Learner(BaseNode):
         """
         super().__init__(app)
         
+        # Valores aprendidos: log em segmentos no disco com apenas a cauda em memória
+        self.learned_log = create_learner_log(self.node_id)
+        state = self.learned_log.load()
+        
         # Estado específico do learner
-        self.learned_values = []
-        self.proposal_counts = defaultdict(int)
-        self.acceptor_responses = defaultdict(dict)
+        # Contagem de accepts por slot ainda não decidido (None para eleições):
+        # {slot: {proposal_number: {"value", "acceptors": set(acceptor_id)}}}
+        # O slot é removido ao atingir o quórum; slots mais antigos são descartados
+        # ao exceder max_pending_slots e recuperados depois pelo catch-up
+        self.acceptor_responses = {}
+        self.max_pending_slots = int(os.environ.get('LEARNER_MAX_PENDING_SLOTS', 10000))
+        self.pending_stats = {
+            "decided": 0,  # removidos ao atingir o quórum
+            "stale": 0,  # removidos porque o slot foi decidido com outra proposta
+            "overflow": 0,  # descartados por exceder max_pending_slots
+            "conflicts": 0,  # valores diferentes para o mesmo slot e proposta
+            "max_pending": 0
+        }
+        
+        # Tamanho máximo de página em /get-values (e de bloco no modo stream)
+        self.max_page_size = int(os.environ.get('GET_VALUES_MAX_PAGE', 1000))
+        
+        # Log replicado: slots decididos são aplicados estritamente em ordem
+        self.last_applied_slot = state["last_applied_slot"]
+        self.decided_slots = {}  # slots decididos aguardando slots anteriores
+        
+        # Leituras com min_slot (leia-suas-escritas) aguardam o learner alcançar
+        # o slot por até read_wait_timeout antes de redirecionar para outro learner
+        self.applied_condition = threading.Condition(self.lock)
+        self.read_wait_timeout = float(os.environ.get('READ_WAIT_TIMEOUT', 1.0))
+        self.reads_waited = 0
+        self.reads_redirected = 0
+        
+        # Catch-up: um learner que perdeu notificações ou reiniciou compara seu
+        # progresso com o publicado no gossip e busca os slots que faltam nos acceptors
+        self.catchup_interval = float(os.environ.get('CATCHUP_INTERVAL', 2.0))
+        self.catchup_chunk = int(os.environ.get('CATCHUP_CHUNK', 500))
+        self.catchup_last_seen_slot = self.last_applied_slot
+        self.catchup_runs = 0
+        self.catchup_slots = 0
         
-        # Estado compartilhado entre todos os nós (simulação)
-        self.shared_data = []
+        # Notificação de clientes: em modo "all" todo learner notifica; em modo
+        # "designated" apenas o learner designado para o cliente (ID do cliente
+        # módulo o número de learners). Notificações acumuladas para um cliente
+        # são enviadas juntas em um único /notify pela fila de saída do cliente
+        self.notify_mode = os.environ.get('CLIENT_NOTIFY_MODE', 'all').lower()
+        self.client_outboxes = {}
+        self.client_outboxes_lock = threading.Lock()
+        self.client_queue_limit = int(os.environ.get('CLIENT_OUTBOX_LIMIT', 10000))
+        self.client_notify_batch_size = int(os.environ.get('CLIENT_NOTIFY_BATCH_SIZE', 100))
+        self.client_notify_linger = float(os.environ.get('CLIENT_NOTIFY_LINGER_MS', 2)) / 1000.0
+        self.notifications_skipped = 0
+        
+        # Métricas de atraso do log e das filas de notificação (/metrics)
+        self.notify_retries = self.metrics.counter(
+            "paxos_retries_total", "Retried sends, by call site", ("site",)).labels("notify")
+        self.metrics.gauge("paxos_outbox_queued_messages", "Messages waiting in a peer outbox",
+                           lambda: {peer: len(outbox.queue) for peer, outbox in list(self.client_outboxes.items())},
+                           ("peer",))
+        self.metrics.gauge("paxos_learner_last_applied_slot", "Last slot applied in order by this learner",
+                           lambda: self.last_applied_slot)
+        self.metrics.gauge("paxos_learner_lag_slots",
+                           "Slots known to be decided (locally or by peer learners) and not yet applied",
+                           lambda: max(0, self._catch_up_target() - self.last_applied_slot))
+        self.metrics.gauge("paxos_learner_pending_slots", "Slots with accepts still waiting for a quorum",
+                           lambda: len(self.acceptor_responses))
+        
+        # Publicar o progresso carregado do disco para a comparação dos peers
+        self.gossip.update_local_metadata({
+            "last_learned_slot": self.last_applied_slot,
+            "learned_values_count": self.learned_log.values_count
+        })
     
-    def _get_default_port(self):
+    @classmethod
+    def _get_default_port(cls):
         """Porta padrão para learners"""
         return 5000
     
@@ -42,11 +112,171 @@ class Learner(BaseNode):
         @self.app.route('/get-values', methods=['GET'])
         def get_values():
             """Obter valores aprendidos"""
-            return jsonify({"values": self.shared_data}), 200
+            return self._handle_get_values(request.args)
+    
+    def _start_threads(self):
+        """Iniciar threads específicas do learner"""
+        # Thread de snapshot e compactação do log aprendido
+        threading.Thread(target=self._snapshot_loop, daemon=True).start()
+        
+        # Thread de detecção de lacunas e catch-up
+        threading.Thread(target=self._catch_up_loop, daemon=True).start()
+    
+    def _snapshot_loop(self):
+        """
+        Gravar periodicamente um snapshot do log aprendido e remover
+        segmentos antigos.
+        """
+        while True:
+            try:
+                if self.learned_log.should_snapshot():
+                    self.learned_log.snapshot()
+            except Exception as e:
+                self.logger.error(f"Erro ao gravar snapshot do log: {e}")
+            
+            time.sleep(1)
+    
+    def _handle_get_values(self, args):
+        """
+        Manipula leituras paginadas do log aprendido.
+        
+        Parâmetros de consulta:
+            offset: primeiro índice a retornar (padrão 0)
+            since: cursor; retorna apenas entradas com índice maior que since
+            limit: quantidade máxima de entradas (limitada a max_page_size)
+            stream: "true" para enviar todas as entradas a partir do início
+                    em NDJSON com transferência chunked
+            min_slot: slot em que o valor foi decidido (notificação de commit
+                      ou /send com wait_for_commit); a leitura só é
+                      respondida depois que este learner aplicar o slot
+        
+        Args:
+            args (MultiDict): Parâmetros da requisição
+        
+        Returns:
+            Response: Resposta HTTP
+        """
+        try:
+            start = int(args.get('offset', 0))
+            if args.get('since') is not None:
+                start = int(args.get('since')) + 1
+            limit = args.get('limit')
+            limit = int(limit) if limit is not None else None
+            min_slot = args.get('min_slot')
+            min_slot = int(min_slot) if min_slot is not None else None
+        except ValueError:
+            return jsonify({"error": "offset, since, limit and min_slot must be integers"}), 400
+        
+        if start < 0 or (limit is not None and limit < 0):
+            return jsonify({"error": "offset, since and limit must not be negative"}), 400
+        
+        if min_slot is not None and not self._wait_for_slot(min_slot):
+            return self._redirect_read(min_slot, args)
+        
+        if args.get('stream', '').lower() == 'true':
+            return Response(self._stream_entries(start, limit), mimetype='application/x-ndjson')
+        
+        page_size = self.max_page_size if limit is None else min(limit, self.max_page_size)
+        entries = self.learned_log.read(start, page_size)
+        total = self.learned_log.values_count
+        next_offset = entries[-1]["index"] + 1 if entries else max(start, self.learned_log.base_index)
+        
+        return jsonify({
+            "values": [entry["value"] for entry in entries],
+            "offset": entries[0]["index"] if entries else next_offset,
+            "next_offset": next_offset,
+            "next_cursor": next_offset - 1,
+            "has_more": next_offset < total,
+            "total": total,
+            "base_index": self.learned_log.base_index
+        }), 200
+    
+    def _wait_for_slot(self, slot):
+        """
+        Aguarda, por até read_wait_timeout, que o slot informado seja aplicado.
+        
+        Args:
+            slot (int): Slot mínimo exigido pela leitura
+        
+        Returns:
+            bool: True se o learner já aplicou o slot
+        """
+        deadline = time.time() + self.read_wait_timeout
+        with self.lock:
+            if self.last_applied_slot < slot:
+                self.reads_waited += 1
+            while self.last_applied_slot < slot:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self.applied_condition.wait(remaining)
+            return True
+    
+    def _redirect_read(self, min_slot, args):
+        """
+        Redireciona uma leitura para um learner que, segundo o gossip, já aplicou
+        o slot exigido. Uma leitura já redirecionada não é redirecionada de novo.
+        
+        Args:
+            min_slot (int): Slot mínimo exigido pela leitura
+            args (MultiDict): Parâmetros da requisição
+        
+        Returns:
+            Response: Redirecionamento 307 ou erro 503
+        """
+        if not args.get('redirected'):
+            for learner_id, learner in self.gossip.get_nodes_by_role('learner').items():
+                metadata = learner.get('metadata') or {}
+                if learner_id == str(self.node_id) or metadata.get('last_learned_slot', 0) < min_slot:
+                    continue
+                
+                self.reads_redirected += 1
+                query = urlencode({**args.to_dict(), "redirected": 1})
+                location = f"http://{learner['address']}:{learner['port']}/get-values?{query}"
+                self.logger.info(f"Leitura com min_slot {min_slot} redirecionada para o learner {learner_id}")
+                return redirect(location, code=307)
+        
+        return jsonify({
+            "error": "Learner has not reached the requested slot",
+            "min_slot": min_slot,
+            "last_learned_slot": self.last_applied_slot
+        }), 503
+    
+    def _stream_entries(self, start, limit=None):
+        """
+        Gera as entradas do log em NDJSON, lendo-as em blocos para não
+        carregar o histórico inteiro em memória.
+        
+        Args:
+            start (int): Primeiro índice
+            limit (int, optional): Quantidade máxima de entradas
+        
+        Yields:
+            str: Uma linha JSON por entrada
+        """
+        sent = 0
+        while limit is None or sent < limit:
+            chunk = self.max_page_size if limit is None else min(self.max_page_size, limit - sent)
+            entries = self.learned_log.read(start, chunk)
+            if not entries:
+                break
+            
+            yield "".join(json.dumps({
+                "index": entry["index"],
+                "slot": entry["slot"],
+                "batch_index": entry["batch_index"],
+                "value": entry["value"]
+            }) + "\n" for entry in entries)
+            
+            sent += len(entries)
+            start = entries[-1]["index"] + 1
     
     def _handle_learn(self, data):
         """
         Manipula notificações de valores aceitos dos acceptors.
+        Aceita uma notificação única ou um lote no formato
+        {"acceptor_id", "entries": [{proposal_number, slot, value, client_id, is_leader_election}]},
+        processado com uma única aquisição do lock.
         
         Args:
             data (dict): Dados da notificação
@@ -55,99 +285,367 @@ class Learner(BaseNode):
             Response: Resposta HTTP
         """
         acceptor_id = data.get('acceptor_id')
-        proposal_number = data.get('proposal_number')
-        value = data.get('value')
-        client_id = data.get('client_id')
-        is_leader_election = data.get('is_leader_election', False)
+        is_batch = 'entries' in data
+        entries = (data.get('entries') or []) if is_batch else [data]
+        
+        if not acceptor_id:
+            return jsonify({"error": "Missing required information"}), 400
         
-        if not all([acceptor_id, proposal_number, value]):
+        valid = [entry for entry in entries if entry.get('proposal_number') and entry.get('value')]
+        if not is_batch and not valid:
             return jsonify({"error": "Missing required information"}), 400
+        if len(valid) < len(entries):
+            self.logger.warning(f"Ignorando {len(entries) - len(valid)} notificações incompletas do acceptor {acceptor_id}")
+        
+        # Apenas acceptors da configuração contam para o quórum
+        if not self.acceptor_config.is_member(acceptor_id):
+            self.logger.warning(f"Ignorando notificação do acceptor {acceptor_id}, fora da configuração v{self.acceptor_config.version}")
+            return jsonify({"error": "Acceptor not in configuration"}), 409
+        
+        # Verificar quórum de fase 2 (acceptors que aceitaram o mesmo valor)
+        quorum_size = self.acceptor_config.phase2_quorum()
+        
+        with self.lock:
+            decided = False
+            for entry in valid:
+                decided = self._record_acceptance(acceptor_id, entry, quorum_size) or decided
+            
+            if decided:
+                self._apply_decided_slots()
+        
+        if is_batch:
+            return jsonify({"status": "acknowledged", "count": len(valid)}), 200
+        return jsonify({"status": "acknowledged", "slot": data.get('slot')}), 200
+    
+    def _record_acceptance(self, acceptor_id, entry, quorum_size):
+        """
+        Registra a aceitação de um valor por um acceptor e verifica o quórum.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            acceptor_id (int): ID do acceptor
+            entry (dict): Notificação (proposal_number, slot, value, client_id, is_leader_election)
+            quorum_size (int): Tamanho do quórum
+        
+        Returns:
+            bool: True se um novo slot foi decidido
+        """
+        proposal_number = entry.get('proposal_number')
+        slot = entry.get('slot')
+        value = entry.get('value')
+        
+        # Slots já decididos não precisam de nova contagem
+        if slot and (slot <= self.last_applied_slot or slot in self.decided_slots):
+            return False
+        
+        ballots = self.acceptor_responses.get(slot)
+        if ballots is None:
+            ballots = self.acceptor_responses[slot] = {}
+            self._limit_pending_slots()
+        
+        # Um número de proposta propõe um único valor por slot
+        tally = ballots.get(proposal_number)
+        if tally is None:
+            tally = ballots[proposal_number] = {"value": value, "acceptors": set()}
+        elif tally["value"] != value:
+            self.pending_stats["conflicts"] += 1
+            self.logger.warning(f"Acceptor {acceptor_id} reportou outro valor para a proposta {proposal_number} (slot {slot}), ignorando")
+            return False
         
+        # Registrar resposta deste acceptor
+        tally["acceptors"].add(acceptor_id)
+        value_count = len(tally["acceptors"])
+        
+        self.logger.info(f"Acceptor {acceptor_id} enviou valor: {value} para proposta {proposal_number} (slot {slot}). Contagem: {value_count}/{quorum_size}")
+        
+        if value_count < quorum_size:
+            return False
+        
+        # Quórum atingido: contagens do slot (de qualquer proposta) não são mais necessárias
+        del self.acceptor_responses[slot]
+        self.pending_stats["decided"] += 1
+        self.pending_stats["stale"] += len(ballots) - 1
+        
+        # Se for uma eleição de líder, atualizar informação no Gossip
+        if entry.get('is_leader_election', False) and value.startswith("leader:"):
+            leader_id = int(value.split(":")[1])
+            self.gossip.set_leader(leader_id)
+            self.logger.info(f"Atualizando líder para {leader_id}")
+        elif slot:
+            self.decided_slots[slot] = {
+                "proposal_number": proposal_number,
+                "value": value,
+                "client_id": entry.get('client_id')
+            }
+            self.logger.info(f"Slot {slot} decidido")
+            return True
+        
+        return False
+    
+    def _catch_up_loop(self):
+        """
+        Verifica periodicamente se o learner está atrasado e, se ele não
+        avançou desde a verificação anterior, busca os slots que faltam.
+        """
+        while True:
+            time.sleep(self.catchup_interval)
+            try:
+                target_slot = self._catch_up_target()
+                with self.lock:
+                    stalled = self.last_applied_slot == self.catchup_last_seen_slot
+                    self.catchup_last_seen_slot = self.last_applied_slot
+                    behind = target_slot > self.last_applied_slot
+                
+                # Atraso momentâneo (notificações a caminho) não exige catch-up
+                if behind and stalled:
+                    self._catch_up(target_slot)
+            except Exception as e:
+                self.logger.error(f"Erro no catch-up: {e}")
+    
+    def _catch_up_target(self):
+        """
+        Calcula até qual slot o learner deveria ter aplicado, com base apenas em
+        evidência de decisão: os slots decididos após uma lacuna e o progresso
+        publicado no gossip pelos outros learners (last_learned_slot,
+        learned_values_count). O last_accepted_slot dos acceptors não é usado:
+        um slot aceito por uma minoria (ex.: líder que caiu no meio da rodada)
+        pode nunca ser decidido, e o learner pareceria atrasado para sempre.
+        
+        Returns:
+            int: Slot alvo
+        """
+        with self.lock:
+            target_slot = max(self.decided_slots, default=0)
+        values_count = self.learned_log.values_count
+        
+        for learner_id, learner in self.gossip.get_nodes_by_role('learner').items():
+            metadata = learner.get('metadata') or {}
+            if learner_id == str(self.node_id):
+                continue
+            if (metadata.get('last_learned_slot', 0) > target_slot or
+                    metadata.get('learned_values_count', 0) > values_count):
+                target_slot = max(target_slot, metadata.get('last_learned_slot', 0))
+        
+        return target_slot
+    
+    def _catch_up(self, target_slot):
+        """
+        Busca nos acceptors, em blocos de catchup_chunk slots, os valores aceitos
+        a partir do primeiro slot não aplicado. As respostas são contabilizadas
+        como notificações /learn, de modo que um slot só é aplicado com quórum
+        de fase 2.
+        
+        Args:
+            target_slot (int): Slot até o qual buscar
+        """
         with self.lock:
-            # Registrar resposta deste acceptor
-            self.acceptor_responses[proposal_number][acceptor_id] = value
+            start_slot = self.last_applied_slot
+        self.catchup_runs += 1
+        self.logger.info(f"Learner atrasado: buscando slots {start_slot + 1} a {target_slot} nos acceptors")
+        
+        while True:
+            with self.lock:
+                from_slot = self.last_applied_slot + 1
+            if from_slot > target_slot:
+                break
+            
+            params = {"from_slot": from_slot, "limit": self.catchup_chunk}
+            futures = [future for future in (
+                self.executor.submit(self._fetch_accepted, acceptor_url, params)
+                for _, acceptor_url in self.acceptor_config.targets('/accepted')
+            ) if future]
+            done, _ = wait_futures(futures, timeout=10)
+            quorum_size = self.acceptor_config.phase2_quorum()
+            
+            with self.lock:
+                for future in done:
+                    result = future.result()
+                    if not result or not self.acceptor_config.is_member(result.get("acceptor_id")):
+                        continue
+                    for entry in result.get("entries", []):
+                        self._record_acceptance(result["acceptor_id"], entry, quorum_size)
+                self._apply_decided_slots()
+                advanced = self.last_applied_slot >= from_slot
+            
+            # Sem quórum para o próximo slot: tentar novamente na próxima verificação
+            if not advanced:
+                break
+        
+        with self.lock:
+            recovered = self.last_applied_slot - start_slot
+            self.catchup_slots += recovered
+        self.logger.info(f"Catch-up concluído: {recovered} slots recuperados (último slot aplicado: {self.last_applied_slot})")
+    
+    def _fetch_accepted(self, url, params):
+        """
+        Obtém um bloco de valores aceitos de um acceptor.
+        
+        Args:
+            url (str): URL do endpoint /accepted
+            params (dict): from_slot e limit
+        
+        Returns:
+            dict: Resposta do acceptor, ou None em caso de erro
+        """
+        try:
+            response = self.transport.get(url, params=params, timeout=5)
+            if response.status_code == 200:
+                return response.json()
+            self.logger.warning(f"Erro ao buscar valores aceitos: {response.status_code} - {response.text}")
+        except Exception as e:
+            self.logger.warning(f"Erro ao buscar valores aceitos: {e}")
+        return None
+    
+    def _limit_pending_slots(self):
+        """
+        Descarta as contagens dos slots pendentes mais antigos quando o limite é
+        excedido. Um slot descartado que chegar a ser decidido é recuperado pelo catch-up.
+        Deve ser chamado com self.lock adquirido.
+        """
+        pending = len(self.acceptor_responses)
+        self.pending_stats["max_pending"] = max(self.pending_stats["max_pending"], pending)
+        
+        while len(self.acceptor_responses) > self.max_pending_slots:
+            oldest = next(iter(self.acceptor_responses))
+            del self.acceptor_responses[oldest]
+            self.pending_stats["overflow"] += 1
+            self.logger.warning(f"Limite de {self.max_pending_slots} slots pendentes excedido, descartando contagem do slot {oldest}")
+    
+    def _apply_decided_slots(self):
+        """
+        Aplica, em ordem, os slots decididos contíguos ao último slot aplicado.
+        Slots decididos fora de ordem aguardam até que as lacunas sejam preenchidas.
+        Deve ser chamado com self.lock adquirido.
+        """
+        while self.last_applied_slot + 1 in self.decided_slots:
+            slot = self.last_applied_slot + 1
+            entry = self.decided_slots.pop(slot)
+            self.last_applied_slot = slot
+            
+            proposal_number = entry["proposal_number"]
+            value = entry["value"]
+            
+            # No-op preenche lacunas deixadas por um líder anterior
+            if value == NOOP_VALUE:
+                batch = []
+            # Um slot contém um lote ordenado de valores; propostas antigas têm valor único
+            elif isinstance(value, list):
+                batch = value
+            else:
+                batch = [{"value": value, "client_id": entry["client_id"]}]
             
-            # Verificar quórum (mais da metade dos acceptors concordam com o mesmo valor)
-            acceptors = self.gossip.get_nodes_by_role('acceptor')
-            quorum_size = len(acceptors) // 2 + 1
+            # Registrar os valores no log aprendido
+            learned = self.learned_log.append_slot(slot, proposal_number, batch)
             
-            # Contar quantos acceptors concordam com este valor
-            value_count = sum(1 for v in self.acceptor_responses[proposal_number].values() if v == value)
+            for item in learned:
+                # Notificar cliente
+                if item.get("client_id"):
+                    self._notify_client(item["client_id"], item["value"], 
+                                        proposal_number, slot, item["batch_index"])
             
-            self.logger.info(f"Acceptor {acceptor_id} enviou valor: {value} para proposta {proposal_number}. Contagem: {value_count}/{quorum_size}")
+            # Atualizar metadata no Gossip, também para slots no-op: o progresso
+            # publicado é usado por redirecionamentos de leitura e pelo catch-up
+            metadata = {
+                "last_learned_proposal": proposal_number,
+                "last_learned_slot": slot,
+                "learned_values_count": self.learned_log.values_count
+            }
+            if learned:
+                metadata["last_learned_value"] = learned[-1]["value"]
+            self.gossip.update_local_metadata(metadata)
             
-            if value_count >= quorum_size:
-                # Se for uma eleição de líder, atualizar informação no Gossip
-                if is_leader_election and value.startswith("leader:"):
-                    leader_id = int(value.split(":")[1])
-                    self.gossip.set_leader(leader_id)
-                    self.logger.info(f"Atualizando líder para {leader_id}")
-                else:
-                    # Adicionar aos valores aprendidos
-                    self.learned_values.append({
-                        "proposal_number": proposal_number, 
-                        "value": value, 
-                        "timestamp": time.time()
-                    })
-                    
-                    # Atualizar dados compartilhados
-                    self.shared_data.append(value)
-                    
-                    # Atualizar metadata no Gossip
-                    self.gossip.update_local_metadata({
-                        "last_learned_proposal": proposal_number,
-                        "last_learned_value": value,
-                        "learned_values_count": len(self.learned_values)
-                    })
-                    
-                    self.logger.info(f"Aprendido valor: {value} da proposta {proposal_number}")
-                    
-                    # Notificar cliente
-                    if client_id:
-                        threading.Thread(target=self._notify_client, 
-                                        args=(client_id, value, proposal_number)).start()
-        
-        return jsonify({"status": "acknowledged"}), 200
-    
-    def _notify_client(self, client_id, value, proposal_number):
-        """
-        Notificar cliente sobre valor aprendido
+            self.logger.info(f"Aprendidos {len(learned)} valores da proposta {proposal_number} (slot {slot})")
+        
+        self.applied_condition.notify_all()
+    
+    def _notify_client(self, client_id, value, proposal_number, slot=None, batch_index=0):
+        """
+        Notificar cliente sobre valor aprendido.
+        A notificação é colocada na fila de saída do cliente, que agrupa as
+        notificações pendentes em um único /notify.
         
         Args:
             client_id (int): ID do cliente
             value (str): Valor aprendido
             proposal_number (int): Número da proposta
+            slot (int, optional): Slot do log replicado
+            batch_index (int): Posição do valor no lote do slot
         """
-        self.logger.info(f"Procurando cliente {client_id} para notificar")
+        if self.notify_mode == 'designated' and not self._is_designated_notifier(client_id):
+            self.notifications_skipped += 1
+            return
         
-        # Obter clientes via Gossip
-        clients = self.gossip.get_nodes_by_role('client')
+        client_key = str(client_id)
+        with self.client_outboxes_lock:
+            outbox = self.client_outboxes.get(client_key)
+            if outbox is None:
+                # Descartar filas de clientes que saíram do cluster e já foram esvaziadas
+                clients = self.gossip.get_nodes_by_role('client')
+                for known_id in list(self.client_outboxes):
+                    if known_id not in clients and self.client_outboxes[known_id].is_idle():
+                        del self.client_outboxes[known_id]
+                
+                outbox = self.client_outboxes[client_key] = PeerOutbox(
+                    client_key, self._send_to_client, self.executor, self.logger,
+                    max_queue=self.client_queue_limit,
+                    max_batch=self.client_notify_batch_size,
+                    linger=self.client_notify_linger,
+                    retries=self.notify_retries
+                )
         
-        client = None
-        for cid, c in clients.items():
-            if str(c['id']) == str(client_id):
-                client = c
-                break
+        outbox.enqueue({
+            "proposal_number": proposal_number,
+            "slot": slot,
+            "batch_index": batch_index,
+            "value": value,
+            "learned_at": time.strftime("%Y-%m-%d %H:%M:%S")
+        })
+    
+    def _is_designated_notifier(self, client_id):
+        """
+        Verifica se este learner é o responsável por notificar o cliente.
+        Todos os learners chegam à mesma escolha a partir da lista de learners do gossip.
         
-        if client:
-            try:
-                client_url = f"http://{client['address']}:{client['port']}/notify"
-                data = {
-                    "learner_id": self.node_id,
-                    "proposal_number": proposal_number,
-                    "value": value,
-                    "learned_at": time.strftime("%Y-%m-%d %H:%M:%S")
-                }
-                
-                response = requests.post(client_url, json=data, timeout=5)
-                if response.status_code != 200:
-                    self.logger.warning(f"Erro ao notificar cliente {client_id}: {response.text}")
-                else:
-                    self.logger.info(f"Cliente {client_id} notificado sobre valor: {value}")
-            except Exception as e:
-                self.logger.error(f"Erro ao notificar cliente {client_id}: {e}")
-        else:
+        Args:
+            client_id (int): ID do cliente
+        
+        Returns:
+            bool: True se este learner deve notificar o cliente
+        """
+        learner_ids = sorted({int(learner_id) for learner_id in self.gossip.get_nodes_by_role('learner')} | {self.node_id})
+        return learner_ids[int(client_id) % len(learner_ids)] == self.node_id
+    
+    def _send_to_client(self, client_id, notifications, timeout):
+        """
+        Entregar um lote de notificações a um cliente em um único /notify
+        (usado pelas filas de saída)
+        
+        Args:
+            client_id (str): ID do cliente
+            notifications (list): Notificações, em ordem de aprendizado
+            timeout (float): Timeout da requisição em segundos
+        
+        Returns:
+            bool: True se o cliente confirmou o recebimento
+        """
+        client = self.gossip.get_nodes_by_role('client').get(client_id)
+        if not client:
             self.logger.warning(f"Cliente {client_id} não encontrado")
+            return False
+        
+        client_url = f"http://{client['address']}:{client['port']}/notify"
+        data = {
+            "learner_id": self.node_id,
+            "notifications": notifications
+        }
+        response = self.transport.post(client_url, json=data, timeout=timeout)
+        
+        if response.status_code == 200:
+            self.logger.info(f"Cliente {client_id} notificado sobre {len(notifications)} valores")
+            return True
+        
+        self.logger.warning(f"Erro ao notificar cliente {client_id}: {response.text}")
+        return False
     
     def _handle_view_logs(self):
         """Manipulador para a rota view-logs"""
@@ -156,10 +654,32 @@ class Learner(BaseNode):
         return jsonify({
             "id": self.node_id,
             "role": self.node_role,
-            "learned_values_count": len(self.learned_values),
-            "recent_learned_values": self.learned_values[-10:] if self.learned_values else [],
-            "shared_data": self.shared_data,
+            "learned_values_count": self.learned_log.values_count,
+            "last_applied_slot": self.last_applied_slot,
+            "pending_decided_slots": sorted(self.decided_slots),
+            "pending_instances": {
+                "slots": len(self.acceptor_responses),
+                "limit": self.max_pending_slots,
+                **self.pending_stats
+            },
+            "reads_waited": self.reads_waited,
+            "reads_redirected": self.reads_redirected,
+            "catch_up": {
+                "runs": self.catchup_runs,
+                "slots_recovered": self.catchup_slots
+            },
+            "recent_learned_values": self.learned_log.tail(10),
+            "storage": self.learned_log.stats(),
             "clients_count": len(clients),
+            "client_notifications": {
+                "mode": self.notify_mode,
+                "skipped": self.notifications_skipped,
+                "outboxes": {
+                    client_id: outbox.stats() for client_id, outbox in list(self.client_outboxes.items())
+                }
+            },
+            "workers": self.executor.stats(),
+            "transport": self.transport.stats(),
             "known_nodes_count": len(self.gossip.get_all_nodes()),
             "current_leader": self.gossip.get_leader()
         }), 200
@@ -27,23 +27,23 @@ def main():
     # Criar a instância apropriada do nó
     if node_role == 'proposer':
         logger.info("Iniciando nó Proposer")
-        node = Proposer()
+        node_class = Proposer
     elif node_role == 'acceptor':
         logger.info("Iniciando nó Acceptor")
-        node = Acceptor()
+        node_class = Acceptor
     elif node_role == 'learner':
         logger.info("Iniciando nó Learner")
-        node = Learner()
+        node_class = Learner
     elif node_role == 'client':
         logger.info("Iniciando nó Client")
-        node = Client()
+        node_class = Client
     else:
         logger.error(f"Tipo de nó desconhecido: {node_role}")
         logger.error("Use NODE_ROLE=proposer|acceptor|learner|client")
         sys.exit(1)
     
-    # Iniciar o nó
-    node.start()
+    # Criar o nó e iniciar o servidor (modo definido por SERVER_MODE)
+    node_class.serve()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
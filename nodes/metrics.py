@@ -0,0 +1,283 @@
+import bisect
+import threading
+
+# Limites padrão dos histogramas de latência, em segundos
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _escape(value):
+    """Escapa um valor de label no formato de exposição do Prometheus"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(pairs):
+    """
+    Formata pares (nome, valor) como bloco de labels.
+
+    Args:
+        pairs (list): Pares (nome, valor)
+
+    Returns:
+        str: Bloco {nome="valor",...} ou string vazia
+    """
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _format_value(value):
+    """Formata um número no formato de exposição do Prometheus"""
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+class _Family:
+    """
+    Família de séries de uma métrica. Cada combinação de valores de labels tem
+    uma série filha criada na primeira utilização e reaproveitada depois, de
+    modo que o caminho quente não monta strings nem dicionários novos.
+    """
+
+    kind = None
+
+    def __init__(self, registry, name, help_text, labels):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.children = {}
+        self.lock = threading.Lock()
+        # Série sem labels, usada diretamente quando a métrica não tem labels
+        self._default = None if self.label_names else self.labels()
+
+    def labels(self, *values):
+        """
+        Retorna a série com os valores de labels informados.
+
+        Args:
+            *values: Valores dos labels, na ordem declarada
+
+        Returns:
+            Série filha (criada se ainda não existir)
+        """
+        child = self.children.get(values)
+        if child is not None:
+            return child
+
+        if len(values) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {values}")
+        with self.lock:
+            child = self.children.get(values)
+            if child is None:
+                pairs = self.registry.const_labels + list(zip(self.label_names, values))
+                child = self.children[values] = self._new_child(pairs)
+        return child
+
+    def _new_child(self, pairs):
+        raise NotImplementedError
+
+    def collect(self):
+        """Linhas de exposição de todas as séries"""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for child in list(self.children.values()):
+            lines.extend(child.collect(self.name))
+        return lines
+
+class _CounterChild:
+    def __init__(self, pairs):
+        self.label_text = _format_labels(pairs)
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def collect(self, name):
+        return [f"{name}{self.label_text} {_format_value(self.value)}"]
+
+class Counter(_Family):
+    """Contador monotônico"""
+
+    kind = "counter"
+
+    def _new_child(self, pairs):
+        return _CounterChild(pairs)
+
+    def inc(self, amount=1):
+        """Incrementa a série sem labels"""
+        self._default.inc(amount)
+
+class _HistogramChild:
+    def __init__(self, pairs, buckets):
+        self.pairs = pairs
+        self.label_text = _format_labels(pairs)
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # o último é o bucket +Inf
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def collect(self, name):
+        with self.lock:
+            counts = list(self.counts)
+            total = self.sum
+
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            labels = _format_labels(self.pairs + [("le", _format_value(float(bound)))])
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        lines.append(f"{name}_sum{self.label_text} {_format_value(total)}")
+        lines.append(f"{name}_count{self.label_text} {cumulative}")
+        return lines
+
+class Histogram(_Family):
+    """Histograma com buckets fixos (contagem por faixa, soma e total)"""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, labels, buckets):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(registry, name, help_text, labels)
+
+    def _new_child(self, pairs):
+        return _HistogramChild(pairs, self.buckets)
+
+    def observe(self, value):
+        """Registra uma observação na série sem labels"""
+        self._default.observe(value)
+
+class Gauge:
+    """
+    Gauge calculado no momento da coleta por uma função, para valores que o
+    nó já mantém (profundidade de filas, threads, atraso do log) e que não
+    precisam de atualização no caminho quente.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, registry, name, help_text, fn, labels):
+        """
+        Args:
+            fn (callable): Sem labels, retorna um número; com labels, retorna
+                {valor do label (ou tupla de valores): número}
+        """
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.fn = fn
+        self.label_names = tuple(labels)
+
+    def collect(self):
+        """Linhas de exposição com os valores atuais"""
+        values = self.fn()
+        if not self.label_names:
+            values = {(): values}
+
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for label_values, value in values.items():
+            if value is None:
+                continue
+            if not isinstance(label_values, tuple):
+                label_values = (label_values,)
+            pairs = self.registry.const_labels + list(zip(self.label_names, label_values))
+            lines.append(f"{self.name}{_format_labels(pairs)} {_format_value(value)}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Registro das métricas de um nó, exposto em /metrics no formato texto do
+    Prometheus. Contadores e histogramas são atualizados no caminho quente
+    com um incremento protegido por lock da própria série; gauges são
+    calculados apenas quando a rota é consultada.
+    """
+
+    def __init__(self, const_labels=None):
+        """
+        Inicializa o registro.
+
+        Args:
+            const_labels (dict, optional): Labels adicionados a todas as séries
+                (ex.: papel e ID do nó)
+        """
+        self.const_labels = list((const_labels or {}).items())
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _register(self, name, factory):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = factory()
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        """
+        Registra (ou retorna o já registrado) um contador.
+
+        Args:
+            name (str): Nome da métrica
+            help_text (str): Descrição
+            labels (tuple): Nomes dos labels
+
+        Returns:
+            Counter: Contador
+        """
+        return self._register(name, lambda: Counter(self, name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        """
+        Registra (ou retorna o já registrado) um histograma.
+
+        Args:
+            name (str): Nome da métrica
+            help_text (str): Descrição
+            labels (tuple): Nomes dos labels
+            buckets (tuple): Limites superiores dos buckets
+
+        Returns:
+            Histogram: Histograma
+        """
+        return self._register(name, lambda: Histogram(self, name, help_text, labels, buckets))
+
+    def gauge(self, name, help_text, fn, labels=()):
+        """
+        Registra um gauge calculado na coleta.
+
+        Args:
+            name (str): Nome da métrica
+            help_text (str): Descrição
+            fn (callable): Função que retorna o valor (ver Gauge)
+            labels (tuple): Nomes dos labels
+
+        Returns:
+            Gauge: Gauge
+        """
+        return self._register(name, lambda: Gauge(self, name, help_text, fn, labels))
+
+    def render(self):
+        """
+        Gera a exposição de todas as métricas.
+
+        Returns:
+            str: Métricas no formato texto do Prometheus
+        """
+        with self.lock:
+            metrics = list(self.metrics.values())
+
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.collect())
+            except Exception:
+                # Um gauge com falha não deve impedir a coleta das demais métricas
+                continue
+        return "\n".join(lines) + "\n"
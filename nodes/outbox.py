@@ -0,0 +1,170 @@
+import time
+import threading
+import logging
+from collections import deque
+
+class PeerOutbox:
+    """
+    Fila de saída dedicada a um peer. As mensagens são entregues em ordem por
+    no máximo uma tarefa do pool de workers por vez, com estado de retry
+    próprio: um peer lento ou fora do ar só atrasa a sua própria fila.
+    Mensagens acumuladas são agrupadas em lotes de até max_batch por envio.
+    """
+
+    def __init__(self, peer_id, send_fn, executor, logger=None, max_queue=1000,
+                 max_retries=3, base_timeout=1.0, max_batch=1, linger=0, retries=None,
+                 reschedule_delay=0.1):
+        """
+        Inicializa a fila de saída.
+
+        Args:
+            peer_id (str): ID do peer de destino
+            send_fn (callable): Função send_fn(peer_id, messages, timeout) que
+                entrega um lote de mensagens e retorna True em caso de sucesso
+            executor (BoundedExecutor): Pool de workers do nó
+            logger (Logger, optional): Logger do nó
+            max_queue (int): Máximo de mensagens pendentes (as mais antigas são descartadas)
+            max_retries (int): Tentativas por mensagem
+            base_timeout (float): Timeout da primeira tentativa, dobrado a cada retry
+            max_batch (int): Máximo de mensagens por envio
+            linger (float): Espera, em segundos, por mais mensagens antes do primeiro envio
+            retries (Counter, optional): Série de métrica incrementada a cada retry
+            reschedule_delay (float): Espera, em segundos, antes de agendar de
+                novo a entrega recusada pelo pool cheio
+        """
+        self.peer_id = peer_id
+        self.send_fn = send_fn
+        self.executor = executor
+        self.logger = logger or logging.getLogger("[Outbox]")
+        self.max_retries = max_retries
+        self.base_timeout = base_timeout
+        self.max_batch = max(1, max_batch)
+        self.linger = linger
+        self.retries = retries
+        self.reschedule_delay = reschedule_delay
+
+        self.queue = deque(maxlen=max_queue)
+        self.lock = threading.Lock()
+        self.active = False  # Se há uma tarefa de entrega em andamento
+
+        # Métricas
+        self.sent = 0
+        self.batches = 0
+        self.failed = 0
+        self.dropped = 0
+        self.stalls = 0  # entregas recusadas pelo pool cheio e reagendadas
+        self.consecutive_failures = 0
+        self.last_success = None
+
+    def enqueue(self, message):
+        """
+        Adiciona uma mensagem à fila e agenda a entrega, se necessário.
+
+        Args:
+            message (dict): Mensagem a entregar
+        """
+        with self.lock:
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+            self.queue.append(message)
+
+            if self.active:
+                return
+            self.active = True
+
+        self._schedule()
+
+    def _schedule(self):
+        """
+        Agenda a entrega no pool de workers. Com o pool cheio, a fila continua
+        ativa e a entrega é reagendada após reschedule_delay, para que a última
+        mensagem para um peer sem tráfego novo não fique parada na fila.
+        """
+        if self.executor.submit(self._drain) is not None:
+            return
+
+        with self.lock:
+            self.stalls += 1
+        timer = threading.Timer(self.reschedule_delay, self._schedule)
+        timer.daemon = True
+        timer.start()
+
+    def _drain(self):
+        """
+        Entrega as mensagens pendentes em ordem, em lotes, até esvaziar a fila.
+        A espera inicial (linger) só ocorre quando a fila estava ociosa; depois
+        disso, as mensagens que chegam durante um envio formam o lote seguinte.
+        """
+        if self.linger > 0:
+            with self.lock:
+                short = len(self.queue) < self.max_batch
+            if short:
+                time.sleep(self.linger)
+
+        while True:
+            with self.lock:
+                if not self.queue:
+                    self.active = False
+                    return
+                count = min(self.max_batch, len(self.queue))
+                messages = [self.queue.popleft() for _ in range(count)]
+
+            self._deliver(messages)
+
+    def _deliver(self, messages):
+        """
+        Entrega um lote de mensagens com retry e backoff exponencial.
+
+        Args:
+            messages (list): Mensagens a entregar
+
+        Returns:
+            bool: True se o lote foi entregue
+        """
+        for retry in range(self.max_retries):
+            timeout = self.base_timeout * (2 ** retry)
+            try:
+                if self.send_fn(self.peer_id, messages, timeout):
+                    with self.lock:
+                        self.sent += len(messages)
+                        self.batches += 1
+                        self.consecutive_failures = 0
+                        self.last_success = time.time()
+                    return True
+            except Exception as e:
+                self.logger.error(f"Erro ao entregar mensagem para {self.peer_id} (tentativa {retry+1}/{self.max_retries}): {e}")
+
+            # Se não for a última tentativa, esperar antes de tentar novamente
+            if retry < self.max_retries - 1:
+                if self.retries is not None:
+                    self.retries.inc()
+                time.sleep(self.base_timeout * (2 ** retry) * 0.5)  # Backoff com valor reduzido
+
+        with self.lock:
+            self.failed += len(messages)
+            self.consecutive_failures += 1
+        return False
+
+    def is_idle(self):
+        """Verifica se a fila está vazia e sem entrega em andamento"""
+        with self.lock:
+            return not self.queue and not self.active
+
+    def stats(self):
+        """
+        Retorna métricas da fila.
+
+        Returns:
+            dict: Tamanho da fila e contadores de entrega
+        """
+        with self.lock:
+            return {
+                "queued": len(self.queue),
+                "sent": self.sent,
+                "batches": self.batches,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "stalls": self.stalls,
+                "consecutive_failures": self.consecutive_failures,
+                "last_success": self.last_success
+            }
@@ -1,12 +1,17 @@
 import json
+import os
 import time
 import threading
 import logging
 import random
-import requests
-from flask import request, jsonify
+from collections import deque
+from urllib.parse import urlencode
+from flask import request, redirect
 
-from base_node import BaseNode
+from base_node import BaseNode, NOOP_VALUE
+from wire import jsonify
+from storage import MemoryLearnerLog
+from quorum import QuorumCollector, QUORUM
 
 class Proposer(BaseNode):
     """
@@ -37,9 +42,89 @@ class Proposer(BaseNode):
         
         # Valores de proposta atual
         self.current_proposal_number = 0
-        self.proposed_value = None
-        self.proposal_accepted_count = 0
-        self.waiting_for_acceptor_response = False
+        self.highest_seen_proposal = 0  # maior número prometido reportado nas rejeições dos acceptors
+        
+        # Estado da eleição em andamento
+        self.election_proposal_number = None
+        self.election_promise_count = 0
+        self.election_promise_responses = []  # valores aceitos reportados nas promises da eleição
+        self.election_from_slot = 1  # primeiro slot consultado no prepare da eleição
+        self.election_compacted_slot = 0  # maior slot compactado informado nas promises da eleição
+        
+        # Estado Multi-Paxos: após uma fase 1 bem-sucedida o líder mantém o número
+        # de proposta e executa apenas a fase 2 para cada novo slot
+        self.leader_proposal_number = None
+        self.next_slot = 1
+        
+        # Pipeline: até pipeline_window instâncias em andamento, cada uma com seus
+        # próprios contadores de promise/accept; o excedente aguarda na fila
+        self.pipeline_window = int(os.environ.get('PIPELINE_WINDOW', 16))
+        self.max_queued_proposals = int(os.environ.get('MAX_QUEUED_PROPOSALS', 1000))
+        self.instance_timeout = float(os.environ.get('INSTANCE_TIMEOUT', 10))
+        self.max_proposal_attempts = 3
+        self.instances = {}  # {instance_id: instância}
+        self.instance_counter = 0
+        self.phase1_instance_id = None  # instância executando a fase 1 (no máximo uma)
+        self.proposal_queue = deque()
+        self.recovery_queue = deque()  # slots fixos a (re)enviar, em ordem de slot, antes das novas propostas
+        
+        # Batching: valores recebidos são agrupados em um único lote por instância
+        self.max_batch_size = int(os.environ.get('MAX_BATCH_SIZE', 64))
+        self.batch_linger = float(os.environ.get('BATCH_LINGER_MS', 5)) / 1000.0
+        self.pending_batch = None  # lote em formação
+        self.batch_condition = threading.Condition(self.lock)
+        
+        # Lease de líder: concedida por acceptors suficientes para intersectar
+        # todo quórum de fase 1 (N - Q1 + 1), impede a eleição de outro líder
+        # até expirar. A validade é contada a partir do envio do pedido e
+        # reduzida pela margem de deriva de relógio
+        self.lease_duration = float(os.environ.get('LEADER_LEASE_DURATION', 3.0))
+        self.lease_renew_interval = self.lease_duration / 3
+        self.lease_clock_drift = float(os.environ.get('LEASE_CLOCK_DRIFT', 0.1))
+        self.lease_proposal_number = None
+        self.lease_expires = 0
+        self.lease_renewals = 0
+        self.lease_failures = 0
+        
+        # Leituras linearizáveis: o líder aplica em ordem os slots cujo quórum de
+        # accepts observou e, com a lease válida, responde a partir desse estado
+        self.committed_log = MemoryLearnerLog(max_entries=int(os.environ.get('LEASE_READ_TAIL', 10000)))
+        self.committed_slots = {}  # slots decididos aguardando lacunas anteriores
+        self.slot_accepts = {}  # {slot: [proposal_number, {acceptor_id}]}
+        self.commit_condition = threading.Condition(self.lock)
+        self.read_wait_timeout = float(os.environ.get('LEASE_READ_WAIT', 1.0))
+        self.max_page_size = int(os.environ.get('GET_VALUES_MAX_PAGE', 1000))
+        self.lease_reads = 0
+        self.lease_reads_rejected = 0
+        self.lease_reads_redirected = 0
+        
+        # Métricas de quórum, eleições e retries (/metrics)
+        quorum_wait = self.metrics.histogram(
+            "paxos_quorum_wait_seconds", "Time from sending a phase to reaching its quorum", ("phase",))
+        self.prepare_quorum_wait = quorum_wait.labels("prepare")
+        self.accept_quorum_wait = quorum_wait.labels("accept")
+        self.elections_metric = self.metrics.counter(
+            "paxos_elections_total", "Leader elections finished, by result", ("result",))
+        self.election_duration = self.metrics.histogram(
+            "paxos_election_duration_seconds", "Duration of leader elections, by result", ("result",))
+        self.election_started_at = None
+        retries = self.metrics.counter("paxos_retries_total", "Retried sends, by call site", ("site",))
+        self.prepare_retries = retries.labels("prepare")
+        self.accept_retries = retries.labels("accept")
+        self.proposal_retries = retries.labels("proposal")
+        abandoned = self.metrics.counter(
+            "paxos_quorum_abandoned_sends_total",
+            "Sends and retries skipped because their round was already resolved", ("phase",))
+        self.prepare_abandoned = abandoned.labels("prepare")
+        self.accept_abandoned = abandoned.labels("accept")
+        self.lease_abandoned = abandoned.labels("lease")
+        self.metrics.gauge("paxos_proposer_queued_proposals", "Proposals waiting for a pipeline slot",
+                           lambda: len(self.proposal_queue))
+        self.metrics.gauge("paxos_proposer_inflight_instances", "Paxos instances in progress",
+                           lambda: len(self.instances))
+        self.metrics.gauge("paxos_proposer_commit_lag_slots",
+                           "Slots allocated by the leader and not yet known to be decided",
+                           self._commit_lag)
         
         # Bootstrap e recuperação
         self.bootstrap_mode = True  # Iniciar em modo bootstrap
@@ -47,7 +132,8 @@ class Proposer(BaseNode):
         self.max_bootstrap_attempts = 3
         self.initial_bootstrap_delay = 5  # Atraso inicial (segundos)
     
-    def _get_default_port(self):
+    @classmethod
+    def _get_default_port(cls):
         """Porta padrão para proposers"""
         return 3000
     
@@ -62,6 +148,11 @@ class Proposer(BaseNode):
         def heartbeat():
             """Receber heartbeat do líder"""
             return self._handle_heartbeat(request.json)
+        
+        @self.app.route('/read', methods=['GET'])
+        def read():
+            """Leitura linearizável servida pelo líder com lease"""
+            return self._handle_read(request.args)
     
     def _start_threads(self):
         """Iniciar threads específicas do proposer"""
@@ -71,6 +162,16 @@ class Proposer(BaseNode):
         # Thread de heartbeat de líder
         threading.Thread(target=self._leader_heartbeat, daemon=True).start()
         
+        # Thread de expiração de instâncias do pipeline
+        threading.Thread(target=self._expire_instances, daemon=True).start()
+        
+        # Thread de envio de lotes
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+        
+        # Thread de renovação da lease de líder
+        if self.lease_duration > 0:
+            threading.Thread(target=self._lease_loop, daemon=True).start()
+        
         # Thread para bootstrap inicial
         if self.bootstrap_mode:
             # Aguardar um pouco para que todos os nós inicializem
@@ -148,12 +249,21 @@ class Proposer(BaseNode):
             self.last_heartbeat_received = timestamp
             self.logger.debug(f"Heartbeat recebido do líder {leader_id}")
             
+            # Lease anunciada pelo líder: adia vereditos SWIM de morte enquanto vale
+            if data.get('lease_remaining'):
+                self.gossip.hold_leader(leader_id, float(data['lease_remaining']))
+            
             # Atualizar o líder no gossip se necessário
             current_leader = self.gossip.get_leader()
             if current_leader != leader_id:
                 self.gossip.set_leader(leader_id)
                 self.logger.info(f"Líder atualizado para {leader_id} via heartbeat")
             
+            # Outro líder ativo: a fase 1 deste nó deixou de valer
+            if int(leader_id) != self.node_id:
+                with self.lock:
+                    self.leader_proposal_number = None
+            
             # Sair do modo bootstrap se estiver nele
             if self.bootstrap_mode:
                 self.bootstrap_mode = False
@@ -189,8 +299,9 @@ class Proposer(BaseNode):
                     if leader_info:
                         leader_url = f"http://{leader_info['address']}:{leader_info['port']}/propose"
                         try:
-                            response = requests.post(leader_url, json=data, timeout=5)
-                            return response.content, response.status_code
+                            response = self.transport.post(leader_url, json=data, timeout=5)
+                            # Recodificar no formato aceito por quem chamou (JSON ou msgpack)
+                            return jsonify(response.json()), response.status_code
                         except Exception as e:
                             self.logger.error(f"Erro ao redirecionar para líder: {e}")
                 except Exception as e:
@@ -205,64 +316,420 @@ class Proposer(BaseNode):
         if not value:
             return jsonify({"error": "Value required"}), 400
         
+        # Eleição forçada via /propose: usar o mesmo fluxo da eleição automática
+        if is_leader_election:
+            self.logger.info("Eleição de líder solicitada via /propose")
+            threading.Thread(target=self._start_election, daemon=True).start()
+            return jsonify({"status": "election started"}), 200
+        
+        if not self.acceptor_config.size():
+            return jsonify({"error": "No acceptors available"}), 503
+        
         with self.lock:
-            if self.waiting_for_acceptor_response and not self.bootstrap_mode and not is_leader_election:
-                return jsonify({"error": "Already processing a proposal"}), 429
+            if len(self.proposal_queue) >= self.max_queued_proposals:
+                self.logger.warning(f"Fila de propostas cheia ({self.max_queued_proposals}), rejeitando valor do cliente {client_id}")
+                return jsonify({"error": "Proposal queue full", "queued": len(self.proposal_queue)}), 429
             
-            self.waiting_for_acceptor_response = True
-            self.proposed_value = value
+            # Agrupar o valor no lote em formação; o lote é enviado ao atingir
+            # max_batch_size ou após batch_linger segundos
+            if self.pending_batch is None:
+                self.pending_batch = {
+                    "entries": [],
+                    "created_at": time.time(),
+                    "flushed": threading.Event(),
+                    "instance": None,
+                    "queue_position": None
+                }
+            batch = self.pending_batch
+            batch_index = len(batch["entries"])
+            batch["entries"].append({"value": value, "client_id": client_id})
             
-            # Incrementar contador de propostas e gerar número de proposta único
-            self.proposal_counter += 1
-            if is_leader_election or self.bootstrap_mode:
-                # Para eleição de líder, usar número baseado em timestamp para ser único
-                self.current_proposal_number = int(time.time() * 100) + self.node_id
+            if len(batch["entries"]) >= self.max_batch_size:
+                self._flush_batch()
             else:
-                # Para propostas normais
-                self.current_proposal_number = self.proposal_counter * 100 + self.node_id
-                
-            self.proposal_accepted_count = 0
+                self.batch_condition.notify()
         
-        # Registrar tipo de proposta
-        if is_leader_election:
-            self.logger.info(f"Iniciando eleição de líder com proposta {self.current_proposal_number}")
+        # Aguardar o envio do lote para informar o slot ao cliente
+        batch["flushed"].wait(timeout=self.batch_linger + 1)
+        
+        instance = batch["instance"]
+        if instance is None:
+            return jsonify({
+                "status": "proposal queued",
+                "queue_position": batch["queue_position"],
+                "batch_index": batch_index
+            }), 200
+        
+        return jsonify({
+            "status": "proposal received",
+            "proposal_number": instance["proposal_number"],
+            "slot": instance["slot"],
+            "batch_index": batch_index
+        }), 200
+    
+    def _batch_loop(self):
+        """Envia o lote em formação quando o tempo máximo de espera expira"""
+        while True:
+            try:
+                with self.batch_condition:
+                    while self.pending_batch is None:
+                        self.batch_condition.wait()
+                    
+                    deadline = self.pending_batch["created_at"] + self.batch_linger
+                    while self.pending_batch is not None and time.time() < deadline:
+                        self.batch_condition.wait(deadline - time.time())
+                    
+                    if self.pending_batch is not None:
+                        self._flush_batch()
+            except Exception as e:
+                self.logger.error(f"Erro no envio de lotes: {e}")
+                time.sleep(1)
+    
+    def _flush_batch(self):
+        """
+        Envia o lote em formação como uma única instância, ou o enfileira se não
+        houver vaga no pipeline.
+        Deve ser chamado com self.lock adquirido.
+        """
+        batch = self.pending_batch
+        self.pending_batch = None
+        if batch is None:
+            return
+        
+        entries = batch["entries"]
+        self.logger.debug(f"Enviando lote com {len(entries)} valores")
+        
+        batch["instance"] = self._submit_proposal(entries, None)
+        if batch["instance"] is None:
+            # Back-pressure: o lote aguarda uma vaga na janela do pipeline
+            self.proposal_queue.append({"value": entries, "client_id": None, "attempts": 0})
+            batch["queue_position"] = len(self.proposal_queue)
+            self.logger.info(f"Lote com {len(entries)} valores enfileirado (posição {batch['queue_position']})")
+        
+        batch["flushed"].set()
+    
+    def _submit_proposal(self, value, client_id, attempts=0):
+        """
+        Inicia uma nova instância para o valor, se houver vaga na janela do pipeline.
+        Com a fase 1 concluída a instância executa apenas a fase 2 em um novo slot;
+        caso contrário uma única instância por vez executa a fase 1. Uma instância
+        sem valor executa apenas a fase 1, para recuperar os slots fixos pendentes.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            value (list): Lote de valores [{value, client_id}] proposto (None: apenas fase 1)
+            client_id (int): ID do cliente (None para lotes)
+            attempts (int): Tentativas anteriores deste valor
+        
+        Returns:
+            dict: Instância iniciada ou None se o valor precisar aguardar
+        """
+        if len(self.instances) >= self.pipeline_window:
+            return None
+        
+        if self.leader_proposal_number is None and self.phase1_instance_id is not None:
+            return None
+        
+        config = self.acceptor_config
+        instance = self._new_instance(value, client_id, attempts)
+        
+        if self.leader_proposal_number is not None:
+            # Líder estável: apenas fase 2 no próximo slot
+            instance["slot"] = self._allocate_slot()
+            self.logger.info(f"Lote com {self._batch_size(value)} valores (proposta {instance['proposal_number']}, slot {instance['slot']}, apenas fase 2)")
+            self._send_accept_to_all(value, client_id, False, instance["proposal_number"], instance["slot"], instance["id"])
+            return instance
+        
+        # Sem fase 1 válida: esta instância executa prepare para todos os slots
+        instance["phase"] = "prepare"
+        instance["proposal_number"] = self._next_proposal_number()
+        instance["from_slot"] = self._phase1_from_slot()
+        self.phase1_instance_id = instance["id"]
+        
+        if value is None:
+            self.logger.info(f"Fase 1 para recuperar {len(self.recovery_queue)} slots pendentes (proposta {instance['proposal_number']})")
         elif self.bootstrap_mode:
-            self.logger.info(f"Proposta em modo bootstrap do cliente {client_id}: {value} (proposta {self.current_proposal_number})")
+            self.logger.info(f"Proposta em modo bootstrap com {self._batch_size(value)} valores (proposta {instance['proposal_number']})")
         else:
-            self.logger.info(f"Proposta normal do cliente {client_id}: {value} (proposta {self.current_proposal_number})")
+            self.logger.info(f"Proposta normal com {self._batch_size(value)} valores (proposta {instance['proposal_number']})")
         
-        # Enviar prepare para todos os acceptors
-        try:
-            acceptors = self.gossip.get_nodes_by_role('acceptor')
-            quorum_size = len(acceptors) // 2 + 1
-            
-            if quorum_size == 0:
+        self.logger.info(f"Enviando prepare para {instance['acceptor_count']} acceptors (quorum: {instance['phase1_quorum']})")
+        
+        prepare_data = {
+            "proposer_id": self.node_id,
+            "proposal_number": instance["proposal_number"],
+            "is_leader_election": False,
+            "from_slot": instance["from_slot"],
+            "config_version": config.version
+        }
+        
+        targets = config.targets('/prepare')
+        collector = instance["collector"] = QuorumCollector(len(targets), instance["phase1_quorum"])
+        for acceptor_id, acceptor_url in targets:
+            self.executor.submit(self._send_prepare_with_retry, acceptor_url, prepare_data, 
+                                 collector, instance["id"])
+        
+        return instance
+    
+    def _new_instance(self, value, client_id, attempts):
+        """
+        Registra uma nova instância do pipeline na fase 2 com o número de
+        proposta do líder.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            value (list): Valor proposto
+            client_id (int): ID do cliente (None para lotes)
+            attempts (int): Tentativas anteriores deste valor
+        
+        Returns:
+            dict: Instância registrada
+        """
+        config = self.acceptor_config
+        
+        self.instance_counter += 1
+        instance = {
+            "id": self.instance_counter,
+            "value": value,
+            "client_id": client_id,
+            "phase": "accept",
+            "proposal_number": self.leader_proposal_number,
+            "slot": None,
+            "from_slot": None,  # primeiro slot consultado no prepare da fase 1
+            "displaced": [],  # lotes deste nó que perderam o slot para outro valor
+            "acceptor_count": config.size(),
+            "phase1_quorum": config.phase1_quorum(),
+            "phase2_quorum": config.phase2_quorum(),
+            "collector": None,  # rodada da fase atual
+            "promise_responses": [],
+            "compacted_slot": 0,  # maior slot compactado informado nas promises
+            "attempts": attempts + 1,
+            "started_at": time.time()
+        }
+        self.instances[instance["id"]] = instance
+        return instance
+    
+    def _submit_recovery(self, entry):
+        """
+        Inicia a instância que propõe novamente um slot fixo (recuperado na fase 1
+        ou de uma instância que falhou), se houver vaga na janela do pipeline. A
+        instância executa apenas a fase 2, sempre no próprio slot.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            entry (dict): Slot a recuperar {slot, value, client_id, displaced}
+        
+        Returns:
+            dict: Instância iniciada ou None se o slot precisar aguardar
+        """
+        if len(self.instances) >= self.pipeline_window or self.leader_proposal_number is None:
+            return None
+        
+        instance = self._new_instance(entry["value"], entry["client_id"], 0)
+        instance["slot"] = entry["slot"]
+        instance["displaced"] = entry["displaced"]
+        self._send_accept_to_all(entry["value"], entry["client_id"], False,
+                                 instance["proposal_number"], instance["slot"], instance["id"])
+        return instance
+    
+    @staticmethod
+    def _slot_entry(instance):
+        """
+        Entrada da fila de recuperação com o slot e o valor de uma instância.
+        
+        Args:
+            instance (dict): Instância com slot
+        
+        Returns:
+            dict: {slot, value, client_id, displaced}
+        """
+        return {
+            "slot": instance["slot"],
+            "value": instance["value"],
+            "client_id": instance["client_id"],
+            "displaced": instance["displaced"]
+        }
+    
+    def _pin_slot(self, instance):
+        """
+        Devolve à fila de recuperação, em ordem de slot, o slot de uma instância
+        que falhou. O slot continua reservado para o mesmo valor: é reenviado com
+        o número de proposta do líder ou, sem fase 1 válida, após a próxima fase 1.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            instance (dict): Instância com slot
+        """
+        entry = self._slot_entry(instance)
+        position = 0
+        while position < len(self.recovery_queue) and self.recovery_queue[position]["slot"] < entry["slot"]:
+            position += 1
+        self.recovery_queue.insert(position, entry)
+    
+    def _next_proposal_number(self):
+        """
+        Gera o próximo número de proposta deste nó: timestamp em segundos * 100
+        + ID, como nas eleições, elevado acima do último número usado e do maior
+        número prometido reportado pelos acceptors, para que a nova fase 1 não
+        seja rejeitada por uma promessa que este nó já conhece.
+        Deve ser chamado com self.lock adquirido.
+        
+        Returns:
+            int: Número de proposta (também guardado em current_proposal_number)
+        """
+        round_number = max(int(time.time()),
+                           self.current_proposal_number // 100 + 1,
+                           self.highest_seen_proposal // 100 + 1)
+        self.current_proposal_number = round_number * 100 + self.node_id
+        return self.current_proposal_number
+    
+    def _note_rejection(self, result):
+        """
+        Registra o número prometido informado na rejeição de um acceptor.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            result (dict): Resposta do acceptor
+        """
+        promised = result.get("promised_number")
+        if isinstance(promised, int) and promised > self.highest_seen_proposal:
+            self.highest_seen_proposal = promised
+    
+    def _batch_size(self, value):
+        """
+        Retorna a quantidade de valores de uma proposta.
+        
+        Args:
+            value (list ou str): Lote de valores, valor único ou None (apenas fase 1)
+        
+        Returns:
+            int: Quantidade de valores
+        """
+        if value is None:
+            return 0
+        return len(value) if isinstance(value, list) else 1
+    
+    def _drain_proposal_queue(self):
+        """
+        Inicia propostas enfileiradas enquanto houver vaga na janela do pipeline.
+        Os slots fixos da fila de recuperação têm prioridade sobre as novas
+        propostas; sem fase 1 válida, eles são recuperados por uma nova fase 1
+        se nenhum outro proposer for o líder.
+        Deve ser chamado com self.lock adquirido.
+        """
+        while self.recovery_queue:
+            entry = self.recovery_queue.popleft()
+            if self._submit_recovery(entry) is None:
+                self.recovery_queue.appendleft(entry)
+                break
+        
+        while self.proposal_queue:
+            queued = self.proposal_queue.popleft()
+            if self._submit_proposal(queued["value"], queued["client_id"], queued["attempts"]) is None:
+                self.proposal_queue.appendleft(queued)
+                break
+        
+        if self.recovery_queue and self.leader_proposal_number is None:
+            current_leader = self.gossip.get_leader()
+            if current_leader is None or int(current_leader) == self.node_id:
+                self._submit_proposal(None, None)
+    
+    def _finish_instance(self, instance_id):
+        """
+        Encerra uma instância decidida e libera sua vaga no pipeline.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            instance_id (int): ID da instância
+        """
+        instance = self.instances.pop(instance_id, None)
+        if instance is None:
+            return
+        
+        if self.phase1_instance_id == instance_id:
+            self.phase1_instance_id = None
+        
+        self.logger.info(f"Slot {instance['slot']} decidido com {self._batch_size(instance['value'])} valores ({time.time() - instance['started_at']:.3f}s)")
+        
+        # Slot decidido com o valor de outro proposer: só agora os lotes deste nó
+        # que o ocupavam podem ir para um novo slot sem risco de duplicação
+        for displaced in reversed(instance["displaced"]):
+            self.logger.warning(f"Lote com {self._batch_size(displaced['value'])} valores perdeu o slot {instance['slot']}; reenfileirando")
+            self.proposal_queue.appendleft({"value": displaced["value"], "client_id": displaced["client_id"], "attempts": 0})
+        
+        self._drain_proposal_queue()
+    
+    def _fail_instance(self, instance_id, reason, rejected=False):
+        """
+        Encerra uma instância que não pode mais obter quórum. Uma instância que já
+        tem slot continua presa a ele: o slot volta para a fila de recuperação com
+        o mesmo valor, pois os accepts já enviados ainda podem decidi-lo. Só o
+        valor de uma instância sem slot volta para o início da fila de propostas,
+        até atingir o limite de tentativas.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            instance_id (int): ID da instância
+            reason (str): Motivo da falha
+            rejected (bool): Se os acceptors rejeitaram o número de proposta
+        """
+        instance = self.instances.pop(instance_id, None)
+        if instance is None:
+            return
+        
+        if self.phase1_instance_id == instance_id:
+            self.phase1_instance_id = None
+        
+        # Envios ainda pendentes da rodada (ex.: instância expirada) são abandonados
+        if instance["collector"] is not None:
+            instance["collector"].abandon()
+        
+        # Só uma rejeição invalida a fase 1: após um timeout ou acceptors
+        # inacessíveis o slot é reenviado com o mesmo número de proposta
+        if rejected and self.leader_proposal_number == instance["proposal_number"]:
+            self.leader_proposal_number = None
+        
+        if instance["slot"] is not None:
+            self.proposal_retries.inc()
+            self.logger.warning(f"Instância {instance_id} (slot {instance['slot']}) falhou: {reason}. Reenviando no mesmo slot")
+            self._pin_slot(instance)
+        elif instance["value"] is None:
+            # Instância apenas de fase 1: a próxima drenagem a reinicia se ainda houver slots pendentes
+            self.logger.warning(f"Fase 1 da instância {instance_id} falhou: {reason}")
+        elif instance["attempts"] < self.max_proposal_attempts:
+            self.proposal_retries.inc()
+            self.logger.warning(f"Instância {instance_id} falhou: {reason}. Reenfileirando {self._batch_size(instance['value'])} valores")
+            self.proposal_queue.appendleft({
+                "value": instance["value"],
+                "client_id": instance["client_id"],
+                "attempts": instance["attempts"]
+            })
+        else:
+            self.logger.error(f"Instância {instance_id} descartada após {instance['attempts']} tentativas: {reason}")
+        
+        self._drain_proposal_queue()
+    
+    def _expire_instances(self):
+        """
+        Encerra periodicamente instâncias que excederam o tempo limite e
+        publica no gossip o recovery_floor_slot deste nó.
+        """
+        while True:
+            try:
+                current_time = time.time()
                 with self.lock:
-                    self.waiting_for_acceptor_response = False
-                return jsonify({"error": "No acceptors available"}), 503
-            
-            self.logger.info(f"Enviando prepare para {len(acceptors)} acceptors (quorum: {quorum_size})")
-            
-            for acceptor_id, acceptor in acceptors.items():
-                try:
-                    acceptor_url = f"http://{acceptor['address']}:{acceptor['port']}/prepare"
-                    prepare_data = {
-                        "proposer_id": self.node_id,
-                        "proposal_number": self.current_proposal_number,
-                        "is_leader_election": is_leader_election
-                    }
+                    expired = [instance_id for instance_id, instance in self.instances.items()
+                               if current_time - instance["started_at"] > self.instance_timeout]
+                    for instance_id in expired:
+                        self._fail_instance(instance_id, "timeout")
                     
-                    threading.Thread(target=self._send_prepare_with_retry, args=(
-                        acceptor_url, prepare_data, quorum_size, value, client_id, is_leader_election)).start()
-                except Exception as e:
-                    self.logger.error(f"Erro ao enviar prepare para acceptor {acceptor_id}: {e}")
+                    # Os acceptors só compactam o log abaixo do primeiro slot que
+                    # este nó ainda pode consultar na fase 1
+                    self.gossip.update_local_metadata({"recovery_floor_slot": self._phase1_from_slot() - 1})
+            except Exception as e:
+                self.logger.error(f"Erro ao verificar instâncias expiradas: {e}")
             
-            return jsonify({"status": "proposal received", "proposal_number": self.current_proposal_number}), 200
-        except Exception as e:
-            self.logger.error(f"Erro ao processar proposta: {e}")
-            with self.lock:
-                self.waiting_for_acceptor_response = False
-            return jsonify({"error": str(e)}), 500
+            time.sleep(1)
     
     def _check_leader(self):
         """Verificar se há um líder ativo e iniciar eleição se necessário"""
@@ -270,6 +737,7 @@ class Proposer(BaseNode):
             try:
                 current_leader = self.gossip.get_leader()
                 current_time = time.time()
+                should_start_election = False
                 
                 with self.lock:
                     # Se não houver líder e não estiver em bootstrap, iniciar eleição
@@ -277,7 +745,7 @@ class Proposer(BaseNode):
                         # Verificar se já passou o tempo de backoff
                         if current_time > self.backoff_time:
                             self.logger.info("Sem líder detectado, iniciando eleição")
-                            self._start_election()
+                            should_start_election = True
                     
                     # Se este nó for o líder, enviar heartbeat
                     elif current_leader is not None and int(current_leader) == self.node_id:
@@ -291,7 +759,10 @@ class Proposer(BaseNode):
                     elif current_leader is not None and int(current_leader) != self.node_id:
                         leader_info = self.gossip.get_node_info(str(current_leader))
                         if leader_info and leader_info.get('metadata'):
-                            last_heartbeat = leader_info.get('metadata').get('last_heartbeat', 0)
+                            # O heartbeat direto do líder (a cada heartbeat_interval) chega
+                            # antes da metadata, que depende das rodadas de gossip
+                            last_heartbeat = max(leader_info.get('metadata').get('last_heartbeat', 0),
+                                                 self.last_heartbeat_received)
                             
                             # Se o último heartbeat foi há muito tempo, considerar o líder como falho
                             if current_time - last_heartbeat > self.leader_timeout:
@@ -303,12 +774,19 @@ class Proposer(BaseNode):
                                 self.backoff_time = current_time + backoff + jitter
                                 
                                 self.logger.info(f"Backoff para eleição: {backoff + jitter:.2f} segundos")
-                                self._start_election()
+                                should_start_election = True
                         
                         # Atualizar status de líder local se necessário
                         local_info = self.gossip.get_node_info(str(self.node_id))
                         if local_info and local_info.get('metadata', {}).get('is_leader', False):
                             self.gossip.update_local_metadata({"is_leader": False})
+                        
+                        # Outro nó é o líder: a fase 1 deste nó deixou de valer
+                        self.leader_proposal_number = None
+                
+                # A eleição aguarda respostas dos acceptors, portanto roda fora do lock
+                if should_start_election:
+                    self._start_election()
             except Exception as e:
                 self.logger.error(f"Erro ao verificar líder: {e}")
             
@@ -332,6 +810,9 @@ class Proposer(BaseNode):
                         "last_heartbeat": current_time
                     })
                     
+                    with self.lock:
+                        lease_remaining = max(0, self.lease_expires - time.monotonic()) if self._lease_valid() else 0
+                    
                     # Enviar heartbeat para todos os proposers
                     proposers = self.gossip.get_nodes_by_role('proposer')
                     for proposer_id, proposer in proposers.items():
@@ -340,12 +821,12 @@ class Proposer(BaseNode):
                                 proposer_url = f"http://{proposer['address']}:{proposer['port']}/heartbeat"
                                 heartbeat_data = {
                                     "leader_id": self.node_id,
-                                    "timestamp": current_time
+                                    "timestamp": current_time,
+                                    "lease_remaining": lease_remaining
                                 }
                                 
-                                # Usar thread para não bloquear
-                                threading.Thread(target=self._send_heartbeat, 
-                                               args=(proposer_url, heartbeat_data)).start()
+                                # Usar o pool de workers para não bloquear
+                                self.executor.submit(self._send_heartbeat, proposer_url, heartbeat_data)
                             except Exception as e:
                                 self.logger.debug(f"Erro ao preparar heartbeat para proposer {proposer_id}: {e}")
                 
@@ -366,7 +847,7 @@ class Proposer(BaseNode):
             data (dict): Dados do heartbeat
         """
         try:
-            requests.post(url, json=data, timeout=2)
+            self.transport.post(url, json=data, timeout=2)
         except Exception as e:
             self.logger.debug(f"Erro ao enviar heartbeat: {e}")
     
@@ -385,142 +866,107 @@ class Proposer(BaseNode):
             
             # Em bootstrap, já temos um número de proposta definido
             if not bootstrap:
-                # Gerar número de proposta único: timestamp * 100 + ID para garantir unicidade
-                current_timestamp = int(time.time())
-                self.current_proposal_number = current_timestamp * 100 + self.node_id
+                self._next_proposal_number()
                 
-            self.proposal_accepted_count = 0
+            self.election_proposal_number = self.current_proposal_number
+            self.election_started_at = time.time()
+            self.election_promise_count = 0
+            self.election_promise_responses = []
+            self.election_compacted_slot = 0
+            self.election_from_slot = self._phase1_from_slot()
+            self.leader_proposal_number = None
+            proposal_number = self.election_proposal_number
+            from_slot = self.election_from_slot
             is_bootstrap = "bootstrap " if bootstrap else ""
-            self.logger.info(f"Iniciando {is_bootstrap}eleição com proposta número {self.current_proposal_number}")
+            self.logger.info(f"Iniciando {is_bootstrap}eleição com proposta número {proposal_number}")
         
         # Enviar mensagem prepare para todos os acceptors
         try:
-            acceptors = self.gossip.get_nodes_by_role('acceptor')
-            quorum_size = len(acceptors) // 2 + 1
+            acceptor_count = self.acceptor_config.size()
+            quorum_size = self.acceptor_config.phase1_quorum()
             
-            if quorum_size == 0:
+            if acceptor_count == 0:
                 self.logger.warning("Nenhum acceptor disponível para eleição")
                 with self.lock:
                     self.in_election = False
                 return
             
-            self.logger.info(f"Enviando prepare para {len(acceptors)} acceptors (quorum: {quorum_size})")
-            
-            # Implementar timeout para a eleição
-            election_start_time = time.time()
-            election_timeout = self.election_timeout
+            self.logger.info(f"Enviando prepare para {acceptor_count} acceptors (quorum: {quorum_size})")
             
-            # Lista para armazenar threads de prepare
-            prepare_threads = []
+            data = {
+                "proposer_id": self.node_id,
+                "proposal_number": proposal_number,
+                "is_leader_election": True,
+                "from_slot": from_slot,
+                "config_version": self.acceptor_config.version
+            }
             
-            for acceptor_id, acceptor in acceptors.items():
+            targets = self.acceptor_config.targets('/prepare')
+            collector = QuorumCollector(len(targets), quorum_size)
+            for acceptor_id, acceptor_url in targets:
                 try:
-                    acceptor_url = f"http://{acceptor['address']}:{acceptor['port']}/prepare"
-                    data = {
-                        "proposer_id": self.node_id,
-                        "proposal_number": self.current_proposal_number,
-                        "is_leader_election": True
-                    }
-                    
-                    thread = threading.Thread(target=self._send_prepare_with_retry, 
-                                             args=(acceptor_url, data, quorum_size, f"leader:{self.node_id}", None, True))
-                    prepare_threads.append(thread)
-                    thread.start()
+                    self.executor.submit(self._send_prepare_with_retry, acceptor_url, data, collector, None)
                 except Exception as e:
                     self.logger.error(f"Erro ao enviar prepare para acceptor {acceptor_id}: {e}")
             
-            # Aguardar conclusão das threads ou timeout
-            end_time = time.time() + election_timeout
-            for thread in prepare_threads:
-                timeout = max(0.1, end_time - time.time())
-                thread.join(timeout=timeout)
+            # Aguardar o quórum, a rejeição pela maioria ou o timeout da eleição
+            outcome = collector.wait(self.election_timeout)
             
             # Verificar se a eleição foi bem-sucedida
             with self.lock:
-                if self.in_election:
-                    # Se não conseguimos eleger um líder dentro do timeout, abortar a eleição
-                    if time.time() > election_start_time + election_timeout:
-                        self.logger.warning("Timeout na eleição de líder. Tentando novamente mais tarde.")
-                        self.in_election = False
-                        # Definir backoff para evitar tempestade de eleições
-                        jitter = random.uniform(0.1, 0.5)
-                        self.backoff_time = time.time() + random.uniform(2, 5) + jitter
+                # Sem quórum de promises (ex.: prepares rejeitados por uma lease
+                # ativa) ou após o timeout, abortar a eleição
+                if self.in_election and outcome != QUORUM:
+                    self.logger.warning("Eleição de líder sem quórum. Tentando novamente mais tarde.")
+                    self.in_election = False
+                    self._record_election("failed")
+                    # Definir backoff para evitar tempestade de eleições
+                    jitter = random.uniform(0.1, 0.5)
+                    self.backoff_time = time.time() + random.uniform(2, 5) + jitter
+            
+            # Após o timeout, os envios restantes não são mais necessários
+            collector.abandon()
                         
         except Exception as e:
             self.logger.error(f"Erro ao iniciar eleição: {e}")
             with self.lock:
                 self.in_election = False
     
-    def _send_prepare_with_retry(self, url, data, quorum_size, value, client_id, is_leader_election=False):
+    def _send_prepare_with_retry(self, url, data, collector, instance_id=None):
         """
-        Enviar mensagem prepare com retry para um acceptor
+        Enviar mensagem prepare com retry para um acceptor. O envio e os
+        retries são abandonados quando a rodada já foi resolvida.
         
         Args:
             url (str): URL do acceptor
             data (dict): Dados para enviar
-            quorum_size (int): Tamanho do quórum necessário
-            value (str): Valor proposto
-            client_id (int): ID do cliente ou None se for eleição
-            is_leader_election (bool): Se é uma eleição de líder
+            collector (QuorumCollector): Rodada de prepare da eleição ou da instância
+            instance_id (int, optional): Instância do pipeline ou None se for eleição
         """
         # Implementar retry com backoff exponencial
         max_retries = 3
         base_timeout = 1.0
         
         for retry in range(max_retries):
+            if collector.done:
+                self.prepare_abandoned.inc()
+                return
+            
             try:
                 # Backoff exponencial com jitter
                 jitter = random.uniform(0.1, 0.3)
                 timeout = base_timeout * (2 ** retry) + jitter
                 
-                response = requests.post(url, json=data, timeout=timeout)
+                response = self.transport.post(url, json=data, timeout=timeout)
                 
                 if response.status_code == 200:
                     result = response.json()
-                    if result.get("status") == "promise":
-                        with self.lock:
-                            self.proposal_accepted_count += 1
-                            
-                            if is_leader_election:
-                                self.logger.info(f"Recebido promise para eleição: {self.proposal_accepted_count}/{quorum_size}")
-                            else:
-                                self.logger.info(f"Recebido promise para valor: {self.proposal_accepted_count}/{quorum_size}")
-                            
-                            # Se atingir o quórum, enviar accept
-                            if self.proposal_accepted_count >= quorum_size:
-                                if is_leader_election:
-                                    # Eleição de líder bem-sucedida
-                                    self.in_election = False
-                                    self.logger.info("Quórum atingido! Tornando-se líder")
-                                    # Enviar accepts para todos os acceptors
-                                    self._send_accept_to_all(value, client_id, is_leader_election)
-                                    # Atualizar informação de líder no Gossip
-                                    self.gossip.set_leader(self.node_id)
-                                    
-                                elif self.waiting_for_acceptor_response:
-                                    # Proposta normal aceita
-                                    self.logger.info("Quórum atingido para proposta! Enviando accepts")
-                                    self._send_accept_to_all(value, client_id, is_leader_election)
-                                    self.waiting_for_acceptor_response = False
-                    else:
-                        self.logger.info(f"Acceptor rejeitou prepare: {result.get('message')}")
-                        
-                        if is_leader_election:
-                            # Se for eleição e receber rejeição, verificar se precisamos abortar a eleição
-                            # por conflito com outro proposer com número maior
-                            if "higher proposal number" in result.get('message', ''):
-                                with self.lock:
-                                    self.in_election = False
-                                    self.logger.warning("Abortando eleição devido a proposta com número maior")
-                                    break
-                        elif not is_leader_election:
-                            # Para proposta normal, se for rejeitado, finalizar
-                            with self.lock:
-                                if self.waiting_for_acceptor_response:
-                                    self.waiting_for_acceptor_response = False
-                                    break
                 else:
                     self.logger.error(f"Erro ao enviar prepare: {response.status_code} - {response.text}")
+                    result = {"status": "error", "message": f"HTTP {response.status_code}"}
+                
+                with self.lock:
+                    self._on_prepare_response(collector, instance_id, data["proposal_number"], result)
                 
                 # Se obtivemos uma resposta, saímos do retry
                 break
@@ -529,87 +975,675 @@ class Proposer(BaseNode):
                 if retry == max_retries - 1:
                     self.logger.error(f"Erro ao enviar prepare após {max_retries} tentativas: {e}")
                     
-                    # Finalizar estados pendentes se for a última tentativa
-                    if is_leader_election:
-                        with self.lock:
-                            if self.in_election:
-                                self.in_election = False
-                    else:
-                        with self.lock:
-                            if self.waiting_for_acceptor_response:
-                                self.waiting_for_acceptor_response = False
+                    # Acceptor sem resposta conta como rejeição
+                    with self.lock:
+                        self._on_prepare_response(collector, instance_id, data["proposal_number"], {
+                            "status": "unreachable",
+                            "message": str(e)
+                        })
                 
-                # Esperar antes de tentar novamente (exceto na última tentativa)
-                if retry < max_retries - 1:
-                    time.sleep(base_timeout * (2 ** retry) + jitter)
+                # Esperar antes de tentar novamente (exceto na última tentativa),
+                # acordando antes se a rodada for resolvida
+                elif collector.sleep(base_timeout * (2 ** retry) + jitter):
+                    self.prepare_retries.inc()
+    
+    def _on_prepare_response(self, collector, instance_id, proposal_number, result):
+        """
+        Encaminha a resposta de um acceptor ao prepare para a eleição ou para a instância.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            collector (QuorumCollector): Rodada de prepare
+            instance_id (int): Instância do pipeline ou None se for eleição
+            proposal_number (int): Número de proposta enviado no prepare
+            result (dict): Resposta do acceptor
+        """
+        if instance_id is None:
+            self._on_election_prepare_response(collector, proposal_number, result)
+        else:
+            self._on_instance_prepare_response(collector, instance_id, proposal_number, result)
     
-    def _send_accept_to_all(self, value, client_id, is_leader_election):
+    def _record_election(self, result):
         """
-        Enviar mensagem accept para todos os acceptors
+        Registra o fim de uma eleição nas métricas.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            result (str): Resultado (won, failed, preempted)
+        """
+        self.elections_metric.labels(result).inc()
+        if self.election_started_at is not None:
+            self.election_duration.labels(result).observe(time.time() - self.election_started_at)
+            self.election_started_at = None
+    
+    def _commit_lag(self):
+        """
+        Slots já alocados pelo líder cujo quórum de accepts ainda não foi
+        observado (None quando este nó não é o líder).
+        
+        Returns:
+            int: Quantidade de slots
+        """
+        if self.leader_proposal_number is None:
+            return None
+        return max(0, self.next_slot - 1 - self.committed_log.last_applied_slot)
+    
+    def _on_election_prepare_response(self, collector, proposal_number, result):
+        """
+        Contabiliza a resposta de um acceptor ao prepare da eleição.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            collector (QuorumCollector): Rodada de prepare da eleição
+            proposal_number (int): Número de proposta da eleição
+            result (dict): Resposta do acceptor
+        """
+        # Ignorar respostas de uma eleição já substituída
+        if proposal_number != self.election_proposal_number:
+            return
+        
+        if result.get("status") == "promise":
+            self.election_promise_count += 1
+            self.election_promise_responses.extend(result.get("accepted", []))
+            self.election_compacted_slot = max(self.election_compacted_slot, result.get("compacted_slot", 0))
+            self.logger.info(f"Recebido promise para eleição: {self.election_promise_count}/{collector.quorum}")
+            
+            if collector.ack() and self.in_election:
+                # Eleição de líder bem-sucedida
+                self.in_election = False
+                self._record_election("won")
+                self.logger.info("Quórum atingido! Tornando-se líder")
+                # Enviar accepts para todos os acceptors
+                self._send_accept_to_all(f"leader:{self.node_id}", None, True, proposal_number)
+                # Fase 1 concluída para todos os slots: recuperar o log
+                self._establish_leadership(proposal_number, self.election_promise_responses,
+                                           self.election_from_slot, self.election_compacted_slot)
+                self.election_promise_responses = []
+                # Atualizar informação de líder no Gossip
+                self.gossip.set_leader(self.node_id)
+        else:
+            self.logger.info(f"Acceptor rejeitou prepare: {result.get('message')}")
+            self._note_rejection(result)
+            collector.nack()
+            
+            # Abortar a eleição por conflito com outro proposer com número maior
+            if "higher proposal number" in result.get('message', '') and self.in_election:
+                self.in_election = False
+                self._record_election("preempted")
+                collector.abandon()
+                self.logger.warning("Abortando eleição devido a proposta com número maior")
+    
+    def _on_instance_prepare_response(self, collector, instance_id, proposal_number, result):
+        """
+        Contabiliza a resposta de um acceptor ao prepare de uma instância do pipeline.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            collector (QuorumCollector): Rodada de prepare da instância
+            instance_id (int): ID da instância
+            proposal_number (int): Número de proposta enviado no prepare
+            result (dict): Resposta do acceptor
+        """
+        instance = self.instances.get(instance_id)
+        if instance is None or instance["collector"] is not collector:
+            return
+        
+        if result.get("status") == "promise":
+            instance["promise_responses"].extend(result.get("accepted", []))
+            instance["compacted_slot"] = max(instance["compacted_slot"], result.get("compacted_slot", 0))
+            reached = collector.ack()
+            self.logger.info(f"Recebido promise para valor: {collector.acks}/{collector.quorum}")
+            
+            if reached:
+                self.logger.info("Quórum atingido para proposta! Enviando accepts")
+                self.prepare_quorum_wait.observe(collector.resolved_at - collector.started_at)
+                self.phase1_instance_id = None
+                self._establish_leadership(proposal_number, instance["promise_responses"],
+                                           instance["from_slot"], instance["compacted_slot"])
+                
+                if instance["value"] is None:
+                    # Instância apenas de fase 1: os slots recuperados seguem pelo pipeline
+                    self.instances.pop(instance_id, None)
+                    self._drain_proposal_queue()
+                    return
+                
+                instance["phase"] = "accept"
+                instance["promise_responses"] = []
+                instance["slot"] = self._allocate_slot()
+                self._send_accept_to_all(instance["value"], instance["client_id"], False,
+                                         proposal_number, instance["slot"], instance_id)
+                
+                # Fase 1 concluída: propostas enfileiradas seguem direto para a fase 2
+                self._drain_proposal_queue()
+        else:
+            self.logger.info(f"Acceptor rejeitou prepare: {result.get('message')}")
+            self._note_rejection(result)
+            
+            if collector.nack():
+                self._fail_instance(instance_id, "prepare rejeitado pela maioria dos acceptors", rejected=True)
+    
+    def _allocate_slot(self):
+        """
+        Reserva o próximo slot do log replicado.
+        Deve ser chamado com self.lock adquirido.
+        
+        Returns:
+            int: Slot reservado
+        """
+        slot = self.next_slot
+        self.next_slot += 1
+        return slot
+    
+    def _decided_slot(self):
+        """
+        Retorna o último slot sabidamente decidido: o aplicado pelo próprio
+        líder ou, se maior, o publicado no gossip por um learner. No segundo
+        caso o estado usado nas leituras com lease avança até esse slot, e os
+        valores anteriores passam a ser tratados como compactados: leituras
+        abaixo de base_index são redirecionadas aos learners (_handle_read).
+        Deve ser chamado com self.lock adquirido.
+        
+        Returns:
+            int: Último slot decidido
+        """
+        slot = self.committed_log.last_applied_slot
+        values_count = None
+        for learner in self.gossip.get_nodes_by_role('learner').values():
+            metadata = learner.get('metadata') or {}
+            if metadata.get('last_learned_slot', 0) > slot and 'learned_values_count' in metadata:
+                slot = metadata['last_learned_slot']
+                values_count = metadata['learned_values_count']
+        
+        if values_count is not None:
+            self.logger.info(f"Slots até {slot} já aplicados por um learner; avançando o estado local")
+            self.committed_log.advance_to(slot, values_count)
+            for pending in [pending for pending in self.committed_slots if pending <= slot]:
+                del self.committed_slots[pending]
+            for pending in [pending for pending in self.slot_accepts if pending <= slot]:
+                del self.slot_accepts[pending]
+            self._apply_committed_slots()
+        
+        return self.committed_log.last_applied_slot
+    
+    def _phase1_from_slot(self):
+        """
+        Primeiro slot consultado na fase 1: o seguinte ao último slot sabidamente
+        decidido, ou um anterior se um slot fixo deste nó (na fila de recuperação
+        ou em andamento) ainda aguarda decisão.
+        Deve ser chamado com self.lock adquirido.
+        
+        Returns:
+            int: Slot inicial do prepare
+        """
+        slots = [entry["slot"] for entry in self.recovery_queue]
+        slots.extend(instance["slot"] for instance in self.instances.values() if instance["slot"] is not None)
+        return min([self._decided_slot() + 1] + slots)
+    
+    def _establish_leadership(self, proposal_number, promise_responses, from_slot, compacted_slot=0):
+        """
+        Conclui a fase 1, a partir de from_slot, com o número de proposta informado.
+        Cada slot entre from_slot e o maior slot reportado nas promises ou alocado
+        por este nó volta ao pipeline como uma instância de recuperação, com uma
+        única proposta por slot: o valor aceito com maior número de proposta, o
+        valor fixado por este nó no slot se nenhum acceptor do quórum aceitou
+        outro, ou no-op. Um lote deste nó que perde o slot para outro valor só
+        volta para a fila depois que o slot for decidido. Slots compactados por
+        algum acceptor já foram decididos e aprendidos e não são recuperados.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            proposal_number (int): Número de proposta que obteve quórum de promises
+            promise_responses (list): Valores aceitos reportados nas promises
+            from_slot (int): Primeiro slot consultado no prepare
+            compacted_slot (int): Maior slot compactado informado nas promises
+        """
+        recovered = {}
+        for entry in promise_responses:
+            slot = entry.get("slot")
+            if slot and (slot not in recovered or
+                         entry.get("proposal_number", 0) > recovered[slot].get("proposal_number", 0)):
+                recovered[slot] = entry
+        
+        self.leader_proposal_number = proposal_number
+        self.slot_accepts.clear()
+        
+        # Instâncias ainda em andamento com o número anterior são substituídas
+        # pelas de recuperação, que reenviam o mesmo slot com o novo número
+        pinned = {entry["slot"]: entry for entry in self.recovery_queue}
+        for instance_id, instance in list(self.instances.items()):
+            if instance["slot"] is not None and instance["proposal_number"] != proposal_number:
+                del self.instances[instance_id]
+                if instance["collector"] is not None:
+                    instance["collector"].abandon()
+                pinned[instance["slot"]] = self._slot_entry(instance)
+        
+        # O acceptor só compacta abaixo do recovery_floor_slot publicado pelos
+        # proposers; um slot fixado aqui mesmo assim indica que este nó ficou
+        # fora do gossip. Sem o valor decidido não é possível saber se o lote
+        # venceu: apenas os lotes que sabidamente perderam o slot voltam à fila
+        if compacted_slot >= from_slot:
+            for slot in sorted((slot for slot in pinned if slot <= compacted_slot), reverse=True):
+                own = pinned.pop(slot)
+                self.logger.warning(f"Slot {slot} já decidido e compactado pelos acceptors; deixando de recuperá-lo")
+                for displaced in reversed(own["displaced"]):
+                    self.proposal_queue.appendleft({"value": displaced["value"], "client_id": displaced["client_id"],
+                                                    "attempts": 0})
+            from_slot = compacted_slot + 1
+        
+        applied = self.committed_log.last_applied_slot
+        last_slot = max(max(recovered) if recovered else 0, self.next_slot - 1)
+        self.next_slot = max(last_slot + 1, from_slot, applied + 1)
+        
+        self.recovery_queue = deque()
+        for slot in range(from_slot, last_slot + 1):
+            own = pinned.get(slot)
+            entry = recovered.get(slot)
+            if own is None and slot <= applied:
+                # Decidido enquanto a fase 1 estava em andamento
+                continue
+            
+            if entry is not None:
+                displaced = list(own["displaced"]) if own else []
+                if own is not None and own["value"] != entry["value"]:
+                    displaced.append({"value": own["value"], "client_id": own["client_id"]})
+                self.recovery_queue.append({"slot": slot, "value": entry["value"],
+                                            "client_id": entry.get("client_id"), "displaced": displaced})
+            elif own is not None:
+                self.recovery_queue.append(own)
+            else:
+                self.recovery_queue.append({"slot": slot, "value": NOOP_VALUE, "client_id": None, "displaced": []})
+        
+        if self.recovery_queue:
+            self.logger.info(f"Recuperando {len(self.recovery_queue)} slots de {from_slot} a {last_slot} ({len(recovered)} com valor aceito) com proposta {proposal_number}")
+        
+        self._drain_proposal_queue()
+    
+    def _send_accept_to_all(self, value, client_id, is_leader_election, proposal_number, slot=None, instance_id=None):
+        """
+        Enviar mensagem accept para todos os acceptors. Os envios formam uma
+        rodada que se resolve com o quórum da fase 2; a rodada de uma instância
+        do pipeline passa a ser a rodada atual da instância.
         
         Args:
             value (str): Valor a ser proposto
             client_id (int): ID do cliente ou None se for eleição
             is_leader_election (bool): Se é uma eleição de líder
+            proposal_number (int): Número da proposta
+            slot (int, optional): Slot do log replicado (None para eleição)
+            instance_id (int, optional): Instância do pipeline que contabiliza os accepts
         """
         try:
-            acceptors = self.gossip.get_nodes_by_role('acceptor')
+            accept_data = {
+                "proposer_id": self.node_id,
+                "proposal_number": proposal_number,
+                "slot": slot,
+                "is_leader_election": is_leader_election,
+                "value": value,
+                "client_id": client_id,
+                "config_version": self.acceptor_config.version
+            }
             
-            for acceptor_id, acceptor in acceptors.items():
+            targets = self.acceptor_config.targets('/accept')
+            instance = self.instances.get(instance_id) if instance_id is not None else None
+            quorum_size = instance["phase2_quorum"] if instance else self.acceptor_config.phase2_quorum()
+            collector = QuorumCollector(len(targets), quorum_size)
+            if instance is not None:
+                instance["collector"] = collector
+            
+            for acceptor_id, acceptor_url in targets:
                 try:
-                    acceptor_url = f"http://{acceptor['address']}:{acceptor['port']}/accept"
-                    accept_data = {
-                        "proposer_id": self.node_id,
-                        "proposal_number": self.current_proposal_number,
-                        "is_leader_election": is_leader_election,
-                        "value": value,
-                        "client_id": client_id
-                    }
-                    
-                    threading.Thread(target=self._send_accept_with_retry, 
-                                    args=(acceptor_url, accept_data)).start()
+                    self.executor.submit(self._send_accept_with_retry, acceptor_id, acceptor_url, accept_data,
+                                         collector, instance_id)
                 except Exception as e:
                     self.logger.error(f"Erro ao enviar accept para acceptor {acceptor_id}: {e}")
         except Exception as e:
             self.logger.error(f"Erro ao enviar accepts após quórum: {e}")
     
-    def _send_accept_with_retry(self, url, data):
+    def _send_accept_with_retry(self, acceptor_id, url, data, collector, instance_id=None):
         """
-        Enviar mensagem accept com retry para um acceptor
+        Enviar mensagem accept com retry para um acceptor. O envio e os
+        retries são abandonados quando a rodada já foi resolvida.
         
         Args:
+            acceptor_id (int): ID do acceptor
             url (str): URL do acceptor
             data (dict): Dados para enviar
+            collector (QuorumCollector): Rodada de accept
+            instance_id (int, optional): Instância do pipeline que contabiliza os accepts
         """
         # Implementar retry com backoff exponencial
         max_retries = 3
         base_timeout = 1.0
         
         for retry in range(max_retries):
+            if collector.done:
+                self.accept_abandoned.inc()
+                return
+            
             try:
                 # Backoff exponencial com jitter
                 jitter = random.uniform(0.1, 0.3)
                 timeout = base_timeout * (2 ** retry) + jitter
                 
-                response = requests.post(url, json=data, timeout=timeout)
+                response = self.transport.post(url, json=data, timeout=timeout)
                 
                 if response.status_code == 200:
                     result = response.json()
-                    if result.get("status") == "accepted":
-                        self.logger.info(f"Accept aceito pelo acceptor")
-                    else:
-                        self.logger.warning(f"Accept rejeitado: {result.get('message')}")
                 else:
                     self.logger.error(f"Erro ao enviar accept: {response.status_code} - {response.text}")
+                    result = {"status": "error", "message": f"HTTP {response.status_code}"}
+                
+                with self.lock:
+                    self._on_accept_response(collector, instance_id, acceptor_id, data, result)
                 
                 # Se obtivemos uma resposta, saímos do retry
                 break
             except Exception as e:
                 if retry == max_retries - 1:
                     self.logger.error(f"Erro ao enviar accept após {max_retries} tentativas: {e}")
-                else:
-                    # Esperar antes de tentar novamente
-                    time.sleep(base_timeout * (2 ** retry) + jitter)
+                    with self.lock:
+                        self._on_accept_response(collector, instance_id, acceptor_id, data, {
+                            "status": "unreachable",
+                            "message": str(e)
+                        })
+                elif collector.sleep(base_timeout * (2 ** retry) + jitter):
+                    # Esperar antes de tentar novamente, acordando antes se a rodada for resolvida
+                    self.accept_retries.inc()
+    
+    def _on_accept_response(self, collector, instance_id, acceptor_id, data, result):
+        """
+        Contabiliza a resposta de um acceptor ao accept.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            collector (QuorumCollector): Rodada de accept
+            instance_id (int): Instância do pipeline ou None (eleição)
+            acceptor_id (int): ID do acceptor que respondeu
+            data (dict): Dados enviados no accept
+            result (dict): Resposta do acceptor
+        """
+        accepted = result.get("status") == "accepted"
+        
+        if accepted:
+            self.logger.info(f"Accept aceito pelo acceptor (slot {data.get('slot')})")
+            
+            # Contabilizar o slot, inclusive os reenviados na recuperação, para
+            # manter o estado decidido usado nas leituras com lease
+            if data.get("slot") and data.get("proposal_number") == self.leader_proposal_number:
+                self._count_slot_accept(acceptor_id, data)
+        elif result.get("status") == "rejected":
+            self.logger.warning(f"Accept rejeitado: {result.get('message')}")
+            self._note_rejection(result)
+            
+            # Outro proposer obteve promise maior: refazer a fase 1 na próxima proposta
+            if self.leader_proposal_number == data.get("proposal_number"):
+                self.leader_proposal_number = None
+        
+        resolved = collector.ack() if accepted else collector.nack()
+        
+        instance = self.instances.get(instance_id) if instance_id is not None else None
+        if not resolved or instance is None or instance["collector"] is not collector:
+            return
+        
+        if accepted:
+            self.accept_quorum_wait.observe(collector.resolved_at - collector.started_at)
+            self._finish_instance(instance_id)
+        else:
+            # Uma rejeição já invalidou a fase 1 acima; sem ela, os acceptors estavam inacessíveis
+            self._fail_instance(instance_id, "accept sem quórum")
+    
+    def _count_slot_accept(self, acceptor_id, data):
+        """
+        Contabiliza o accept de um acceptor para um slot e, quando acceptors
+        distintos em número do quórum da fase 2 aceitaram o mesmo número de
+        proposta, aplica os slots decididos contíguos ao estado local do líder.
+        O mesmo slot pode ser reenviado com o mesmo número (recuperação de uma
+        instância que falhou) e respostas tardias de rodadas abandonadas ainda
+        chegam: um acceptor que responde duas vezes conta uma só.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            acceptor_id (int): ID do acceptor que aceitou
+            data (dict): Dados enviados no accept
+        """
+        slot = data["slot"]
+        if slot <= self.committed_log.last_applied_slot or slot in self.committed_slots:
+            return
+        
+        tally = self.slot_accepts.get(slot)
+        if tally is None or tally[0] != data["proposal_number"]:
+            tally = self.slot_accepts[slot] = [data["proposal_number"], set()]
+        tally[1].add(str(acceptor_id))
+        if len(tally[1]) < self.acceptor_config.phase2_quorum():
+            return
+        
+        del self.slot_accepts[slot]
+        self.committed_slots[slot] = data
+        self._apply_committed_slots()
+    
+    def _apply_committed_slots(self):
+        """
+        Aplica ao estado local do líder os slots decididos contíguos ao último
+        slot aplicado e acorda as leituras que aguardam.
+        Deve ser chamado com self.lock adquirido.
+        """
+        while self.committed_log.last_applied_slot + 1 in self.committed_slots:
+            entry = self.committed_slots.pop(self.committed_log.last_applied_slot + 1)
+            value = entry["value"]
+            
+            # Mesma conversão feita pelos learners: no-op não gera valores e
+            # propostas antigas têm valor único
+            if value == NOOP_VALUE:
+                batch = []
+            elif isinstance(value, list):
+                batch = value
+            else:
+                batch = [{"value": value, "client_id": entry.get("client_id")}]
+            
+            self.committed_log.append_slot(entry["slot"], entry["proposal_number"], batch)
+        
+        self.commit_condition.notify_all()
+    
+    def _lease_loop(self):
+        """Solicita e renova periodicamente a lease enquanto este nó for o líder"""
+        while True:
+            try:
+                current_leader = self.gossip.get_leader()
+                with self.lock:
+                    proposal_number = self.leader_proposal_number
+                
+                if (proposal_number is not None and current_leader is not None and
+                        int(current_leader) == self.node_id):
+                    self._renew_lease(proposal_number)
+            except Exception as e:
+                self.logger.error(f"Erro ao renovar lease: {e}")
+            
+            time.sleep(self.lease_renew_interval)
+    
+    def _renew_lease(self, proposal_number):
+        """
+        Solicita a lease a todos os acceptors e a considera válida assim que
+        N - Q1 + 1 acceptors a concederem, sem aguardar os demais.
+        
+        Args:
+            proposal_number (int): Número de proposta do líder
+        """
+        required = self.acceptor_config.size() - self.acceptor_config.phase1_quorum() + 1
+        data = {
+            "proposer_id": self.node_id,
+            "proposal_number": proposal_number,
+            "duration": self.lease_duration,
+            "config_version": self.acceptor_config.version
+        }
+        
+        # A validade conta a partir do envio: cada acceptor inicia seu prazo depois
+        requested_at = time.monotonic()
+        targets = self.acceptor_config.targets('/lease')
+        collector = QuorumCollector(len(targets), required)
+        for _, acceptor_url in targets:
+            self.executor.submit(self._request_lease, acceptor_url, data, collector)
+        collector.wait(self.lease_renew_interval)
+        collector.abandon()
+        granted = collector.acks
+        
+        with self.lock:
+            if self.leader_proposal_number != proposal_number:
+                return
+            
+            if collector.outcome == QUORUM:
+                if not self._lease_valid():
+                    self.logger.info(f"Lease de líder obtida ({granted}/{required} acceptors)")
+                self.lease_proposal_number = proposal_number
+                self.lease_expires = requested_at + self.lease_duration * (1 - self.lease_clock_drift)
+                self.lease_renewals += 1
+            else:
+                self.lease_failures += 1
+                self.logger.warning(f"Falha ao renovar lease de líder ({granted}/{required} acceptors)")
+    
+    def _request_lease(self, url, data, collector):
+        """
+        Envia o pedido de lease a um acceptor e registra a resposta na rodada.
+        
+        Args:
+            url (str): URL do acceptor
+            data (dict): Dados do pedido
+            collector (QuorumCollector): Rodada de lease
+        """
+        if collector.done:
+            self.lease_abandoned.inc()
+            return
+        
+        try:
+            response = self.transport.post(url, json=data, timeout=self.lease_renew_interval)
+            if response.status_code == 200 and response.json().get("status") == "granted":
+                collector.ack()
+                return
+            self.logger.debug(f"Lease negada: {response.text}")
+        except Exception as e:
+            self.logger.debug(f"Erro ao solicitar lease: {e}")
+        collector.nack()
+    
+    def _lease_valid(self):
+        """
+        Verifica se a lease obtida ainda vale para o número de proposta atual.
+        Deve ser chamado com self.lock adquirido.
+        
+        Returns:
+            bool: True se este nó pode servir leituras linearizáveis
+        """
+        return (self.lease_proposal_number is not None and
+                self.lease_proposal_number == self.leader_proposal_number and
+                time.monotonic() < self.lease_expires)
+    
+    def _handle_read(self, args):
+        """
+        Manipula leituras linearizáveis a partir do estado local do líder, sem
+        uma rodada Paxos. A leitura aguarda a decisão de todos os slots já
+        alocados (read index) e exige a lease válida ao responder.
+        Aceita os mesmos parâmetros de paginação do /get-values dos learners.
+        O líder mantém apenas a cauda do log (LEASE_READ_TAIL, ou a partir do
+        slot em que alcançou os learners): uma leitura que começa antes de
+        base_index é redirecionada a um learner.
+        
+        Args:
+            args (MultiDict): Parâmetros da requisição
+        
+        Returns:
+            Response: Resposta HTTP
+        """
+        try:
+            start = int(args.get('offset', 0))
+            if args.get('since') is not None:
+                start = int(args.get('since')) + 1
+            limit = args.get('limit')
+            limit = int(limit) if limit is not None else None
+        except ValueError:
+            return jsonify({"error": "offset, since and limit must be integers"}), 400
+        
+        if start < 0 or (limit is not None and limit < 0):
+            return jsonify({"error": "offset, since and limit must not be negative"}), 400
+        
+        if self.lease_duration <= 0:
+            return jsonify({"error": "Leader leases disabled"}), 503
+        
+        current_leader = self.gossip.get_leader()
+        if current_leader is None or int(current_leader) != self.node_id:
+            return jsonify({"error": "Not the leader", "current_leader": current_leader}), 403
+        
+        deadline = time.monotonic() + self.read_wait_timeout
+        with self.lock:
+            if not self._lease_valid():
+                self.lease_reads_rejected += 1
+                return jsonify({"error": "Leader lease not held", "current_leader": current_leader}), 503
+            
+            # Todo valor confirmado antes desta leitura está em um slot já alocado
+            read_index = self.next_slot - 1
+            while self.committed_log.last_applied_slot < read_index:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.lease_reads_rejected += 1
+                    return jsonify({"error": "Timed out waiting for pending slots", "read_index": read_index}), 503
+                self.commit_condition.wait(remaining)
+            
+            if not self._lease_valid():
+                self.lease_reads_rejected += 1
+                return jsonify({"error": "Leader lease not held", "current_leader": current_leader}), 503
+            
+            if start < self.committed_log.base_index:
+                return self._redirect_compacted_read(args)
+            
+            self.lease_reads += 1
+            lease_remaining = self.lease_expires - time.monotonic()
+        
+        page_size = self.max_page_size if limit is None else min(limit, self.max_page_size)
+        entries = self.committed_log.read(start, page_size)
+        total = self.committed_log.values_count
+        next_offset = entries[-1]["index"] + 1 if entries else max(start, self.committed_log.base_index)
+        
+        return jsonify({
+            "values": [entry["value"] for entry in entries],
+            "offset": entries[0]["index"] if entries else next_offset,
+            "next_offset": next_offset,
+            "next_cursor": next_offset - 1,
+            "has_more": next_offset < total,
+            "total": total,
+            "base_index": self.committed_log.base_index,
+            "read_index": read_index,
+            "leader_id": self.node_id,
+            "lease_remaining_ms": round(lease_remaining * 1000, 3)
+        }), 200
+    
+    def _redirect_compacted_read(self, args):
+        """
+        Redireciona uma leitura de valores que o líder não mantém mais para um
+        learner. A leitura já aguardou o read index; com min_slot igual ao
+        último slot aplicado pelo líder, o learner só responde depois de aplicar
+        todos os slots decididos antes da leitura, o que preserva a
+        linearizabilidade. Prefere um learner que, segundo o gossip, já o aplicou.
+        Deve ser chamado com self.lock adquirido.
+        
+        Args:
+            args (MultiDict): Parâmetros da requisição
+        
+        Returns:
+            Response: Redirecionamento 307 ou erro 503
+        """
+        min_slot = self.committed_log.last_applied_slot
+        learners = sorted(self.gossip.get_nodes_by_role('learner').values(),
+                          key=lambda learner: (learner.get('metadata') or {}).get('last_learned_slot', 0) < min_slot)
+        if not learners:
+            self.lease_reads_rejected += 1
+            return jsonify({
+                "error": "Values before base_index are no longer held by the leader and no learner is available",
+                "base_index": self.committed_log.base_index,
+                "min_slot": min_slot
+            }), 503
+        
+        learner = learners[0]
+        self.lease_reads_redirected += 1
+        query = urlencode({**args.to_dict(), "min_slot": min_slot})
+        self.logger.info(f"Leitura abaixo de base_index {self.committed_log.base_index} redirecionada para o learner {learner['id']}")
+        return redirect(f"http://{learner['address']}:{learner['port']}/get-values?{query}", code=307)
     
     def _handle_view_logs(self):
         """Manipulador para a rota view-logs"""
@@ -627,14 +1661,48 @@ class Proposer(BaseNode):
             "in_election": self.in_election,
             "bootstrap_mode": self.bootstrap_mode,
             "proposal_counter": self.proposal_counter,
+            "leader_proposal_number": self.leader_proposal_number,
+            "next_slot": self.next_slot,
             "acceptors_count": len(acceptors),
+            "acceptor_config": self.acceptor_config.stats(),
             "learners_count": len(learners),
+            "workers": self.executor.stats(),
+            "transport": self.transport.stats(),
             "known_nodes_count": len(self.gossip.get_all_nodes()),
-            "current_proposal": {
-                "number": self.current_proposal_number,
-                "value": self.proposed_value,
-                "accepted_count": self.proposal_accepted_count,
-                "waiting_for_response": self.waiting_for_acceptor_response
+            "current_proposal_number": self.current_proposal_number,
+            "pipeline": {
+                "window": self.pipeline_window,
+                "in_flight": len(self.instances),
+                "queued": len(self.proposal_queue),
+                "pinned_slots": len(self.recovery_queue),
+                "max_queued": self.max_queued_proposals,
+                "phase1_instance": self.phase1_instance_id,
+                "instances": [
+                    {
+                        **{k: instance[k] for k in ("id", "phase", "slot", "proposal_number", "attempts")},
+                        **(instance["collector"].stats() if instance["collector"] else {}),
+                        "batch_size": self._batch_size(instance["value"])
+                    }
+                    for instance in list(self.instances.values())[:10]
+                ]
+            },
+            "lease": {
+                "valid": self._lease_valid(),
+                "proposal_number": self.lease_proposal_number,
+                "remaining": round(max(0, self.lease_expires - time.monotonic()), 3),
+                "duration": self.lease_duration,
+                "renewals": self.lease_renewals,
+                "failures": self.lease_failures,
+                "reads": self.lease_reads,
+                "reads_rejected": self.lease_reads_rejected,
+                "reads_redirected": self.lease_reads_redirected,
+                "committed_slot": self.committed_log.last_applied_slot,
+                "committed_values": self.committed_log.values_count
+            },
+            "batching": {
+                "max_batch_size": self.max_batch_size,
+                "linger_ms": self.batch_linger * 1000,
+                "pending": len(self.pending_batch["entries"]) if self.pending_batch else 0
             }
         }), 200
 
@@ -0,0 +1,128 @@
+import time
+import threading
+
+# Resultados possíveis de uma rodada
+PENDING = "pending"
+QUORUM = "quorum"
+IMPOSSIBLE = "impossible"
+ABANDONED = "abandoned"
+
+class QuorumCollector:
+    """
+    Coleta as respostas de uma rodada enviada a todos os acceptors (prepare,
+    accept ou lease) e se resolve assim que o quórum responde positivamente,
+    ou assim que respostas negativas suficientes tornam o quórum impossível.
+
+    Depois de resolvida a rodada, os envios ainda pendentes para os demais
+    acceptors são abandonados: tarefas que ainda não começaram não enviam,
+    e as que aguardam o backoff acordam e não fazem novas tentativas. Uma
+    requisição já em andamento termina normalmente, mas sua resposta não
+    altera mais o resultado.
+    """
+
+    def __init__(self, total, quorum):
+        """
+        Inicializa a rodada.
+
+        Args:
+            total (int): Quantidade de acceptors consultados
+            quorum (int): Respostas positivas necessárias
+        """
+        self.total = total
+        self.quorum = quorum
+        self.acks = 0
+        self.nacks = 0
+        self.outcome = PENDING
+        self.started_at = time.time()
+        self.resolved_at = None
+        self.lock = threading.Lock()
+        self.resolved = threading.Event()
+
+    def _resolve(self, outcome):
+        """Encerra a rodada com o resultado informado. Deve ser chamado com self.lock adquirido"""
+        self.outcome = outcome
+        self.resolved_at = time.time()
+        self.resolved.set()
+
+    def ack(self):
+        """
+        Registra uma resposta positiva.
+
+        Returns:
+            bool: True se esta resposta completou o quórum
+        """
+        with self.lock:
+            self.acks += 1
+            if self.outcome == PENDING and self.acks >= self.quorum:
+                self._resolve(QUORUM)
+                return True
+            return False
+
+    def nack(self):
+        """
+        Registra uma resposta negativa (rejeição ou acceptor inacessível).
+
+        Returns:
+            bool: True se esta resposta tornou o quórum impossível
+        """
+        with self.lock:
+            self.nacks += 1
+            if self.outcome == PENDING and self.nacks > self.total - self.quorum:
+                self._resolve(IMPOSSIBLE)
+                return True
+            return False
+
+    def abandon(self):
+        """
+        Encerra a rodada sem resultado (instância expirada, eleição preterida),
+        liberando quem aguarda e os envios pendentes.
+        """
+        with self.lock:
+            if self.outcome == PENDING:
+                self._resolve(ABANDONED)
+
+    @property
+    def done(self):
+        """True depois que a rodada foi resolvida ou abandonada"""
+        return self.resolved.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Aguarda a resolução da rodada.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera em segundos
+
+        Returns:
+            str: Resultado (PENDING se o prazo esgotou antes da resolução)
+        """
+        self.resolved.wait(timeout)
+        return self.outcome
+
+    def sleep(self, delay):
+        """
+        Espera do backoff entre tentativas, interrompida se a rodada for resolvida.
+
+        Args:
+            delay (float): Tempo de espera em segundos
+
+        Returns:
+            bool: True se a rodada continua pendente (o envio deve prosseguir)
+        """
+        return not self.resolved.wait(delay)
+
+    def stats(self):
+        """
+        Retorna o estado da rodada.
+
+        Returns:
+            dict: Respostas, quórum e resultado
+        """
+        with self.lock:
+            return {
+                "acks": self.acks,
+                "nacks": self.nacks,
+                "quorum": self.quorum,
+                "total": self.total,
+                "outcome": self.outcome
+            }
@@ -0,0 +1,1019 @@
+import json
+import os
+import time
+import threading
+import logging
+import itertools
+from collections import deque
+
+def _fsync_directory(path):
+    """
+    Sincroniza a entrada de diretório após criar, renomear ou truncar arquivos.
+
+    Args:
+        path (str): Caminho do diretório
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _atomic_write_json(path, data, fsync=True):
+    """
+    Grava um arquivo JSON de forma atômica (arquivo temporário + rename).
+
+    Args:
+        path (str): Caminho final do arquivo
+        data (dict): Conteúdo a ser gravado
+        fsync (bool): Se deve forçar a gravação em disco
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if fsync:
+        _fsync_directory(os.path.dirname(path) or '.')
+
+def _read_records(path, logger):
+    """
+    Lê um arquivo de registros JSON, um por linha, parando no primeiro
+    registro incompleto (linha sem quebra final ou que não pode ser lida),
+    deixado por uma queda durante a gravação.
+
+    Args:
+        path (str): Caminho do arquivo
+        logger (Logger): Logger para o aviso de registro incompleto
+
+    Returns:
+        tuple: (registros válidos, tamanho em bytes do trecho válido do arquivo)
+    """
+    records = []
+    valid_size = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("missing newline")
+                record = json.loads(line)
+            except ValueError:
+                logger.warning(f"Registro incompleto ignorado no final de {os.path.basename(path)}")
+                break
+            records.append(record)
+            valid_size += len(line)
+    return records, valid_size
+
+def _truncate_file(path, size, fsync=True):
+    """
+    Descarta o final de um arquivo a partir do tamanho informado, para que
+    novos registros não sejam anexados após um fragmento incompleto.
+
+    Args:
+        path (str): Caminho do arquivo
+        size (int): Novo tamanho em bytes
+        fsync (bool): Se deve forçar a gravação em disco
+    """
+    with open(path, 'r+b') as f:
+        if os.fstat(f.fileno()).st_size <= size:
+            return
+        f.truncate(size)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+
+class MemoryAcceptorStore:
+    """
+    Armazenamento volátil do estado do acceptor.
+    Mantém o comportamento original: o estado é perdido quando o processo reinicia.
+    """
+
+    def load(self):
+        """
+        Retorna o estado inicial do acceptor.
+
+        Returns:
+            dict: Estado vazio
+        """
+        return {
+            "highest_promised_number": 0,
+            "accepted_proposal_number": 0,
+            "accepted_log": {},
+            "last_accepted_slot": 0,
+            "compacted_slot": 0
+        }
+
+    def append(self, record):
+        """Registros não são persistidos; retorna um ticket já durável"""
+        return None
+
+    def wait_durable(self, ticket, timeout=None):
+        """Todo ticket é considerado durável"""
+        return True
+
+    def should_snapshot(self):
+        """Nunca é necessário gerar snapshot"""
+        return False
+
+    def rotate(self):
+        """Não há WAL a rotacionar"""
+        return None
+
+    def snapshot(self, state, seq):
+        """Sem efeito para armazenamento volátil"""
+        pass
+
+    def stats(self):
+        """
+        Retorna estatísticas do armazenamento.
+
+        Returns:
+            dict: Estatísticas
+        """
+        return {"type": "memory"}
+
+    def close(self):
+        """Sem recursos a liberar"""
+        pass
+
+class WALAcceptorStore:
+    """
+    Armazenamento durável do estado do acceptor com write-ahead log (WAL).
+
+    Cada promise/accept é anexado ao WAL como uma linha JSON, assim como a
+    compactação do log (slots descartados por já terem sido aprendidos). Uma thread
+    gravadora agrupa os registros pendentes e executa um único fsync por lote
+    (group commit), de modo que requisições concorrentes compartilham o mesmo
+    flush. Periodicamente o WAL é rotacionado (acceptor.wal.<seq>), o estado
+    completo é gravado em um snapshot e os WALs rotacionados cobertos por ele
+    são removidos. Na inicialização, o snapshot é carregado e os WALs
+    rotacionados e o atual são reaplicados.
+    """
+
+    WAL_FILE = "acceptor.wal"
+    SNAPSHOT_FILE = "acceptor.snapshot.json"
+
+    def __init__(self, data_dir, snapshot_interval=10000, group_commit_delay=0.0, fsync=True):
+        """
+        Inicializa o armazenamento e inicia a thread gravadora.
+
+        Args:
+            data_dir (str): Diretório dos arquivos de estado
+            snapshot_interval (int): Registros no WAL antes de gerar um snapshot
+            group_commit_delay (float): Espera adicional (segundos) para agrupar registros
+            fsync (bool): Se deve forçar a gravação em disco a cada lote
+        """
+        self.logger = logging.getLogger('[AcceptorWAL]')
+
+        self.data_dir = data_dir
+        self.wal_path = os.path.join(data_dir, self.WAL_FILE)
+        self.snapshot_path = os.path.join(data_dir, self.SNAPSHOT_FILE)
+        self.snapshot_interval = snapshot_interval
+        self.group_commit_delay = group_commit_delay
+        self.fsync = fsync
+
+        os.makedirs(data_dir, exist_ok=True)
+
+        # Registros aguardando gravação e controle de durabilidade
+        self.condition = threading.Condition()
+        self.pending = []
+        self.appended_seq = 0
+        self.durable_seq = 0
+        self.records_since_snapshot = 0
+        self.rotated_seq = 0  # seq do último registro coberto pela última rotação
+        self.wal_offset = 0  # tamanho do WAL atual até o último lote gravado com sucesso
+
+        # Serializa gravação do WAL e geração de snapshot
+        self.file_lock = threading.Lock()
+        self.wal_file = None
+
+        # Estatísticas de group commit
+        self.flush_count = 0
+        self.flushed_records = 0
+        self.snapshot_count = 0
+        self.write_errors = 0
+
+        self.running = True
+        self.writer_thread = None
+
+    def load(self):
+        """
+        Carrega o snapshot mais recente e reaplica o WAL.
+        Deve ser chamado antes do primeiro append.
+
+        Returns:
+            dict: Estado recuperado do acceptor
+        """
+        state = {
+            "highest_promised_number": 0,
+            "accepted_proposal_number": 0,
+            "accepted_log": {},
+            "last_accepted_slot": 0,
+            "compacted_slot": 0
+        }
+
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            state["highest_promised_number"] = snapshot.get("highest_promised_number", 0)
+            state["accepted_proposal_number"] = snapshot.get("accepted_proposal_number", 0)
+            state["accepted_log"] = {int(slot): entry for slot, entry in snapshot.get("accepted_log", {}).items()}
+            state["compacted_slot"] = snapshot.get("compacted_slot", 0)
+            state["last_accepted_slot"] = max(max(state["accepted_log"], default=0), state["compacted_slot"])
+
+        replayed = 0
+        # WALs rotacionados de um snapshot não concluído antes de uma queda. A
+        # numeração dos próximos registros continua após a maior já usada, para
+        # que um snapshot futuro os cubra e remova
+        for seq, path in self._rotated_wals():
+            records, _ = _read_records(path, self.logger)
+            for record in records:
+                self._apply(state, record)
+            replayed += len(records)
+            self.appended_seq = self.durable_seq = self.rotated_seq = max(self.rotated_seq, seq)
+
+        if os.path.exists(self.wal_path):
+            records, valid_size = _read_records(self.wal_path, self.logger)
+            for record in records:
+                self._apply(state, record)
+            replayed += len(records)
+            # Um registro parcialmente gravado antes de uma queda é removido;
+            # caso contrário o próximo registro seria anexado ao fragmento e
+            # perdido, junto com os seguintes, na próxima recuperação
+            _truncate_file(self.wal_path, valid_size, fsync=self.fsync)
+
+        self.records_since_snapshot = replayed
+        self.logger.info(f"Estado recuperado: promessa {state['highest_promised_number']}, "
+                         f"{len(state['accepted_log'])} slots aceitos, {replayed} registros reaplicados do WAL")
+
+        self.wal_file = open(self.wal_path, 'a')
+        self.wal_offset = self.wal_file.tell()
+        self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.writer_thread.start()
+
+        return state
+
+    def _apply(self, state, record):
+        """
+        Aplica um registro do WAL ao estado. A aplicação é idempotente, portanto
+        registros já cobertos pelo snapshot podem ser reaplicados com segurança.
+
+        Args:
+            state (dict): Estado em reconstrução
+            record (dict): Registro do WAL
+        """
+        if record.get("type") == "compact":
+            # Slots aprendidos por todos os learners deixam de ser mantidos
+            slot = record["slot"]
+            for compacted in [compacted for compacted in state["accepted_log"] if compacted <= slot]:
+                del state["accepted_log"][compacted]
+            state["compacted_slot"] = max(state["compacted_slot"], slot)
+            state["last_accepted_slot"] = max(state["last_accepted_slot"], slot)
+            return
+
+        proposal_number = record.get("proposal_number", 0)
+        state["highest_promised_number"] = max(state["highest_promised_number"], proposal_number)
+
+        if record.get("type") == "accept":
+            state["accepted_proposal_number"] = max(state["accepted_proposal_number"], proposal_number)
+            slot = record.get("slot")
+            if slot and slot > state["compacted_slot"]:
+                current = state["accepted_log"].get(slot)
+                if current is None or proposal_number >= current["proposal_number"]:
+                    state["accepted_log"][slot] = {
+                        "proposal_number": proposal_number,
+                        "value": record.get("value"),
+                        "client_id": record.get("client_id")
+                    }
+                state["last_accepted_slot"] = max(state["last_accepted_slot"], slot)
+
+    def append(self, record):
+        """
+        Anexa um registro ao WAL de forma assíncrona.
+
+        Args:
+            record (dict): Registro de promise ou accept
+
+        Returns:
+            int: Ticket a ser aguardado com wait_durable
+        """
+        line = json.dumps(record) + "\n"
+        with self.condition:
+            self.appended_seq += 1
+            self.records_since_snapshot += 1
+            self.pending.append(line)
+            self.condition.notify_all()
+            return self.appended_seq
+
+    def wait_durable(self, ticket, timeout=None):
+        """
+        Aguarda até que o registro do ticket esteja gravado em disco.
+
+        Args:
+            ticket (int): Ticket retornado por append
+            timeout (float, optional): Tempo máximo de espera em segundos
+
+        Returns:
+            bool: True se o registro está durável
+        """
+        if ticket is None:
+            return True
+        with self.condition:
+            return self.condition.wait_for(lambda: self.durable_seq >= ticket, timeout=timeout)
+
+    def _writer_loop(self):
+        """
+        Thread que grava lotes de registros pendentes com um único fsync.
+        Um lote só é considerado durável depois que write e fsync terminam sem
+        erro. Em caso de falha, o WAL é truncado até o fim do último lote
+        gravado, descartando um eventual registro parcial, e o lote volta para
+        o início da fila para ser gravado novamente; enquanto isso, wait_durable
+        não confirma os registros e o acceptor não responde aos accepts.
+        """
+        while self.running:
+            try:
+                with self.condition:
+                    self.condition.wait_for(lambda: self.pending or not self.running)
+
+                # Janela opcional para acumular mais registros no mesmo fsync
+                if self.group_commit_delay > 0:
+                    time.sleep(self.group_commit_delay)
+
+                with self.file_lock:
+                    with self.condition:
+                        batch = self.pending
+                        self.pending = []
+                        batch_seq = self.appended_seq
+
+                    if batch:
+                        data = "".join(batch)
+                        try:
+                            self.wal_file.write(data)
+                            self.wal_file.flush()
+                            if self.fsync:
+                                os.fsync(self.wal_file.fileno())
+                        except Exception:
+                            with self.condition:
+                                self.pending = batch + self.pending
+                                self.write_errors += 1
+                            self._reopen_wal()
+                            raise
+                        self.wal_offset += len(data.encode())
+
+                with self.condition:
+                    self.durable_seq = max(self.durable_seq, batch_seq)
+                    self.flush_count += 1
+                    self.flushed_records += len(batch)
+                    self.condition.notify_all()
+            except Exception as e:
+                self.logger.error(f"Erro ao gravar WAL: {e}")
+                time.sleep(0.1)
+
+    def _reopen_wal(self):
+        """
+        Descarta do WAL o que foi gravado após o último lote bem-sucedido e o
+        reabre. Depois de uma falha de fsync não é possível saber o que chegou
+        ao disco, portanto o lote inteiro é regravado.
+        Deve ser chamado com self.file_lock adquirido.
+        """
+        try:
+            self.wal_file.close()
+        except Exception:
+            pass
+        _truncate_file(self.wal_path, self.wal_offset, fsync=self.fsync)
+        self.wal_file = open(self.wal_path, 'a')
+
+    def should_snapshot(self):
+        """
+        Verifica se o WAL cresceu o suficiente para gerar um snapshot.
+
+        Returns:
+            bool: True se um snapshot deve ser gerado
+        """
+        return self.records_since_snapshot >= self.snapshot_interval
+
+    def _rotated_path(self, seq):
+        """Caminho do WAL rotacionado cujo último registro tem o seq informado"""
+        return f"{self.wal_path}.{seq}"
+
+    def _rotated_wals(self):
+        """
+        Lista os WALs rotacionados ainda não cobertos por um snapshot.
+
+        Returns:
+            list: [(seq, caminho)] em ordem crescente de seq
+        """
+        prefix = f"{self.WAL_FILE}."
+        return sorted(
+            (int(name[len(prefix):]), os.path.join(self.data_dir, name))
+            for name in os.listdir(self.data_dir)
+            if name.startswith(prefix) and name[len(prefix):].isdigit()
+        )
+
+    def rotate(self):
+        """
+        Inicia um snapshot: o WAL atual passa a ser um WAL rotacionado e um novo
+        WAL é aberto. O acceptor chama este método com seu lock adquirido, junto
+        com a cópia do estado, de modo que o estado copiado reflete todos os
+        registros até o seq retornado. A operação só aguarda o lote que a thread
+        gravadora estiver gravando; o snapshot é gravado depois, fora do lock.
+        Registros pendentes são gravados no novo WAL: reaplicá-los é idempotente.
+
+        Returns:
+            int: seq coberto pelo estado copiado, ou None sem registros novos
+        """
+        with self.file_lock:
+            with self.condition:
+                seq = self.appended_seq
+                if seq == self.rotated_seq:
+                    return None
+                self.rotated_seq = seq
+                self.records_since_snapshot = 0
+
+            self.wal_file.close()
+            os.replace(self.wal_path, self._rotated_path(seq))
+            self.wal_file = open(self.wal_path, 'a')
+            self.wal_offset = 0
+        return seq
+
+    def snapshot(self, state, seq):
+        """
+        Grava o estado copiado na rotação e remove os WALs rotacionados que ele
+        cobre. Não bloqueia o acceptor nem a thread gravadora: novos registros
+        seguem para o WAL aberto na rotação.
+
+        Args:
+            state (dict): Estado do acceptor copiado junto com rotate()
+            seq (int): seq retornado por rotate()
+        """
+        _atomic_write_json(self.snapshot_path, {
+            "highest_promised_number": state["highest_promised_number"],
+            "accepted_proposal_number": state["accepted_proposal_number"],
+            "accepted_log": {str(slot): entry for slot, entry in state["accepted_log"].items()},
+            "compacted_slot": state.get("compacted_slot", 0),
+            "created_at": time.time()
+        }, fsync=self.fsync)
+
+        for rotated_seq, path in self._rotated_wals():
+            if rotated_seq <= seq:
+                os.remove(path)
+        if self.fsync:
+            _fsync_directory(self.data_dir)
+
+        with self.condition:
+            self.snapshot_count += 1
+
+        self.logger.info(f"Snapshot gravado com {len(state['accepted_log'])} slots; WALs rotacionados até {seq} removidos")
+
+    def stats(self):
+        """
+        Retorna estatísticas do armazenamento.
+
+        Returns:
+            dict: Estatísticas de WAL e group commit
+        """
+        with self.condition:
+            return {
+                "type": "wal",
+                "data_dir": self.data_dir,
+                "appended_records": self.appended_seq,
+                "durable_records": self.durable_seq,
+                "pending_records": len(self.pending),
+                "records_since_snapshot": self.records_since_snapshot,
+                "flush_count": self.flush_count,
+                "records_per_flush": round(self.flushed_records / self.flush_count, 2) if self.flush_count else 0,
+                "snapshot_count": self.snapshot_count,
+                "write_errors": self.write_errors
+            }
+
+    def close(self):
+        """Encerra a thread gravadora e fecha o WAL"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.writer_thread:
+            self.writer_thread.join(timeout=5)
+        with self.file_lock:
+            if self.wal_file:
+                self.wal_file.close()
+                self.wal_file = None
+
+def create_acceptor_store(node_id):
+    """
+    Cria o armazenamento do acceptor conforme as variáveis de ambiente.
+
+    ACCEPTOR_STORAGE: "wal" (padrão) ou "memory"
+    DATA_DIR: diretório base dos arquivos (padrão "data")
+    ACCEPTOR_SNAPSHOT_INTERVAL: registros no WAL antes de um snapshot
+    WAL_GROUP_COMMIT_MS: espera adicional para agrupar registros em um fsync
+    WAL_FSYNC: "false" desativa o fsync (apenas para testes)
+
+    Args:
+        node_id (int): ID do acceptor
+
+    Returns:
+        MemoryAcceptorStore ou WALAcceptorStore: Armazenamento configurado
+    """
+    storage_type = os.environ.get('ACCEPTOR_STORAGE', 'wal').lower()
+
+    if storage_type == 'memory':
+        return MemoryAcceptorStore()
+
+    data_dir = os.path.join(os.environ.get('DATA_DIR', 'data'), f"acceptor-{node_id}")
+    return WALAcceptorStore(
+        data_dir,
+        snapshot_interval=int(os.environ.get('ACCEPTOR_SNAPSHOT_INTERVAL', 10000)),
+        group_commit_delay=float(os.environ.get('WAL_GROUP_COMMIT_MS', 0)) / 1000.0,
+        fsync=os.environ.get('WAL_FSYNC', 'true').lower() != 'false'
+    )
+
+class MemoryLearnerLog:
+    """
+    Log de valores aprendidos mantido apenas em memória.
+    Mantém o comportamento original: todos os valores ficam em memória e são
+    perdidos quando o processo reinicia.
+    """
+
+    def __init__(self, max_entries=None):
+        """
+        Inicializa o log vazio.
+
+        Args:
+            max_entries (int, optional): Máximo de entradas mantidas; as mais
+                antigas são descartadas e base_index avança
+        """
+        self.lock = threading.Lock()
+        self.entries = []
+        self.base_index = 0
+        self.last_applied_slot = 0
+        self.max_entries = max_entries
+
+    @property
+    def values_count(self):
+        """Quantidade total de valores aprendidos"""
+        return self.base_index + len(self.entries)
+
+    def load(self):
+        """
+        Retorna o estado inicial do learner.
+
+        Returns:
+            dict: Estado vazio
+        """
+        return {"last_applied_slot": 0, "values_count": 0}
+
+    def append_slot(self, slot, proposal_number, values):
+        """
+        Registra os valores aprendidos de um slot, em ordem.
+
+        Args:
+            slot (int): Slot decidido
+            proposal_number (int): Número da proposta decidida
+            values (list): Valores do lote [{value, client_id}]
+
+        Returns:
+            list: Entradas registradas, com seu índice no log
+        """
+        with self.lock:
+            entries = self._build_entries(slot, proposal_number, values)
+            self.entries.extend(entries)
+            self.last_applied_slot = slot
+
+            overflow = len(self.entries) - self.max_entries if self.max_entries else 0
+            if overflow > 0:
+                del self.entries[:overflow]
+                self.base_index += overflow
+            return entries
+
+    def advance_to(self, slot, values_count):
+        """
+        Avança o log até um slot decidido cujos valores foram aplicados por
+        outro nó e não estão disponíveis localmente. As entradas em memória
+        são descartadas, como na compactação, e base_index passa a values_count.
+
+        Args:
+            slot (int): Último slot decidido
+            values_count (int): Quantidade total de valores até esse slot
+        """
+        with self.lock:
+            if slot <= self.last_applied_slot:
+                return
+            self.entries = []
+            self.base_index = values_count
+            self.last_applied_slot = slot
+
+    def _build_entries(self, slot, proposal_number, values):
+        """
+        Converte os valores de um slot em entradas indexadas do log.
+        Deve ser chamado com self.lock adquirido.
+
+        Args:
+            slot (int): Slot decidido
+            proposal_number (int): Número da proposta decidida
+            values (list): Valores do lote [{value, client_id}]
+
+        Returns:
+            list: Entradas com índice global
+        """
+        first_index = self.values_count
+        timestamp = time.time()
+        return [{
+            "index": first_index + batch_index,
+            "slot": slot,
+            "batch_index": batch_index,
+            "proposal_number": proposal_number,
+            "value": item["value"],
+            "client_id": item.get("client_id"),
+            "timestamp": timestamp
+        } for batch_index, item in enumerate(values)]
+
+    def read(self, start=0, limit=None):
+        """
+        Lê entradas a partir de um índice.
+
+        Args:
+            start (int): Primeiro índice desejado
+            limit (int, optional): Quantidade máxima de entradas
+
+        Returns:
+            list: Entradas em ordem
+        """
+        with self.lock:
+            offset = max(start - self.base_index, 0)
+            end = len(self.entries) if limit is None else offset + limit
+            return self.entries[offset:end]
+
+    def tail(self, count):
+        """
+        Retorna as últimas entradas do log.
+
+        Args:
+            count (int): Quantidade de entradas
+
+        Returns:
+            list: Últimas entradas em ordem
+        """
+        with self.lock:
+            return self.entries[-count:] if count else []
+
+    def should_snapshot(self):
+        """Nunca é necessário gerar snapshot"""
+        return False
+
+    def snapshot(self):
+        """Sem efeito para armazenamento volátil"""
+        pass
+
+    def stats(self):
+        """
+        Retorna estatísticas do log.
+
+        Returns:
+            dict: Estatísticas
+        """
+        return {"type": "memory", "values_count": self.values_count, "memory_entries": len(self.entries)}
+
+class SegmentLearnerLog(MemoryLearnerLog):
+    """
+    Log durável de valores aprendidos em segmentos no disco.
+
+    Cada valor aprendido é anexado ao segmento ativo como uma linha JSON; o
+    segmento é nomeado pelo índice do seu primeiro valor. Apenas as últimas
+    memory_tail entradas ficam em memória. Periodicamente um snapshot registra
+    o progresso do learner e os segmentos mais antigos que retain_values são
+    removidos. Na inicialização, o snapshot é carregado e os segmentos
+    posteriores a ele são reaplicados.
+    """
+
+    SNAPSHOT_FILE = "learner.snapshot.json"
+    SEGMENT_PREFIX = "segment-"
+
+    def __init__(self, data_dir, memory_tail=1000, segment_size=10000,
+                 snapshot_interval=10000, retain_values=100000, fsync=False):
+        """
+        Inicializa o log em disco.
+
+        Args:
+            data_dir (str): Diretório dos segmentos e do snapshot
+            memory_tail (int): Entradas mantidas em memória
+            segment_size (int): Entradas por segmento
+            snapshot_interval (int): Entradas aprendidas entre snapshots
+            retain_values (int): Entradas mínimas mantidas em disco após compactação
+            fsync (bool): Se deve forçar a gravação em disco a cada slot
+        """
+        super().__init__()
+        self.logger = logging.getLogger('[LearnerLog]')
+
+        self.data_dir = data_dir
+        self.snapshot_path = os.path.join(data_dir, self.SNAPSHOT_FILE)
+        self.segment_size = segment_size
+        self.snapshot_interval = snapshot_interval
+        self.retain_values = retain_values
+        self.fsync = fsync
+
+        os.makedirs(data_dir, exist_ok=True)
+
+        # Apenas a cauda do log fica em memória
+        self.entries = deque(maxlen=memory_tail)
+        self._values_count = 0
+        self.segments = []  # índices iniciais dos segmentos em disco, em ordem
+        self.segment_file = None
+        self.segment_entries = 0
+        self.values_since_snapshot = 0
+        self.snapshot_count = 0
+
+    @property
+    def values_count(self):
+        """Quantidade total de valores aprendidos"""
+        return self._values_count
+
+    def _segment_path(self, first_index):
+        """
+        Caminho do segmento que começa no índice informado.
+
+        Args:
+            first_index (int): Índice do primeiro valor do segmento
+
+        Returns:
+            str: Caminho do arquivo
+        """
+        return os.path.join(self.data_dir, f"{self.SEGMENT_PREFIX}{first_index:012d}.log")
+
+    def _read_segment(self, first_index):
+        """
+        Lê as entradas de um segmento, ignorando uma última linha incompleta.
+
+        Args:
+            first_index (int): Índice do primeiro valor do segmento
+
+        Returns:
+            list: Entradas do segmento
+        """
+        return _read_records(self._segment_path(first_index), self.logger)[0]
+
+    def load(self):
+        """
+        Recupera o progresso a partir do snapshot e reaplica os segmentos
+        gravados depois dele.
+
+        Returns:
+            dict: Estado recuperado (last_applied_slot, values_count)
+        """
+        with self.lock:
+            if os.path.exists(self.snapshot_path):
+                with open(self.snapshot_path) as f:
+                    snapshot = json.load(f)
+                self.last_applied_slot = snapshot.get("last_applied_slot", 0)
+                self._values_count = snapshot.get("values_count", 0)
+                self.base_index = snapshot.get("base_index", 0)
+
+            self.segments = sorted(
+                int(name[len(self.SEGMENT_PREFIX):-len(".log")])
+                for name in os.listdir(self.data_dir)
+                if name.startswith(self.SEGMENT_PREFIX) and name.endswith(".log")
+            )
+
+            replayed = 0
+            for first_index in self.segments:
+                entries, valid_size = _read_records(self._segment_path(first_index), self.logger)
+                if first_index == self.segments[-1]:
+                    # Os novos valores são anexados ao último segmento: um
+                    # registro incompleto no seu final é removido antes disso
+                    _truncate_file(self._segment_path(first_index), valid_size, fsync=self.fsync)
+                for entry in entries:
+                    # Entradas cobertas pelo snapshot apenas repopulam a cauda em memória
+                    if entry["index"] >= self._values_count:
+                        self._values_count = entry["index"] + 1
+                        self.last_applied_slot = max(self.last_applied_slot, entry["slot"])
+                        replayed += 1
+                    self.entries.append(entry)
+
+            if self.segments:
+                self.base_index = max(self.base_index, self.segments[0])
+                last_segment = self.segments[-1]
+                self.segment_entries = self._values_count - last_segment
+                self.segment_file = open(self._segment_path(last_segment), 'a')
+
+            self.values_since_snapshot = replayed
+            self.logger.info(f"Log recuperado: {self._values_count} valores (slot {self.last_applied_slot}), "
+                             f"{replayed} reaplicados após o snapshot, {len(self.segments)} segmentos")
+
+            return {"last_applied_slot": self.last_applied_slot, "values_count": self._values_count}
+
+    def append_slot(self, slot, proposal_number, values):
+        """
+        Anexa os valores aprendidos de um slot ao segmento ativo.
+
+        Args:
+            slot (int): Slot decidido
+            proposal_number (int): Número da proposta decidida
+            values (list): Valores do lote [{value, client_id}]
+
+        Returns:
+            list: Entradas registradas, com seu índice no log
+        """
+        with self.lock:
+            entries = self._build_entries(slot, proposal_number, values)
+
+            for entry in entries:
+                if self.segment_file is None or self.segment_entries >= self.segment_size:
+                    self._roll_segment(entry["index"])
+                self.segment_file.write(json.dumps(entry) + "\n")
+                self.segment_entries += 1
+                self.entries.append(entry)
+                self._values_count = entry["index"] + 1
+
+            if self.segment_file is not None:
+                self.segment_file.flush()
+                if self.fsync:
+                    os.fsync(self.segment_file.fileno())
+
+            self.last_applied_slot = slot
+            self.values_since_snapshot += len(entries)
+            return entries
+
+    def _roll_segment(self, first_index):
+        """
+        Fecha o segmento ativo e abre um novo a partir do índice informado.
+        Como em append_slot, o fsync só é feito com fsync habilitado.
+        Deve ser chamado com self.lock adquirido.
+
+        Args:
+            first_index (int): Índice do primeiro valor do novo segmento
+        """
+        if self.segment_file is not None:
+            self.segment_file.flush()
+            if self.fsync:
+                os.fsync(self.segment_file.fileno())
+            self.segment_file.close()
+
+        self.segment_file = open(self._segment_path(first_index), 'a')
+        self.segments.append(first_index)
+        self.segment_entries = 0
+        if self.fsync:
+            _fsync_directory(self.data_dir)
+
+    def read(self, start=0, limit=None):
+        """
+        Lê entradas a partir de um índice, usando a cauda em memória quando
+        possível e os segmentos em disco para entradas mais antigas.
+        Entradas anteriores a base_index foram compactadas e não são retornadas.
+
+        Args:
+            start (int): Primeiro índice desejado
+            limit (int, optional): Quantidade máxima de entradas
+
+        Returns:
+            list: Entradas em ordem
+        """
+        with self.lock:
+            start = max(start, self.base_index)
+            end = self._values_count if limit is None else min(self._values_count, start + limit)
+            if start >= end:
+                return []
+
+            memory_start = self._values_count - len(self.entries)
+            if start >= memory_start:
+                return list(itertools.islice(self.entries, start - memory_start, end - memory_start))
+
+            segments = list(self.segments)
+            if self.segment_file is not None:
+                self.segment_file.flush()
+
+        # Leitura dos segmentos fora do lock para não bloquear o aprendizado
+        result = []
+        for position, first_index in enumerate(segments):
+            next_first = segments[position + 1] if position + 1 < len(segments) else None
+            if next_first is not None and next_first <= start:
+                continue
+            if first_index >= end:
+                break
+            try:
+                entries = self._read_segment(first_index)
+            except FileNotFoundError:
+                # Segmento removido por compactação durante a leitura
+                continue
+            result.extend(entry for entry in entries if start <= entry["index"] < end)
+        return result
+
+    def tail(self, count):
+        """
+        Retorna as últimas entradas do log (apenas da cauda em memória).
+
+        Args:
+            count (int): Quantidade de entradas
+
+        Returns:
+            list: Últimas entradas em ordem
+        """
+        with self.lock:
+            if not count:
+                return []
+            return list(self.entries)[-count:]
+
+    def should_snapshot(self):
+        """
+        Verifica se já foram aprendidos valores suficientes para um snapshot.
+
+        Returns:
+            bool: True se um snapshot deve ser gerado
+        """
+        return self.values_since_snapshot >= self.snapshot_interval
+
+    def snapshot(self):
+        """
+        Grava o progresso do learner e remove segmentos antigos que já não são
+        necessários para manter retain_values entradas em disco.
+        """
+        with self.lock:
+            # O fsync aqui independe da opção fsync: load() confia no values_count
+            # do snapshot, que não pode chegar ao disco antes dos valores que cobre
+            if self.segment_file is not None:
+                self.segment_file.flush()
+                os.fsync(self.segment_file.fileno())
+
+            # Remover segmentos inteiramente anteriores à janela de retenção
+            retain_from = max(self._values_count - self.retain_values, 0)
+            removable = []
+            for position, first_index in enumerate(self.segments[:-1]):
+                if self.segments[position + 1] <= retain_from:
+                    removable.append(first_index)
+            self.segments = self.segments[len(removable):]
+            if self.segments:
+                self.base_index = max(self.base_index, self.segments[0])
+
+            _atomic_write_json(self.snapshot_path, {
+                "last_applied_slot": self.last_applied_slot,
+                "values_count": self._values_count,
+                "base_index": self.base_index,
+                "created_at": time.time()
+            })
+            self.values_since_snapshot = 0
+            self.snapshot_count += 1
+
+        for first_index in removable:
+            try:
+                os.remove(self._segment_path(first_index))
+            except FileNotFoundError:
+                pass
+
+        self.logger.info(f"Snapshot gravado em {self._values_count} valores; {len(removable)} segmentos removidos")
+
+    def stats(self):
+        """
+        Retorna estatísticas do log.
+
+        Returns:
+            dict: Estatísticas
+        """
+        with self.lock:
+            return {
+                "type": "segments",
+                "data_dir": self.data_dir,
+                "values_count": self._values_count,
+                "base_index": self.base_index,
+                "memory_entries": len(self.entries),
+                "segments": len(self.segments),
+                "values_since_snapshot": self.values_since_snapshot,
+                "snapshot_count": self.snapshot_count
+            }
+
+def create_learner_log(node_id):
+    """
+    Cria o log de valores aprendidos conforme as variáveis de ambiente.
+
+    LEARNER_STORAGE: "segments" (padrão) ou "memory"
+    DATA_DIR: diretório base dos arquivos (padrão "data")
+    LEARNER_MEMORY_TAIL: entradas mantidas em memória
+    LEARNER_SEGMENT_SIZE: entradas por segmento
+    LEARNER_SNAPSHOT_INTERVAL: entradas aprendidas entre snapshots
+    LEARNER_RETAIN_VALUES: entradas mínimas mantidas em disco após compactação
+    LEARNER_FSYNC: "true" força fsync a cada slot aprendido
+
+    Args:
+        node_id (int): ID do learner
+
+    Returns:
+        MemoryLearnerLog ou SegmentLearnerLog: Log configurado
+    """
+    storage_type = os.environ.get('LEARNER_STORAGE', 'segments').lower()
+
+    if storage_type == 'memory':
+        return MemoryLearnerLog()
+
+    data_dir = os.path.join(os.environ.get('DATA_DIR', 'data'), f"learner-{node_id}")
+    return SegmentLearnerLog(
+        data_dir,
+        memory_tail=int(os.environ.get('LEARNER_MEMORY_TAIL', 1000)),
+        segment_size=int(os.environ.get('LEARNER_SEGMENT_SIZE', 10000)),
+        snapshot_interval=int(os.environ.get('LEARNER_SNAPSHOT_INTERVAL', 10000)),
+        retain_values=int(os.environ.get('LEARNER_RETAIN_VALUES', 100000)),
+        fsync=os.environ.get('LEARNER_FSYNC', 'false').lower() == 'true'
+    )
@@ -0,0 +1,254 @@
+import os
+import time
+import socket
+import threading
+import logging
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import MetricsRegistry
+from wire import BINARY_PATHS, MSGPACK_MIMETYPE, binary_available, encode, decode
+
+class HttpTransport:
+    """
+    Transporte HTTP compartilhado por todas as chamadas entre nós.
+    Mantém conexões keep-alive em um pool limitado por peer e um cache de
+    resolução DNS, evitando um handshake TCP e uma consulta DNS por mensagem.
+    """
+
+    def __init__(self, logger=None, metrics=None):
+        """
+        Inicializa o transporte.
+
+        Args:
+            logger (Logger, optional): Logger do nó dono do transporte
+            metrics (MetricsRegistry, optional): Registro de métricas do nó
+        """
+        self.logger = logger or logging.getLogger("[Transport]")
+        self.metrics = metrics or MetricsRegistry()
+
+        # Configurações do pool (por peer) e do cache DNS
+        self.pool_peers = int(os.environ.get('HTTP_POOL_PEERS', 64))
+        self.pool_maxsize = int(os.environ.get('HTTP_POOL_MAXSIZE', 16))
+        self.pool_block = os.environ.get('HTTP_POOL_BLOCK', 'false').lower() == 'true'
+        self.dns_ttl = float(os.environ.get('DNS_CACHE_TTL', 30.0))  # segundos
+
+        # requests.Session é segura para uso concorrente desde que não se altere
+        # sua configuração depois de criada; cada peer (ip, porta) tem seu pool
+        self.session = requests.Session()
+        self.session.trust_env = False
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_peers,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # Cache DNS: {hostname: (ip, expira_em)}
+        self.dns_cache = {}
+        self.lock = threading.Lock()
+        
+        # Codificação binária (msgpack) nas rotas entre nós: enviada apenas aos
+        # peers (host:porta) que já responderam em msgpack
+        self.binary = binary_available()
+        self.binary_peers = set()
+
+        # Métricas
+        self.requests_sent = 0
+        self.request_errors = 0
+        self.dns_hits = 0
+        self.dns_misses = 0
+        
+        # Histogramas e contadores por rota e peer (prepare, accept, learn, gossip...)
+        self.rpc_duration = self.metrics.histogram(
+            "paxos_rpc_duration_seconds", "Round trip of requests sent to other nodes", ("path", "peer"))
+        self.rpc_errors = self.metrics.counter(
+            "paxos_rpc_errors_total", "Requests to other nodes that failed without a response", ("path", "peer"))
+        self.rpc_sent_bytes = self.metrics.counter(
+            "paxos_rpc_sent_bytes_total", "Request body bytes sent to other nodes", ("path",))
+        self.rpc_received_bytes = self.metrics.counter(
+            "paxos_rpc_received_bytes_total", "Response body bytes received from other nodes (Content-Length)", ("path",))
+
+    def post(self, url, json=None, timeout=None, **kwargs):
+        """
+        Envia um POST pelo pool de conexões.
+
+        Args:
+            url (str): URL de destino
+            json (dict, optional): Corpo da requisição
+            timeout (float, optional): Timeout em segundos
+
+        Returns:
+            Response: Resposta HTTP
+        """
+        return self.request('POST', url, json=json, timeout=timeout, **kwargs)
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        """
+        Envia um GET pelo pool de conexões.
+
+        Args:
+            url (str): URL de destino
+            params (dict, optional): Parâmetros da query string
+            timeout (float, optional): Timeout em segundos
+
+        Returns:
+            Response: Resposta HTTP
+        """
+        return self.request('GET', url, params=params, timeout=timeout, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        """
+        Envia uma requisição resolvendo o host pelo cache DNS. O cabeçalho Host
+        original é preservado; em erro de conexão a entrada do cache é
+        descartada, pois o peer pode ter mudado de endereço (ex.: pod recriado).
+
+        Args:
+            method (str): Método HTTP
+            url (str): URL de destino
+
+        Returns:
+            Response: Resposta HTTP
+        """
+        original_url, original_kwargs = url, dict(kwargs)
+        parts = urlsplit(url)
+        host = parts.hostname
+        # Em HTTPS o nome é necessário para SNI e validação do certificado
+        ip = self._resolve(host) if parts.scheme == 'http' else host
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        binary = self.binary and parts.path in BINARY_PATHS
+        if binary:
+            headers.setdefault('Accept', f"{MSGPACK_MIMETYPE}, application/json")
+            with self.lock:
+                binary_peer = parts.netloc in self.binary_peers
+            if binary_peer and kwargs.get('json') is not None:
+                kwargs['data'] = encode(kwargs.pop('json'))
+                headers['Content-Type'] = MSGPACK_MIMETYPE
+        if ip != host:
+            netloc = f"{ip}:{parts.port}" if parts.port else ip
+            url = urlunsplit((parts.scheme, netloc, parts.path, parts.query, parts.fragment))
+            headers.setdefault('Host', parts.netloc)
+
+        with self.lock:
+            self.requests_sent += 1
+
+        started_at = time.perf_counter()
+        try:
+            response = self.session.request(method, url, headers=headers, **kwargs)
+        except requests.exceptions.ConnectionError:
+            with self.lock:
+                self.request_errors += 1
+                self.dns_cache.pop(host, None)
+                # O peer pode voltar com outra versão: a codificação é negociada novamente
+                self.binary_peers.discard(parts.netloc)
+            self.rpc_errors.labels(parts.path, parts.netloc).inc()
+            raise
+        except requests.exceptions.RequestException:
+            with self.lock:
+                self.request_errors += 1
+            self.rpc_errors.labels(parts.path, parts.netloc).inc()
+            raise
+
+        if binary:
+            content_type = response.headers.get('Content-Type', '')
+            if content_type.startswith(MSGPACK_MIMETYPE):
+                with self.lock:
+                    self.binary_peers.add(parts.netloc)
+                # Os chamadores usam response.json() independentemente do formato
+                content = response.content
+                response.json = lambda **_: decode(content)
+            elif headers.get('Content-Type') == MSGPACK_MIMETYPE:
+                # O peer respondeu em JSON a um corpo msgpack: deixou de aceitar
+                # msgpack (ex.: reiniciado sem suporte) e a próxima mensagem vai em JSON
+                with self.lock:
+                    self.binary_peers.discard(parts.netloc)
+                # Só é seguro repetir a requisição se o handler não chegou a executar:
+                # 415, ou 400 gerado pelo framework ao decodificar o corpo (página de
+                # erro, não uma resposta do handler). Um 500 pode ter ocorrido depois
+                # de efeitos colaterais e é devolvido ao chamador
+                if response.status_code == 415 or (
+                        response.status_code == 400 and content_type.startswith('text/html')):
+                    return self.request(method, original_url, **original_kwargs)
+        
+        # Tempo até os cabeçalhos da resposta; o corpo de respostas em stream não é aguardado
+        self.rpc_duration.labels(parts.path, parts.netloc).observe(time.perf_counter() - started_at)
+        body = response.request.body
+        if body:
+            self.rpc_sent_bytes.labels(parts.path).inc(len(body))
+        received = response.headers.get('Content-Length')
+        if received and received.isdigit():
+            self.rpc_received_bytes.labels(parts.path).inc(int(received))
+        return response
+
+    def _resolve(self, host):
+        """
+        Resolve um hostname para IP usando o cache com TTL.
+        Endereços IP literais e falhas de resolução são devolvidos sem alteração.
+
+        Args:
+            host (str): Nome de host
+
+        Returns:
+            str: Endereço IP (ou o próprio host)
+        """
+        if not host or self.dns_ttl <= 0 or self._is_ip(host):
+            return host
+
+        now = time.time()
+        with self.lock:
+            cached = self.dns_cache.get(host)
+            if cached and cached[1] > now:
+                self.dns_hits += 1
+                return cached[0]
+            self.dns_misses += 1
+
+        try:
+            ip = socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)[0][4][0]
+        except (socket.gaierror, IndexError) as e:
+            # Deixar a resolução para a própria requisição, que reportará o erro
+            self.logger.debug(f"Falha ao resolver {host}: {e}")
+            return host
+
+        with self.lock:
+            self.dns_cache[host] = (ip, now + self.dns_ttl)
+        return ip
+
+    @staticmethod
+    def _is_ip(host):
+        """Verifica se o host já é um endereço IPv4 ou IPv6 literal"""
+        for family in (socket.AF_INET, socket.AF_INET6):
+            try:
+                socket.inet_pton(family, host)
+                return True
+            except (OSError, ValueError):
+                continue
+        return False
+
+    def stats(self):
+        """
+        Retorna métricas do transporte.
+
+        Returns:
+            dict: Contadores de requisições e do cache DNS
+        """
+        with self.lock:
+            return {
+                "requests_sent": self.requests_sent,
+                "request_errors": self.request_errors,
+                "dns_cache_size": len(self.dns_cache),
+                "dns_hits": self.dns_hits,
+                "dns_misses": self.dns_misses,
+                "pool_peers": self.pool_peers,
+                "pool_maxsize": self.pool_maxsize,
+                "binary_encoding": self.binary,
+                "binary_peers": sorted(self.binary_peers)
+            }
+
+    def close(self):
+        """Fecha todas as conexões do pool"""
+        self.session.close()
@@ -0,0 +1,93 @@
+import os
+
+from flask import Request, Response, request, has_request_context, jsonify as json_response
+from werkzeug.exceptions import BadRequest, UnsupportedMediaType
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Codificação binária das mensagens entre nós, negociada por Content-Type:
+# o remetente anuncia no Accept que entende msgpack; um nó que também entende
+# responde em msgpack e, a partir daí, o remetente passa a enviar os corpos
+# nesse formato para aquele peer. Nós sem suporte respondem em JSON e
+# continuam recebendo JSON, o que mantém clusters com versões mistas funcionando.
+MSGPACK_MIMETYPE = "application/msgpack"
+
+# Rotas de mensagens Paxos e gossip que usam a codificação binária; as rotas
+# voltadas a pessoas (/send, /read, /get-values, /view-logs...) seguem em JSON.
+# /propose e /notify também ficam em JSON: não são idempotentes, e a troca
+# de codificação não deve arriscar reenviar uma proposta ou notificação
+BINARY_PATHS = frozenset({
+    "/prepare", "/accept", "/lease", "/accepted", "/learn", "/heartbeat",
+    "/gossip", "/gossip/delta", "/gossip/ping", "/gossip/ping-req"
+})
+
+def binary_available():
+    """
+    Verifica se este nó deve oferecer a codificação binária (WIRE_FORMAT=auto
+    ou msgpack, com o pacote msgpack instalado).
+
+    Returns:
+        bool: True se msgpack pode ser usado
+    """
+    return msgpack is not None and os.environ.get('WIRE_FORMAT', 'auto').lower() != 'json'
+
+def encode(data):
+    """
+    Codifica uma mensagem em msgpack.
+
+    Args:
+        data: Mensagem (tipos compatíveis com JSON)
+
+    Returns:
+        bytes: Mensagem codificada
+    """
+    return msgpack.packb(data, use_bin_type=True)
+
+def decode(body):
+    """
+    Decodifica uma mensagem msgpack.
+
+    Args:
+        body (bytes): Corpo recebido
+
+    Returns:
+        Mensagem decodificada
+    """
+    return msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+def jsonify(*args, **kwargs):
+    """
+    Substitui flask.jsonify: responde em msgpack quando o remetente declarou
+    aceitá-lo no Accept e este nó tem a codificação binária habilitada, e em
+    JSON nos demais casos.
+
+    Returns:
+        Response: Resposta HTTP
+    """
+    if has_request_context() and MSGPACK_MIMETYPE in request.headers.get('Accept', '') and binary_available():
+        data = args[0] if len(args) == 1 else (list(args) or kwargs)
+        return Response(encode(data), mimetype=MSGPACK_MIMETYPE)
+    return json_response(*args, **kwargs)
+
+class WireRequest(Request):
+    """
+    Requisição do Flask que decodifica corpos msgpack em request.json /
+    request.get_json(), de modo que os handlers tratam os dois formatos igualmente.
+    """
+
+    def get_json(self, force=False, silent=False, cache=True):
+        if self.mimetype != MSGPACK_MIMETYPE:
+            return super().get_json(force=force, silent=silent, cache=cache)
+
+        if not binary_available():
+            # Sem msgpack ou com WIRE_FORMAT=json: o remetente volta para JSON ao receber 415
+            raise UnsupportedMediaType("msgpack is not supported by this node")
+        try:
+            return decode(self.get_data(cache=cache))
+        except Exception:
+            if silent:
+                return None
+            raise BadRequest("Invalid msgpack body")
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Benchmark de vazão e latência de commit do sistema Paxos.
+
+Inicia um cluster local (ou usa um cluster já em execução), envia valores
+pelos clientes aguardando a confirmação de commit e gera um relatório com
+vazão, percentis de latência e mensagens HTTP trocadas por valor confirmado.
+O relatório pode ser gravado em JSON e comparado com o de uma execução anterior.
+
+Uso:
+    python test/benchmark.py --values 5000 --concurrency 8 --output atual.json
+    python test/benchmark.py --values 5000 --compare atual.json
+    python test/benchmark.py --external http://localhost:16001 --nodes http://localhost:13001 ...
+"""
+import os
+import sys
+import json
+import time
+import random
+import string
+import argparse
+import threading
+from collections import Counter
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from local_cluster import add_cluster_arguments, cluster_from_args
+
+def percentile(sorted_values, fraction):
+    """
+    Percentil pelo método do posto mais próximo.
+
+    Args:
+        sorted_values (list): Valores em ordem crescente
+        fraction (float): Percentil entre 0 e 1
+
+    Returns:
+        float: Valor do percentil (0 se a lista estiver vazia)
+    """
+    if not sorted_values:
+        return 0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+class LoadGenerator:
+    """
+    Gerador de carga: workers concorrentes enviam blocos de valores aos
+    clientes e registram o resultado de cada valor.
+    """
+
+    def __init__(self, client_urls, values, concurrency, chunk, value_size, mode, timeout):
+        """
+        Inicializa o gerador.
+
+        Args:
+            client_urls (list): URLs base dos clientes
+            values (int): Quantidade de valores a enviar
+            concurrency (int): Workers concorrentes
+            chunk (int): Valores por requisição no modo stream
+            value_size (int): Tamanho de cada valor em caracteres
+            mode (str): "stream" (/send-stream) ou "send" (/send com wait_for_commit)
+            timeout (float): Prazo de confirmação por valor, em segundos
+        """
+        self.client_urls = client_urls
+        self.values = values
+        self.concurrency = concurrency
+        self.chunk = chunk if mode == "stream" else 1
+        self.value_size = value_size
+        self.mode = mode
+        self.timeout = timeout
+
+        self.lock = threading.Lock()
+        self.next_value = 0
+        self.results = []  # [(status, latência em ms)]
+
+    def _take(self):
+        """Reserva o próximo bloco de valores; retorna a quantidade (0 ao terminar)"""
+        with self.lock:
+            count = min(self.chunk, self.values - self.next_value)
+            start = self.next_value
+            self.next_value += count
+        return start, count
+
+    def _make_value(self, index):
+        """Valor único com o tamanho configurado"""
+        prefix = f"bench-{index}-"
+        padding = "".join(random.choices(string.ascii_lowercase, k=max(0, self.value_size - len(prefix))))
+        return prefix + padding
+
+    def _worker(self, worker_index):
+        """Envia blocos de valores até esgotar a carga"""
+        session = requests.Session()
+        client_url = self.client_urls[worker_index % len(self.client_urls)]
+
+        while True:
+            start, count = self._take()
+            if not count:
+                return
+
+            values = [self._make_value(start + i) for i in range(count)]
+            try:
+                if self.mode == "stream":
+                    acks = self._send_stream(session, client_url, values)
+                else:
+                    acks = [self._send(session, client_url, values[0])]
+            except (requests.RequestException, ValueError) as e:
+                acks = [{"status": "error", "error": str(e)}] * count
+
+            with self.lock:
+                self.results.extend((ack.get("status"), ack.get("commit_latency_ms")) for ack in acks)
+
+    def _send_stream(self, session, client_url, values):
+        """Envia um bloco por /send-stream e lê as confirmações"""
+        body = "".join(json.dumps({"value": value}) + "\n" for value in values)
+        response = session.post(f"{client_url}/send-stream", data=body,
+                                params={"timeout": self.timeout}, stream=True,
+                                timeout=self.timeout + 30)
+        if response.status_code != 200:
+            return [{"status": "error", "error": response.text}] * len(values)
+        return [json.loads(line) for line in response.iter_lines() if line]
+
+    def _send(self, session, client_url, value):
+        """Envia um valor por /send aguardando o commit"""
+        response = session.post(f"{client_url}/send",
+                                json={"value": value, "wait_for_commit": True, "timeout": self.timeout},
+                                timeout=self.timeout + 30)
+        return response.json()
+
+    def run(self):
+        """
+        Executa a carga.
+
+        Returns:
+            float: Duração em segundos
+        """
+        threads = [threading.Thread(target=self._worker, args=(i,), daemon=True)
+                   for i in range(self.concurrency)]
+        started_at = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.time() - started_at
+
+def message_counters(node_urls):
+    """
+    Soma as requisições HTTP enviadas (transport.requests_sent) por papel.
+
+    Args:
+        node_urls (list): URLs base dos nós
+
+    Returns:
+        Counter: {papel: requisições enviadas}
+    """
+    counters = Counter()
+    for url in node_urls:
+        try:
+            status = requests.get(f"{url}/view-logs", timeout=5).json()
+            counters[status["role"]] += status.get("transport", {}).get("requests_sent", 0)
+        except (requests.RequestException, ValueError, KeyError):
+            continue
+    return counters
+
+def build_report(config, duration, results, messages_before, messages_after):
+    """
+    Monta o relatório de uma execução.
+
+    Args:
+        config (dict): Parâmetros da execução
+        duration (float): Duração da carga em segundos
+        results (list): [(status, latência em ms)]
+        messages_before (Counter): Contadores de mensagens antes da carga
+        messages_after (Counter): Contadores de mensagens depois da carga
+
+    Returns:
+        dict: Relatório
+    """
+    statuses = Counter(status for status, _ in results)
+    committed = statuses.get("committed", 0)
+    latencies = sorted(latency for status, latency in results if status == "committed" and latency is not None)
+    messages = {role: messages_after[role] - messages_before.get(role, 0) for role in messages_after}
+    total_messages = sum(messages.values())
+
+    return {
+        "config": config,
+        "duration_s": round(duration, 3),
+        "values_sent": len(results),
+        "statuses": dict(statuses),
+        "throughput_values_per_s": round(committed / duration, 2) if duration else 0,
+        "latency_ms": {
+            "min": latencies[0] if latencies else 0,
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0
+        },
+        "messages": {
+            "total": total_messages,
+            "per_role": messages,
+            "per_committed_value": round(total_messages / committed, 3) if committed else None
+        }
+    }
+
+def print_report(report, baseline=None):
+    """
+    Imprime o relatório e, se informado, a variação em relação a um relatório anterior.
+
+    Args:
+        report (dict): Relatório desta execução
+        baseline (dict, optional): Relatório de referência
+    """
+    rows = [
+        ("Vazão (valores/s)", report["throughput_values_per_s"], lambda r: r["throughput_values_per_s"]),
+        ("Latência p50 (ms)", report["latency_ms"]["p50"], lambda r: r["latency_ms"]["p50"]),
+        ("Latência p90 (ms)", report["latency_ms"]["p90"], lambda r: r["latency_ms"]["p90"]),
+        ("Latência p99 (ms)", report["latency_ms"]["p99"], lambda r: r["latency_ms"]["p99"]),
+        ("Latência máx (ms)", report["latency_ms"]["max"], lambda r: r["latency_ms"]["max"]),
+        ("Mensagens por valor", report["messages"]["per_committed_value"], lambda r: r["messages"]["per_committed_value"])
+    ]
+
+    print(f"\nValores: {report['values_sent']} em {report['duration_s']}s - {report['statuses']}")
+    for label, value, getter in rows:
+        line = f"  {label:<22} {value}"
+        previous = getter(baseline) if baseline else None
+        if previous:
+            line += f"   (referência {previous}, {(value - previous) / previous * 100:+.1f}%)"
+        print(line)
+    print(f"  Mensagens por papel    {report['messages']['per_role']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de vazão e latência de commit")
+    add_cluster_arguments(parser)
+    parser.add_argument("--external", action="append", metavar="URL",
+                        help="URL de um cliente de um cluster já em execução (pode repetir)")
+    parser.add_argument("--nodes", nargs="*", default=[], metavar="URL",
+                        help="com --external: URLs dos nós usados na contagem de mensagens")
+    parser.add_argument("--values", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100, help="valores enviados antes da medição")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mode", choices=("stream", "send"), default="stream")
+    parser.add_argument("--chunk", type=int, default=100, help="valores por requisição no modo stream")
+    parser.add_argument("--value-size", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=10.0, help="prazo de commit por valor (s)")
+    parser.add_argument("--output", help="grava o relatório em JSON")
+    parser.add_argument("--compare", help="relatório JSON de referência")
+    args = parser.parse_args()
+
+    cluster = None
+    if args.external:
+        client_urls, node_urls = args.external, args.nodes
+    else:
+        cluster = cluster_from_args(args)
+        cluster.start()
+
+    try:
+        if cluster:
+            print(f"Iniciando cluster local (logs em {cluster.log_dir})...")
+            leader = cluster.wait_ready()
+            print(f"Cluster pronto, líder: {leader}")
+            client_urls = cluster.urls("client")
+            node_urls = [url for role in ("proposer", "acceptor", "learner", "client") for url in cluster.urls(role)]
+
+        def load(values):
+            return LoadGenerator(client_urls, values, args.concurrency, args.chunk,
+                                 args.value_size, args.mode, args.timeout)
+
+        if args.warmup:
+            load(args.warmup).run()
+
+        messages_before = message_counters(node_urls)
+        generator = load(args.values)
+        duration = generator.run()
+        messages_after = message_counters(node_urls)
+
+        config = {key: getattr(args, key) for key in ("values", "concurrency", "mode", "chunk", "value_size")}
+        if cluster:
+            config.update({key: getattr(args, key) for key in ("proposers", "acceptors", "learners", "clients")})
+            config["env"] = args.env
+        report = build_report(config, duration, generator.results, messages_before, messages_after)
+    finally:
+        if cluster:
+            cluster.stop()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRelatório gravado em {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Cluster Paxos local para testes e benchmarks.
+
+Inicia proposers, acceptors, learners e clientes (as classes de nodes/) como
+processos locais em portas de loopback, cada um com seu NODE_ID e a lista
+completa de SEED_NODES, e aguarda a eleição do líder.
+
+Uso:
+    python test/local_cluster.py --proposers 2 --acceptors 3 --learners 2 --clients 1
+"""
+import os
+import sys
+import time
+import shutil
+import signal
+import argparse
+import tempfile
+import subprocess
+
+import requests
+
+NODES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nodes")
+
+# Porta base de cada papel; o n-ésimo nó do papel usa base + n
+ROLE_PORT_OFFSETS = {
+    "proposer": 1000,
+    "acceptor": 2000,
+    "learner": 3000,
+    "client": 4000
+}
+
+class LocalCluster:
+    """
+    Cluster Paxos executado em processos locais.
+    """
+
+    def __init__(self, proposers=2, acceptors=3, learners=2, clients=1,
+                 base_port=12000, env=None, data_dir=None, log_dir=None):
+        """
+        Inicializa a descrição do cluster.
+
+        Args:
+            proposers (int): Quantidade de proposers
+            acceptors (int): Quantidade de acceptors
+            learners (int): Quantidade de learners
+            clients (int): Quantidade de clientes
+            base_port (int): Porta base (cada papel usa base_port + deslocamento)
+            env (dict, optional): Variáveis de ambiente adicionais para todos os nós
+            data_dir (str, optional): Diretório de dados (padrão: temporário, removido no stop)
+            log_dir (str, optional): Diretório dos logs dos nós (padrão: dentro de data_dir)
+        """
+        self.env = dict(env or {})
+        self.own_data_dir = data_dir is None
+        self.data_dir = data_dir or tempfile.mkdtemp(prefix="paxos-cluster-")
+        self.log_dir = log_dir or os.path.join(self.data_dir, "logs")
+        self.processes = {}
+
+        # IDs sequenciais, na ordem proposers, acceptors, learners, clientes
+        self.nodes = []
+        node_id = 1
+        for role, count in (("proposer", proposers), ("acceptor", acceptors),
+                            ("learner", learners), ("client", clients)):
+            for index in range(count):
+                self.nodes.append({
+                    "id": node_id,
+                    "role": role,
+                    "port": base_port + ROLE_PORT_OFFSETS[role] + index + 1
+                })
+                node_id += 1
+
+    def urls(self, role):
+        """
+        URLs base dos nós de um papel.
+
+        Args:
+            role (str): Papel dos nós
+
+        Returns:
+            list: URLs no formato http://localhost:porta
+        """
+        return [f"http://localhost:{node['port']}" for node in self.nodes if node["role"] == role]
+
+    def start(self):
+        """Inicia todos os nós"""
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        seeds = ",".join(f"{node['id']}:{node['role']}:localhost:{node['port']}" for node in self.nodes)
+        acceptors = ",".join(f"{node['id']}:localhost:{node['port']}"
+                             for node in self.nodes if node["role"] == "acceptor")
+
+        for node in self.nodes:
+            env = dict(os.environ)
+            env.update({
+                "NODE_ID": str(node["id"]),
+                "NODE_ROLE": node["role"],
+                "PORT": str(node["port"]),
+                "HOSTNAME": "localhost",
+                "SEED_NODES": seeds,
+                "ACCEPTORS": acceptors,
+                "DATA_DIR": self.data_dir
+            })
+            env.update({key: str(value) for key, value in self.env.items()})
+
+            log_file = open(os.path.join(self.log_dir, f"{node['role']}-{node['id']}.log"), "w")
+            self.processes[node["id"]] = subprocess.Popen(
+                [sys.executable, "main.py"], cwd=NODES_DIR, env=env,
+                stdout=log_file, stderr=subprocess.STDOUT
+            )
+            log_file.close()
+
+    def wait_ready(self, timeout=90):
+        """
+        Aguarda um proposer ser eleito líder e todos os nós o conhecerem.
+        Antes disso, clientes que ainda não conhecem o líder enviam valores a
+        proposers aleatórios, que disputam a fase 1 com o líder.
+
+        Args:
+            timeout (float): Tempo máximo de espera em segundos
+
+        Returns:
+            int: ID do líder
+
+        Raises:
+            TimeoutError: Se o cluster não ficar pronto a tempo
+            RuntimeError: Se algum processo terminar durante a inicialização
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            for node_id, process in self.processes.items():
+                if process.poll() is not None:
+                    raise RuntimeError(f"Node {node_id} exited with code {process.returncode} (logs in {self.log_dir})")
+
+            leader = self._leader()
+            if leader is not None and all(self._knows_leader(node, leader) for node in self.nodes):
+                return leader
+            time.sleep(1)
+
+        raise TimeoutError(f"Cluster not ready after {timeout}s (logs in {self.log_dir})")
+
+    def _leader(self):
+        """Retorna o ID do proposer que se declara líder, se houver"""
+        for url in self.urls("proposer"):
+            try:
+                status = requests.get(f"{url}/view-logs", timeout=1).json()
+                if status.get("is_leader"):
+                    return status["id"]
+            except (requests.RequestException, ValueError):
+                continue
+        return None
+
+    @staticmethod
+    def _knows_leader(node, leader):
+        """Verifica se o nó responde e reconhece o líder informado"""
+        try:
+            status = requests.get(f"http://localhost:{node['port']}/view-logs", timeout=1).json()
+            return status.get("current_leader") is not None and int(status["current_leader"]) == leader
+        except (requests.RequestException, ValueError):
+            return False
+
+    def view_logs(self):
+        """
+        Coleta o /view-logs de todos os nós.
+
+        Returns:
+            dict: {node_id: resposta do /view-logs, ou None se o nó não respondeu}
+        """
+        result = {}
+        for node in self.nodes:
+            try:
+                result[node["id"]] = requests.get(f"http://localhost:{node['port']}/view-logs", timeout=5).json()
+            except (requests.RequestException, ValueError):
+                result[node["id"]] = None
+        return result
+
+    def stop(self):
+        """Encerra todos os nós e remove o diretório de dados temporário"""
+        for process in self.processes.values():
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+        for process in self.processes.values():
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.processes = {}
+
+        if self.own_data_dir:
+            shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def add_cluster_arguments(parser):
+    """
+    Adiciona os argumentos de tamanho e configuração do cluster.
+
+    Args:
+        parser (ArgumentParser): Parser de argumentos
+    """
+    parser.add_argument("--proposers", type=int, default=2)
+    parser.add_argument("--acceptors", type=int, default=3)
+    parser.add_argument("--learners", type=int, default=2)
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument("--base-port", type=int, default=12000)
+    parser.add_argument("--env", action="append", default=[], metavar="NOME=VALOR",
+                        help="variável de ambiente repassada a todos os nós (pode repetir)")
+    parser.add_argument("--log-dir", help="diretório dos logs dos nós")
+
+def cluster_from_args(args):
+    """
+    Cria o cluster descrito pelos argumentos da linha de comando.
+
+    Args:
+        args (Namespace): Argumentos de add_cluster_arguments
+
+    Returns:
+        LocalCluster: Cluster (ainda não iniciado)
+    """
+    env = dict(item.split("=", 1) for item in args.env)
+    return LocalCluster(args.proposers, args.acceptors, args.learners, args.clients,
+                        base_port=args.base_port, env=env, log_dir=args.log_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa um cluster Paxos local até Ctrl+C")
+    add_cluster_arguments(parser)
+    args = parser.parse_args()
+
+    cluster = cluster_from_args(args)
+    cluster.start()
+    try:
+        print(f"Aguardando eleição de líder (logs em {cluster.log_dir})...")
+        leader = cluster.wait_ready()
+        print(f"Cluster pronto, líder: {leader}")
+        for role in ROLE_PORT_OFFSETS:
+            print(f"  {role}: {' '.join(cluster.urls(role))}")
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cluster.stop()
+
+if __name__ == "__main__":
+    main()
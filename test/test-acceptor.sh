@@ -0,0 +1,37 @@
+#!/bin/bash
+
+# Cores para output
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+RED='\033[0;31m'
+BLUE='\033[0;34m'
+GRAY='\033[0;37m'
+NC='\033[0m' # No Color
+
+# Testes individuais do Acceptor: executados no próprio processo, sem cluster
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+TESTS=(
+    "test/test_acceptor.py"
+    "test/test_storage.py::WALAcceptorStoreTest"
+    "test/test_outbox.py"
+)
+
+echo -e "\n${BLUE}═════════════════════════════════════════════════════════════════${NC}"
+echo -e "${BLUE}              TESTES DO ACCEPTOR              ${NC}"
+echo -e "${BLUE}═════════════════════════════════════════════════════════════════${NC}"
+
+if ! python3 -m pytest --version &> /dev/null; then
+    echo -e "${RED}[ERRO] pytest não encontrado. Instale com: pip install pytest${NC}"
+    exit 1
+fi
+
+cd "$SCRIPT_DIR/.." || exit 1
+echo -e "${YELLOW}Executando: ${GRAY}python3 -m pytest -q ${TESTS[*]} $*${NC}"
+
+if python3 -m pytest -q "${TESTS[@]}" "$@"; then
+    echo -e "\n${GREEN}✅ TODOS OS TESTES DO ACCEPTOR PASSARAM${NC}"
+else
+    status=$?
+    echo -e "\n${RED}⚠️ EXISTEM TESTES DO ACCEPTOR FALHANDO${NC}"
+    exit $status
+fi
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Testes da compactação do log do acceptor (nodes/acceptor_node.py).
+O acceptor é criado no próprio processo com armazenamento em memória, sem
+servidor nem gossip iniciados; as mensagens são entregues diretamente aos
+manipuladores.
+
+Uso:
+    python -m pytest test/test_acceptor.py
+    python test/test_acceptor.py
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nodes"))
+from acceptor_node import Acceptor
+
+ENV = {
+    "NODE_ID": "3",
+    "ACCEPTORS": "3:127.0.0.1:1,4:127.0.0.1:2,5:127.0.0.1:3",
+    "ACCEPTOR_STORAGE": "memory",
+    "ACCEPTOR_LOG_RETENTION": "2"
+}
+
+class CompactionTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(os.environ, ENV):
+            self.acceptor = Acceptor()
+        for slot in range(1, 11):
+            self._accept(slot)
+
+    def _accept(self, slot, proposal_number=10):
+        with self.acceptor.app.app_context():
+            response, _ = self.acceptor._handle_accept({
+                "proposer_id": 1, "proposal_number": proposal_number, "slot": slot,
+                "value": [{"value": f"v{slot}", "client_id": 9}], "client_id": None})
+        return response.get_json()
+
+    def _gossip(self, node_id, role, version=1, **metadata):
+        entry = {"id": node_id, "role": role, "address": "127.0.0.1", "port": 6000 + node_id,
+                 "generation": 1, "version": version, "heartbeat": 1, "age": 0, "metadata": metadata}
+        with self.acceptor.gossip.lock:
+            self.acceptor.gossip._merge_nodes({str(node_id): entry})
+
+    def test_watermark_waits_for_every_learner_and_proposer(self):
+        self._gossip(7, "learner", last_learned_slot=9)
+        self.assertEqual(self.acceptor._compaction_watermark(), 0)
+
+        # Um proposer que ainda não publicou recovery_floor_slot impede a compactação
+        self._gossip(1, "proposer")
+        self.assertLessEqual(self.acceptor._compaction_watermark(), 0)
+
+        self._gossip(1, "proposer", version=2, recovery_floor_slot=8)
+        self._gossip(8, "learner", last_learned_slot=6)
+        self.assertEqual(self.acceptor._compaction_watermark(), 6 - 2)
+
+    def test_compacted_slots_leave_the_log_and_the_promise(self):
+        self.acceptor._compact_log(4)
+
+        self.assertEqual(sorted(self.acceptor.accepted_log), list(range(5, 11)))
+        with self.acceptor.lock:
+            promise = self.acceptor._build_promise(1)
+        self.assertEqual(promise["compacted_slot"], 4)
+        self.assertEqual([entry["slot"] for entry in promise["accepted"]], list(range(5, 11)))
+
+        # Um slot decidido e compactado não aceita outro valor, nem com número maior
+        result = self._accept(3, proposal_number=20)
+        self.assertEqual((result["status"], result["compacted_slot"]), ("rejected", 4))
+        self.assertEqual(self.acceptor.highest_promised_number, 10)
+
+    def test_view_logs_lists_only_recent_slots(self):
+        self.acceptor._compact_log(4)
+        with self.acceptor.app.app_context():
+            response, _ = self.acceptor._handle_view_logs()
+        view = response.get_json()
+        self.assertEqual((view["accepted_slots_count"], view["compacted_slot"]), (6, 4))
+        self.assertEqual([entry["slot"] for entry in view["recent_accepted"]], list(range(5, 11)))
+
+if __name__ == "__main__":
+    unittest.main()
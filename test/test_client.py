@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Testes das notificações de commit do cliente (nodes/client_node.py).
+O cliente é criado no próprio processo, sem servidor nem gossip iniciados;
+as notificações dos learners são entregues diretamente ao manipulador.
+
+Uso:
+    python -m pytest test/test_client.py
+    python test/test_client.py
+"""
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nodes"))
+from client_node import Client
+
+ENV = {
+    "NODE_ID": "9",
+    "CLIENT_DEDUP_WINDOW": "3"
+}
+
+def _learned(slot, batch_index, value):
+    """Notificação no formato enviado pelos learners"""
+    return {"proposal_number": 10, "slot": slot, "batch_index": batch_index, "value": value,
+            "learned_at": "2024-01-01 00:00:00"}
+
+class ClientTestCase(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(os.environ, ENV):
+            self.client = Client()
+
+    def _notify(self, learner_id, *notifications):
+        with self.client.app.app_context():
+            response, status = self.client._handle_notify({"learner_id": learner_id,
+                                                           "notifications": list(notifications)})
+        self.assertEqual(status, 200)
+        return response.get_json()["count"]
+
+class DedupTest(ClientTestCase):
+    def test_same_position_from_another_learner_is_dropped(self):
+        self.assertEqual(self._notify(5, _learned(1, 0, "a"), _learned(1, 1, "b")), 2)
+        self.assertEqual(self._notify(6, _learned(1, 1, "b"), _learned(1, 0, "a")), 0)
+
+        self.assertEqual([entry["value"] for entry in self.client.responses], ["a", "b"])
+        self.assertEqual(self.client.notifications_received, 4)
+        self.assertEqual(self.client.duplicates_dropped, 2)
+        self.assertEqual(self.client.session_slot, 1)
+
+    def test_same_value_in_another_position_is_kept(self):
+        # O mesmo valor enviado duas vezes é decidido em posições distintas
+        self.assertEqual(self._notify(5, _learned(1, 0, "a"), _learned(2, 0, "a"), _learned(1, 0, "a")), 2)
+        self.assertEqual([(entry["slot"], entry["value"]) for entry in self.client.responses], [(1, "a"), (2, "a")])
+        self.assertEqual(self.client.session_slot, 2)
+
+    def test_notifications_without_position_are_not_deduplicated(self):
+        legacy = [{"proposal_number": 10, "value": value} for value in ("a", "b", "c")]
+        self.assertEqual(self._notify(5, *legacy), 3)
+        self.assertEqual(self._notify(5, _learned(None, 0, "d"), _learned(2, None, "e")), 2)
+
+        self.assertEqual([entry["value"] for entry in self.client.responses], ["a", "b", "c", "d", "e"])
+        self.assertEqual((self.client.duplicates_dropped, len(self.client.seen_notifications)), (0, 0))
+
+    def test_window_keeps_only_recent_positions(self):
+        self._notify(5, *[_learned(slot, 0, f"v{slot}") for slot in (1, 2, 3, 4)])
+        self.assertEqual(list(self.client.seen_notifications), [(2, 0), (3, 0), (4, 0)])
+
+        # Uma posição mais antiga que a janela é aceita novamente
+        self.assertEqual(self._notify(6, _learned(1, 0, "v1"), _learned(4, 0, "v4")), 1)
+
+class WaiterTest(ClientTestCase):
+    def _sent(self, value, slot, batch_index):
+        """Registra um envio e simula a resposta do proposer com a posição do valor"""
+        waiter = self.client._add_waiter(value)
+        with mock.patch.object(self.client, "_propose",
+                               return_value=({"status": "value sent", "slot": slot, "batch_index": batch_index}, 200)):
+            self.client._propose_for_waiter(waiter)
+        return waiter
+
+    def test_notification_resolves_the_send_at_its_position(self):
+        first = self._sent("a", 1, 0)
+        second = self._sent("a", 2, 0)
+
+        self._notify(5, _learned(2, 0, "a"))
+        self.assertFalse(first["future"].done())
+        self.assertEqual(second["future"].result(0)["slot"], 2)
+
+        # A repetição por outro learner não resolve outro envio do mesmo valor
+        self._notify(6, _learned(2, 0, "a"))
+        self.assertFalse(first["future"].done())
+
+    def test_notification_before_the_proposer_reply(self):
+        waiter = self.client._add_waiter("a")
+        self._notify(5, _learned(3, 1, "a"))
+        self.assertEqual(waiter["future"].result(0)["slot"], 3)
+
+        # Outro envio do mesmo valor não é confirmado pela notificação já recebida
+        other = self._sent("a", 4, 0)
+        self.assertFalse(other["future"].done())
+        self.assertEqual(self.client.position_waiters, {(4, 0): other})
+
+class SessionReadTest(ClientTestCase):
+    def setUp(self):
+        super().setUp()
+        learner = {"id": 5, "role": "learner", "address": "127.0.0.1", "port": 5005, "generation": 1,
+                   "version": 1, "heartbeat": 1, "age": 0, "metadata": {}}
+        with self.client.gossip.lock:
+            self.client.gossip._merge_nodes({"5": learner})
+        self.client.transport = mock.Mock()
+        self.client.transport.get.return_value = mock.Mock(status_code=200, json=lambda: {"values": []})
+
+    def _send(self, value, slot):
+        with self.client.app.app_context(), \
+                mock.patch.object(self.client, "_propose",
+                                  return_value=({"status": "value sent", "slot": slot, "batch_index": 0}, 200)):
+            _, status = self.client._handle_send({"value": value})
+        self.assertEqual(status, 200)
+
+    def _read(self):
+        with self.client.app.app_context():
+            response, status = self.client._handle_read({"consistency": "session"})
+        return status, self.client.transport.get.call_args.kwargs["params"] if status == 200 else None
+
+    def test_session_read_right_after_send_includes_the_write(self):
+        self._send("a", 3)
+
+        # O commit é notificado enquanto a leitura aguarda
+        timer = threading.Timer(0.1, self._notify, (5, _learned(4, 0, "a")))
+        timer.start()
+        status, params = self._read()
+        timer.join()
+
+        self.assertEqual(status, 200)
+        self.assertEqual(params["min_slot"], 4)
+        self.assertEqual(self.client.session_sends[0]["future"].result(0)["slot"], 4)
+
+    def test_uncommitted_send_fails_the_session_read(self):
+        self.client.commit_timeout = 0.1
+        self._send("a", 3)
+        self.assertEqual(self._read()[0], 504)
+
+        # Expirado o prazo, o envio deixa de bloquear as leituras de sessão
+        status, params = self._read()
+        self.assertEqual(status, 200)
+        self.assertNotIn("min_slot", params)
+        self.assertEqual((list(self.client.session_sends), dict(self.client.value_waiters)), ([], {}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Testes do protocolo gossip e da detecção de falhas SWIM (nodes/gossip_protocol.py).
+O protocolo é criado sem threads nem rotas; as mensagens são entregues
+diretamente aos manipuladores e o transporte é substituído por um simulado.
+
+Uso:
+    python -m pytest test/test_gossip.py
+    python test/test_gossip.py
+"""
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nodes"))
+from flask import Flask
+from gossip_protocol import GossipProtocol
+
+def _entry(node_id, role="acceptor", version=1, heartbeat=1, metadata=None):
+    """Entrada de nó no formato enviado pelo gossip"""
+    return {"id": node_id, "role": role, "address": "127.0.0.1", "port": 6000 + node_id,
+            "metadata": metadata or {}, "generation": 1, "version": version,
+            "heartbeat": heartbeat, "age": 0}
+
+class GossipTestCase(unittest.TestCase):
+    def setUp(self):
+        self.transport = mock.Mock()
+        self.gossip = GossipProtocol(1, "proposer", "127.0.0.1", 5001, transport=self.transport)
+
+    def _add(self, *entries):
+        with self.gossip.lock:
+            self.gossip._merge_nodes({str(entry["id"]): entry for entry in entries})
+
+class RoleIndexTest(GossipTestCase):
+    def test_nodes_are_indexed_by_role(self):
+        self._add(_entry(2), _entry(3), _entry(5, role="learner"))
+        self.assertEqual(set(self.gossip.get_nodes_by_role("acceptor")), {"2", "3"})
+        self.assertEqual(set(self.gossip.get_nodes_by_role("learner")), {"5"})
+        self.assertEqual(set(self.gossip.get_nodes_by_role("proposer")), {"1"})
+        self.assertEqual(dict(self.gossip.get_nodes_by_role("client")), {})
+
+    def test_published_view_does_not_change_under_readers(self):
+        self._add(_entry(5, role="learner"))
+        view = self.gossip.get_all_nodes()
+        seen = view["5"]["last_seen"]
+
+        # Heartbeat mais recente e metadados locais mudam as entradas em known_nodes
+        time.sleep(0.01)
+        self._add(_entry(5, role="learner", heartbeat=5))
+        self.gossip.update_local_metadata({"is_leader": True})
+
+        self.assertEqual(view["5"]["last_seen"], seen)
+        self.assertEqual(view["1"]["metadata"], {})
+        self.assertTrue(self.gossip.get_all_nodes()["1"]["metadata"]["is_leader"])
+
+    def test_local_metadata_does_not_rebuild_the_index(self):
+        self._add(_entry(2), _entry(5, role="learner"))
+        before = self.gossip.get_all_nodes()
+
+        # Metadados atualizados a cada accept: só a entrada local é republicada
+        with mock.patch.object(self.gossip, "_refresh_views", wraps=self.gossip._refresh_views) as refresh:
+            for slot in range(1, 4):
+                self.gossip.update_local_metadata({"last_accepted_slot": slot})
+                self.assertEqual(self.gossip.get_nodes_by_role("proposer")["1"]["metadata"]["last_accepted_slot"], slot)
+        refresh.assert_not_called()
+
+        after = self.gossip.get_all_nodes()
+        self.assertIs(after["2"], before["2"])
+        self.assertIs(self.gossip.get_nodes_by_role("learner")["5"], before["5"])
+        self.assertEqual(before["1"]["metadata"], {})
+
+    def test_expired_node_leaves_the_index(self):
+        self._add(_entry(2))
+        with self.gossip.lock:
+            self.gossip.known_nodes["2"]["last_seen"] -= self.gossip.node_timeout + 1
+            self.gossip._schedule_expiry("2")
+        self.assertNotIn("2", self.gossip.get_nodes_by_role("acceptor"))
+
+class DigestTest(GossipTestCase):
+    def setUp(self):
+        super().setUp()
+        self._add(_entry(2), _entry(3, version=2), _entry(5, role="learner", heartbeat=4))
+        self.app = Flask(__name__)
+
+    def _gossip(self, digest):
+        with self.app.app_context():
+            response, status = self.gossip._handle_gossip({"sender_id": 9, "sender_role": "client",
+                                                           "digest": digest})
+        self.assertEqual(status, 200)
+        return response.get_json()
+
+    def test_digest_is_answered_with_deltas_heartbeats_and_requests(self):
+        result = self._gossip({
+            "2": [1, 1, 3, 0],  # mesma versão, heartbeat mais recente no remetente
+            "3": [1, 1, 1, 0],  # versão anterior à local
+            "5": [1, 1, 1, 0],  # mesma versão, heartbeat anterior ao local
+            "6": [1, 1, 1, 0],  # desconhecido aqui
+        })
+
+        # Apenas as entradas que o remetente não tem ou tem desatualizadas seguem completas
+        self.assertEqual(set(result["nodes"]), {"1", "3"})
+        self.assertEqual(result["nodes"]["3"]["version"], 2)
+        self.assertEqual(result["heartbeats"], {"5": [4, mock.ANY]})
+        self.assertEqual(result["request"], ["6"])
+        # O heartbeat mais recente do digest é incorporado sem pedir a entrada
+        self.assertEqual(self.gossip.known_nodes["2"]["heartbeat"], 3)
+
+    def test_up_to_date_digest_gets_an_empty_answer(self):
+        with self.gossip.lock:
+            digest = self.gossip._build_digest()
+        result = self._gossip(digest)
+        self.assertEqual((result["nodes"], result["heartbeats"], result["request"]), ({}, {}, []))
+
+    def test_ack_merges_deltas_and_sends_the_requested_entries(self):
+        target = {"id": 9}
+        self.gossip._handle_gossip_ack(target, "http://127.0.0.1:6009/gossip", {
+            "nodes": {"3": _entry(3, version=3, metadata={"x": 1}), "6": _entry(6)},
+            "heartbeats": {"2": [7, 0]},
+            "request": ["5", "8"],
+        })
+
+        nodes = self.gossip.get_all_nodes()
+        self.assertEqual(nodes["3"]["metadata"], {"x": 1})
+        self.assertIn("6", nodes)
+        self.assertEqual(self.gossip.known_nodes["2"]["heartbeat"], 7)
+
+        url = self.transport.post.call_args.args[0]
+        sent = self.transport.post.call_args.kwargs["json"]
+        self.assertEqual(url, "http://127.0.0.1:6009/gossip/delta")
+        self.assertEqual(set(sent["nodes"]), {"5"})
+        self.assertEqual(sent["nodes"]["5"]["heartbeat"], 4)
+
+    def test_delta_keeps_only_newer_versions(self):
+        with self.app.app_context():
+            response, status = self.gossip._handle_gossip_delta({"sender_id": 9, "nodes": {
+                "2": _entry(2, version=2, metadata={"x": 1}),
+                "3": _entry(3, version=1, metadata={"x": 2}),
+                "1": _entry(1, version=99),
+            }})
+        self.assertEqual(status, 200)
+        self.assertEqual(response.get_json()["updates"], 1)
+
+        nodes = self.gossip.get_all_nodes()
+        self.assertEqual(nodes["2"]["metadata"], {"x": 1})
+        self.assertEqual(nodes["3"]["metadata"], {})
+        self.assertEqual(nodes["1"]["role"], "proposer")
+
+    def test_entries_the_sender_no_longer_sees_are_ignored(self):
+        stale = dict(_entry(6), age=self.gossip.node_timeout + 1)
+        self._add(stale)
+        self.assertNotIn("6", self.gossip.get_all_nodes())
+
+    def test_delta_without_sender_is_rejected(self):
+        with self.app.app_context():
+            _, status = self.gossip._handle_gossip_delta({"nodes": {"6": _entry(6)}})
+        self.assertEqual(status, 400)
+        self.assertNotIn("6", self.gossip.get_all_nodes())
+
+class SwimTest(GossipTestCase):
+    def setUp(self):
+        super().setUp()
+        self._add(_entry(2), _entry(3), _entry(4, role="proposer"))
+
+    def _expire(self, node_id):
+        """Faz a suspeita do nó vencer sem esperar o prazo"""
+        with self.gossip.lock:
+            self.gossip.member_status[node_id]["since"] -= self.gossip._current_suspicion_timeout()
+        self.gossip._expire_suspicions()
+
+    def test_suspicion_window_scales_with_log_of_the_cluster_size(self):
+        interval = self.gossip.probe_interval
+        with self.gossip.lock:
+            self.assertEqual(self.gossip._current_suspicion_timeout(), 4 * interval)
+
+        # Com 100 membros, o prazo dobra
+        self._add(*[_entry(node_id) for node_id in range(10, 106)])
+        with self.gossip.lock:
+            self.assertAlmostEqual(self.gossip._current_suspicion_timeout(), 8 * interval)
+
+    def test_unanswered_probes_suspect_the_member(self):
+        self.transport.post.side_effect = ConnectionError("unreachable")
+        self.gossip._probe(self.gossip.get_all_nodes()["2"])
+
+        self.assertEqual(self.gossip.member_status["2"]["status"], "suspect")
+        # Sondagem direta e pedidos indiretos aos outros membros
+        paths = [call.args[0].rsplit("/", 1)[-1] for call in self.transport.post.call_args_list]
+        self.assertEqual(paths.count("ping"), 1)
+        self.assertEqual(paths.count("ping-req"), 2)
+
+    def test_unrefuted_suspicion_declares_the_member_dead(self):
+        self.gossip.set_leader(4)
+        with self.gossip.lock:
+            self.gossip._suspect("4")
+        self._expire("4")
+
+        self.assertNotIn("4", self.gossip.get_all_nodes())
+        self.assertIn("4", self.gossip.dead_nodes)
+        self.assertIsNone(self.gossip.get_leader())
+        self.assertEqual(self.gossip.swim_updates["4"][0]["status"], "dead")
+
+        # O gossip não traz o nó de volta sem um heartbeat posterior à declaração
+        self._add(_entry(4, role="proposer"))
+        self.assertNotIn("4", self.gossip.get_all_nodes())
+        self._add(_entry(4, role="proposer", heartbeat=2))
+        self.assertIn("4", self.gossip.get_all_nodes())
+
+    def test_alive_with_higher_incarnation_refutes_the_suspicion(self):
+        with self.gossip.lock:
+            self.gossip._suspect("2")
+            self.gossip._apply_swim_update({"id": 2, "status": "alive", "incarnation": 1})
+        self._expire("2")
+
+        self.assertEqual(self.gossip.member_status["2"]["status"], "alive")
+        self.assertIn("2", self.gossip.get_all_nodes())
+
+    def test_node_refutes_suspicion_about_itself(self):
+        with self.gossip.lock:
+            self.gossip._apply_swim_update({"id": 1, "status": "suspect", "incarnation": 0})
+
+        self.assertEqual(self.gossip.incarnation, 1)
+        self.assertEqual(self.gossip.swim_updates["1"][0], {"id": "1", "status": "alive", "incarnation": 1})
+
+        # A refutação segue no próximo ping
+        self.transport.post.return_value = mock.Mock(status_code=200, json=lambda: {"updates": []})
+        self.gossip._ping(self.gossip.get_all_nodes()["2"], 0.1)
+        sent = self.transport.post.call_args.kwargs["json"]
+        self.assertIn({"id": "1", "status": "alive", "incarnation": 1}, sent["updates"])
+
+class LeaderHoldTest(GossipTestCase):
+    def setUp(self):
+        super().setUp()
+        self._add(_entry(4, role="proposer"))
+        self.gossip.set_leader(4)
+
+    def _suspect_and_expire(self):
+        with self.gossip.lock:
+            self.gossip._suspect("4")
+            self.gossip.member_status["4"]["since"] -= self.gossip._current_suspicion_timeout()
+        self.gossip._expire_suspicions()
+
+    def test_leader_with_valid_lease_stays_suspect(self):
+        self.gossip.hold_leader(4, 60)
+        self._suspect_and_expire()
+
+        self.assertIn("4", self.gossip.get_all_nodes())
+        self.assertEqual(self.gossip.member_status["4"]["status"], "suspect")
+        self.assertEqual(self.gossip.get_leader(), 4)
+
+        # Lease expirada: a próxima verificação declara o líder morto
+        with self.gossip.lock:
+            self.gossip.leader_hold = ("4", time.monotonic() - 1)
+        self.gossip._expire_suspicions()
+        self.assertNotIn("4", self.gossip.get_all_nodes())
+        self.assertIsNone(self.gossip.get_leader())
+
+    def test_hold_of_another_node_does_not_protect_the_leader(self):
+        self.gossip.hold_leader(2, 60)
+        self._suspect_and_expire()
+        self.assertNotIn("4", self.gossip.get_all_nodes())
+
+if __name__ == "__main__":
+    unittest.main()
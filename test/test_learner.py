@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Testes da aplicação de slots e do catch-up do learner (nodes/learner_node.py).
+O learner é criado no próprio processo, sem servidor nem gossip iniciados;
+as notificações dos acceptors são entregues diretamente aos manipuladores.
+
+Uso:
+    python -m pytest test/test_learner.py
+    python test/test_learner.py
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nodes"))
+from base_node import NOOP_VALUE
+from learner_node import Learner
+
+ENV = {
+    "NODE_ID": "7",
+    "ACCEPTORS": "3:127.0.0.1:1,4:127.0.0.1:2,5:127.0.0.1:3",
+    "LEARNER_STORAGE": "memory"
+}
+
+class LearnerTestCase(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(os.environ, ENV):
+            self.learner = Learner()
+
+    def _decide(self, slot, value, proposal_number=10):
+        """Entrega o accept de um quórum de acceptors para o slot"""
+        entry = {"proposal_number": proposal_number, "slot": slot, "value": value, "client_id": None}
+        with self.learner.lock:
+            for acceptor_id in (3, 4):
+                self.learner._record_acceptance(acceptor_id, entry, self.learner.acceptor_config.phase2_quorum())
+            self.learner._apply_decided_slots()
+
+    def _gossip(self, node_id, role, **metadata):
+        """Registra no gossip um nó com os metadados informados"""
+        entry = {"id": node_id, "role": role, "address": "127.0.0.1", "port": 6000 + node_id,
+                 "generation": 1, "version": 1, "heartbeat": 1, "age": 0, "metadata": metadata}
+        with self.learner.gossip.lock:
+            self.learner.gossip._merge_nodes({str(node_id): entry})
+
+    def _published(self):
+        return self.learner.gossip.get_node_info(str(self.learner.node_id))["metadata"]
+
+class ApplyTest(LearnerTestCase):
+    def test_noop_slot_publishes_progress(self):
+        self._decide(1, [{"value": "a", "client_id": None}])
+        self._decide(2, NOOP_VALUE)
+
+        self.assertEqual(self.learner.last_applied_slot, 2)
+        metadata = self._published()
+        self.assertEqual(metadata["last_learned_slot"], 2)
+        self.assertEqual(metadata["learned_values_count"], 1)
+        self.assertEqual(metadata["last_learned_value"], "a")
+
+    def test_out_of_order_slots_wait_for_the_gap(self):
+        self._decide(2, [{"value": "b", "client_id": None}])
+        self.assertEqual(self.learner.last_applied_slot, 0)
+
+        self._decide(1, NOOP_VALUE)
+        self.assertEqual(self.learner.last_applied_slot, 2)
+        self.assertEqual(self._published()["last_learned_slot"], 2)
+
+class CatchUpTargetTest(LearnerTestCase):
+    def test_slots_accepted_by_acceptors_are_not_a_target(self):
+        # Slot 9 aceito por uma minoria pode nunca ser decidido
+        self._gossip(3, "acceptor", last_accepted_slot=9)
+        self._decide(1, NOOP_VALUE)
+        self.assertLessEqual(self.learner._catch_up_target(), self.learner.last_applied_slot)
+
+    def test_decided_evidence_sets_the_target(self):
+        self._gossip(8, "learner", last_learned_slot=5, learned_values_count=4)
+        self.assertEqual(self.learner._catch_up_target(), 5)
+
+        # Slot decidido depois de uma lacuna
+        self._decide(7, [{"value": "c", "client_id": None}])
+        self.assertEqual(self.learner._catch_up_target(), 7)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Testes das filas de saída por peer (nodes/outbox.py).
+O pool de workers é substituído por executores de teste que executam as
+tarefas sob demanda ou recusam agendamentos.
+
+Uso:
+    python -m pytest test/test_outbox.py
+    python test/test_outbox.py
+"""
+import os
+import sys
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nodes"))
+from outbox import PeerOutbox
+
+class ManualExecutor:
+    """Executor de teste: guarda as tarefas até run(); recusa as primeiras `reject`"""
+
+    def __init__(self, reject=0):
+        self.tasks = []
+        self.reject = reject
+
+    def submit(self, fn, *args):
+        if self.reject > 0:
+            self.reject -= 1
+            return None
+        self.tasks.append((fn, args))
+        return True
+
+    def run(self):
+        while self.tasks:
+            fn, args = self.tasks.pop(0)
+            fn(*args)
+
+class Peer:
+    """Peer de teste: registra os lotes recebidos e falha as primeiras `failures` entregas"""
+
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+        self.delivered = threading.Event()
+
+    def send(self, peer_id, messages, timeout):
+        if self.failures > 0:
+            self.failures -= 1
+            return False
+        self.batches.append(list(messages))
+        self.delivered.set()
+        return True
+
+class PeerOutboxTest(unittest.TestCase):
+    def _outbox(self, peer, executor, **kwargs):
+        kwargs.setdefault("base_timeout", 0.001)
+        return PeerOutbox("9", peer.send, executor, **kwargs)
+
+    def test_messages_queued_during_a_send_are_batched(self):
+        peer, executor = Peer(), ManualExecutor()
+        outbox = self._outbox(peer, executor, max_batch=2)
+        for i in range(5):
+            outbox.enqueue(i)
+
+        # Uma única tarefa de entrega por vez, independentemente do número de mensagens
+        self.assertEqual(len(executor.tasks), 1)
+        executor.run()
+        self.assertEqual(peer.batches, [[0, 1], [2, 3], [4]])
+        self.assertTrue(outbox.is_idle())
+        self.assertEqual(outbox.stats()["batches"], 3)
+
+    def test_failed_send_is_retried(self):
+        peer, executor = Peer(failures=2), ManualExecutor()
+        outbox = self._outbox(peer, executor, max_retries=3)
+        outbox.enqueue("a")
+        executor.run()
+
+        self.assertEqual(peer.batches, [["a"]])
+        self.assertEqual(outbox.stats()["failed"], 0)
+
+    def test_batch_is_dropped_after_the_last_retry(self):
+        peer, executor = Peer(failures=3), ManualExecutor()
+        outbox = self._outbox(peer, executor, max_retries=3)
+        outbox.enqueue("a")
+        executor.run()
+        outbox.enqueue("b")
+        executor.run()
+
+        self.assertEqual(peer.batches, [["b"]])
+        self.assertEqual((outbox.stats()["failed"], outbox.stats()["consecutive_failures"]), (1, 0))
+
+    def test_oldest_messages_are_dropped_when_the_queue_is_full(self):
+        peer, executor = Peer(), ManualExecutor()
+        outbox = self._outbox(peer, executor, max_queue=2, max_batch=10)
+        for i in range(4):
+            outbox.enqueue(i)
+        executor.run()
+
+        self.assertEqual(peer.batches, [[2, 3]])
+        self.assertEqual(outbox.stats()["dropped"], 2)
+
+    def test_delivery_refused_by_a_full_pool_is_rescheduled(self):
+        peer, executor = Peer(), ManualExecutor(reject=2)
+        outbox = self._outbox(peer, executor, reschedule_delay=0.01)
+        outbox.enqueue("last")
+
+        # Sem novas mensagens, o reagendamento entrega a que ficou na fila
+        self.assertFalse(outbox.is_idle())
+        for _ in range(100):
+            if executor.tasks:
+                break
+            time.sleep(0.01)
+        executor.run()
+        self.assertTrue(peer.delivered.is_set())
+        self.assertEqual(peer.batches, [["last"]])
+        self.assertEqual(outbox.stats()["stalls"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
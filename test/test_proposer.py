@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Testes do pipeline e da recuperação do proposer (nodes/proposer_node.py).
+O proposer é criado no próprio processo, sem servidor nem gossip iniciados;
+os envios aos acceptors ficam registrados e as respostas são entregues
+diretamente aos manipuladores.
+
+Uso:
+    python -m pytest test/test_proposer.py
+    python test/test_proposer.py
+"""
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+from urllib.parse import urlsplit, parse_qs
+
+from flask import request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nodes"))
+from proposer_node import Proposer
+
+ENV = {
+    "NODE_ID": "1",
+    "ACCEPTORS": "3:127.0.0.1:1,4:127.0.0.1:2,5:127.0.0.1:3",
+    "LEADER_LEASE_DURATION": "0"
+}
+
+class RecordingExecutor:
+    """Executor de teste: guarda as tarefas em vez de executá-las"""
+
+    def __init__(self):
+        self.tasks = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.tasks.append((fn.__name__, args))
+        return True
+
+    def take(self, name):
+        """Remove e retorna os argumentos das tarefas de uma função"""
+        taken = [args for fn, args in self.tasks if fn == name]
+        self.tasks = [task for task in self.tasks if task[0] != name]
+        return taken
+
+class ProposerTestCase(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(os.environ, ENV):
+            self.proposer = Proposer()
+        self.proposer.executor = RecordingExecutor()
+
+    def _lead(self):
+        """Torna o proposer líder sem valores aceitos anteriormente"""
+        with self.proposer.lock:
+            self.proposer._establish_leadership(self.proposer._next_proposal_number(), [], 1)
+            return self.proposer.leader_proposal_number
+
+    def _propose(self, *values):
+        with self.proposer.lock:
+            return self.proposer._submit_proposal([{"value": v, "client_id": 9} for v in values], None)
+
+    def _answer_accepts(self, result, slot=None):
+        """Entrega a mesma resposta a todos os accepts pendentes (de um slot)"""
+        for acceptor_id, url, data, collector, instance_id in self.proposer.executor.take("_send_accept_with_retry"):
+            if slot is not None and data["slot"] != slot:
+                self.proposer.executor.tasks.append(("_send_accept_with_retry",
+                                                     (acceptor_id, url, data, collector, instance_id)))
+                continue
+            with self.proposer.lock:
+                self.proposer._on_accept_response(collector, instance_id, acceptor_id, data, dict(result))
+
+    def _answer_prepares(self, result):
+        prepares = self.proposer.executor.take("_send_prepare_with_retry")
+        for url, data, collector, instance_id in prepares:
+            with self.proposer.lock:
+                self.proposer._on_prepare_response(collector, instance_id, data["proposal_number"], dict(result))
+        return [args[1] for args in prepares]
+
+class BallotTest(ProposerTestCase):
+    def test_rejected_accept_raises_the_next_ballot(self):
+        ballot = self._lead()
+        self._propose("a")
+
+        # Outro proposer obteve promessa maior que a do líder
+        higher = ballot + 1000
+        self._answer_accepts({"status": "rejected", "message": "Already promised", "promised_number": higher})
+
+        prepares = self._answer_prepares({"status": "promise", "accepted": []})
+        self.assertTrue(prepares)
+        self.assertGreater(prepares[0]["proposal_number"], higher)
+        self.assertGreater(self.proposer.leader_proposal_number, higher)
+
+    def test_rejected_prepare_raises_the_next_ballot(self):
+        self._propose("a")
+        first = self._answer_prepares({"status": "rejected", "message": "Already promised",
+                                       "promised_number": 10 ** 15})
+        self.assertLess(first[0]["proposal_number"], 10 ** 15)
+
+        # O valor volta para a fila e a nova fase 1 supera a promessa reportada
+        retry = self._answer_prepares({"status": "promise", "accepted": []})
+        self.assertGreater(retry[0]["proposal_number"], 10 ** 15)
+
+    def test_timeout_keeps_the_ballot(self):
+        ballot = self._lead()
+        instance = self._propose("a")
+        self.proposer.executor.take("_send_accept_with_retry")
+        with self.proposer.lock:
+            self.proposer._fail_instance(instance["id"], "timeout")
+
+        # Sem nova fase 1: o slot é reenviado com o mesmo número
+        self.assertEqual(self.proposer.executor.take("_send_prepare_with_retry"), [])
+        retried = self.proposer.executor.take("_send_accept_with_retry")
+        self.assertEqual({(args[2]["slot"], args[2]["proposal_number"]) for args in retried}, {(1, ballot)})
+        self.assertEqual(self.proposer.leader_proposal_number, ballot)
+
+class PinnedSlotTest(ProposerTestCase):
+    def _accepts(self):
+        """Accepts pendentes como [(slot, valores)], sem removê-los"""
+        return [(args[2]["slot"], [entry["value"] for entry in args[2]["value"]]
+                 if isinstance(args[2]["value"], list) else args[2]["value"])
+                for fn, args in self.proposer.executor.tasks if fn == "_send_accept_with_retry"]
+
+    def _fail_all(self, reason="timeout", rejected=False):
+        with self.proposer.lock:
+            for instance_id in list(self.proposer.instances):
+                self.proposer._fail_instance(instance_id, reason, rejected)
+
+    def test_failed_instance_keeps_its_slot(self):
+        self._lead()
+        self._propose("a")
+        self.proposer.executor.take("_send_accept_with_retry")
+        self._fail_all()
+        self._answer_prepares({"status": "promise", "accepted": []})
+
+        # O lote é reenviado no slot 1; nenhum outro slot recebe o mesmo valor
+        self.assertEqual(self._accepts(), [(1, ["a"]) for _ in range(3)])
+        self.assertEqual(self.proposer.next_slot, 2)
+        self.assertEqual(list(self.proposer.proposal_queue), [])
+
+    def test_value_accepted_in_the_slot_is_not_duplicated(self):
+        self._lead()
+        self._propose("a")
+        sent = self.proposer.executor.take("_send_accept_with_retry")[0][2]
+        self._fail_all()
+
+        # Um acceptor aceitou o lote no slot 1: a recuperação reenvia o mesmo lote
+        accepted = {key: sent[key] for key in ("slot", "proposal_number", "value", "client_id")}
+        self._answer_prepares({"status": "promise", "accepted": [accepted]})
+        self._answer_accepts({"status": "accepted"})
+
+        self.assertEqual(self.proposer.committed_log.values_count, 1)
+        self.assertEqual([entry["value"] for entry in self.proposer.committed_log.read(0)], ["a"])
+        self.assertEqual(self.proposer.executor.take("_send_accept_with_retry"), [])
+        self.assertEqual(list(self.proposer.proposal_queue), [])
+
+    def test_displaced_batch_waits_for_the_slot_decision(self):
+        self._lead()
+        self._propose("a")
+        self.proposer.executor.take("_send_accept_with_retry")
+        self._fail_all("rejected", rejected=True)
+
+        # Outro proposer decidiu "b" no slot 1 com número maior
+        other = {"slot": 1, "proposal_number": 10, "value": [{"value": "b", "client_id": 8}], "client_id": None}
+        self._answer_prepares({"status": "promise", "accepted": [other]})
+        self.assertEqual(self._accepts(), [(1, ["b"]) for _ in range(3)])
+
+        # "a" só vai para um novo slot depois que o slot 1 é decidido
+        self._answer_accepts({"status": "accepted"})
+        self.assertEqual(self._accepts(), [(2, ["a"]) for _ in range(3)])
+        self._answer_accepts({"status": "accepted"})
+        self.assertEqual([entry["value"] for entry in self.proposer.committed_log.read(0)], ["b", "a"])
+
+    def test_in_flight_slots_move_to_the_new_ballot(self):
+        ballot = self._lead()
+        self._propose("a")
+        self._propose("b")
+
+        # O accept do slot 1 é rejeitado; o do slot 2 continua em andamento
+        self._answer_accepts({"status": "rejected", "message": "Already promised",
+                              "promised_number": ballot + 1}, slot=1)
+        self._answer_prepares({"status": "promise", "accepted": []})
+
+        # Cada slot recebe uma única proposta, com o novo número
+        pending = [args[2] for fn, args in self.proposer.executor.tasks if fn == "_send_accept_with_retry"]
+        current = [(data["slot"], data["value"][0]["value"]) for data in pending
+                   if data["proposal_number"] == self.proposer.leader_proposal_number]
+        self.assertEqual(sorted(set(current)), [(1, "a"), (2, "b")])
+        self.assertEqual(len(self.proposer.instances), 2)
+        self._answer_accepts({"status": "accepted"})
+        self.assertEqual([entry["value"] for entry in self.proposer.committed_log.read(0)], ["a", "b"])
+
+    def test_compacted_slots_are_not_recovered(self):
+        self._lead()
+        self._propose("a")
+        self.proposer.executor.take("_send_accept_with_retry")
+        self._fail_all("rejected", rejected=True)
+
+        # Os acceptors já compactaram o slot 1: ele não é reproposto, nem com no-op
+        self._answer_prepares({"status": "promise", "accepted": [], "compacted_slot": 3})
+        self.assertEqual(self._accepts(), [])
+        self.assertEqual(self.proposer.next_slot, 4)
+
+        self._propose("b")
+        self.assertEqual(self._accepts(), [(4, ["b"]) for _ in range(3)])
+
+class AcceptRoundTest(ProposerTestCase):
+    def _answer(self, sends, *results):
+        for (acceptor_id, url, data, collector, instance_id), result in zip(sends, results):
+            with self.proposer.lock:
+                self.proposer._on_accept_response(collector, instance_id, acceptor_id, data, result)
+
+    def test_slot_is_decided_without_the_slowest_acceptor(self):
+        self._lead()
+        self._propose("a")
+        sends = self.proposer.executor.take("_send_accept_with_retry")
+
+        self._answer(sends, {"status": "accepted"}, {"status": "unreachable"})
+        self.assertEqual(self.proposer.committed_log.values_count, 0)
+        self._answer(sends[2:], {"status": "accepted"})
+        self.assertEqual([entry["value"] for entry in self.proposer.committed_log.read(0)], ["a"])
+        self.assertEqual(self.proposer.instances, {})
+
+        # O envio que ainda não começou é abandonado sem chegar ao acceptor
+        self.proposer.transport = mock.Mock()
+        self.proposer._send_accept_with_retry(*sends[0])
+        self.proposer.transport.post.assert_not_called()
+
+    def test_unreachable_majority_fails_the_instance_early(self):
+        ballot = self._lead()
+        instance = self._propose("a")
+        sends = self.proposer.executor.take("_send_accept_with_retry")
+
+        self._answer(sends, {"status": "unreachable"}, {"status": "unreachable"})
+        self.assertNotIn(instance["id"], self.proposer.instances)
+
+        # Sem rejeição, o slot é reenviado com o mesmo número
+        retried = self.proposer.executor.take("_send_accept_with_retry")
+        self.assertEqual({(args[2]["slot"], args[2]["proposal_number"]) for args in retried}, {(1, ballot)})
+
+    def test_acceptor_answering_twice_counts_once(self):
+        self._lead()
+        self._propose("a")
+        sends = self.proposer.executor.take("_send_accept_with_retry")
+        self._answer(sends, {"status": "accepted"}, {"status": "unreachable"}, {"status": "unreachable"})
+
+        # O slot é reenviado com o mesmo número e o mesmo acceptor aceita de novo
+        resent = self.proposer.executor.take("_send_accept_with_retry")
+        self.assertEqual(resent[0][0], sends[0][0])
+        self._answer(resent, {"status": "accepted"})
+        self.assertEqual(self.proposer.committed_log.values_count, 0)
+
+        # Um segundo acceptor completa o quórum da fase 2
+        self._answer(resent[1:], {"status": "accepted"})
+        self.assertEqual([entry["value"] for entry in self.proposer.committed_log.read(0)], ["a"])
+
+class LeaseReadTest(ProposerTestCase):
+    def setUp(self):
+        super().setUp()
+        ballot = self._lead()
+        self.proposer.gossip.set_leader(self.proposer.node_id)
+        self.proposer.lease_duration = 3.0
+        self.proposer.lease_proposal_number = ballot
+        self.proposer.lease_expires = time.monotonic() + 60
+
+    def _read(self, **args):
+        with self.proposer.app.test_request_context("/read", query_string=args):
+            response = self.proposer._handle_read(request.args)
+        return response if isinstance(response, tuple) else (response, response.status_code)
+
+    def test_read_served_from_the_leader_state(self):
+        self._propose("a", "b")
+        self._answer_accepts({"status": "accepted"})
+
+        response, status = self._read()
+        self.assertEqual(status, 200)
+        self.assertEqual(response.get_json()["values"], ["a", "b"])
+
+    def test_values_applied_only_by_learners_are_redirected(self):
+        # Um learner aplicou até o slot 4 (6 valores) antes deste líder
+        learner = {"id": 8, "role": "learner", "address": "127.0.0.1", "port": 5008, "generation": 1,
+                   "version": 1, "heartbeat": 1, "age": 0,
+                   "metadata": {"last_learned_slot": 4, "learned_values_count": 6}}
+        with self.proposer.lock:
+            self.proposer.gossip._merge_nodes({"8": learner})
+            self.proposer._decided_slot()
+
+        response, status = self._read(offset=0, limit=10)
+        self.assertEqual(status, 307)
+        location = urlsplit(response.headers["Location"])
+        self.assertEqual((location.port, location.path), (5008, "/get-values"))
+        self.assertEqual(parse_qs(location.query), {"offset": ["0"], "limit": ["10"], "min_slot": ["4"]})
+
+        # A cauda mantida pelo líder continua sendo servida localmente
+        response, status = self._read(offset=6)
+        self.assertEqual((status, response.get_json()["values"]), (200, []))
+
+if __name__ == "__main__":
+    unittest.main()
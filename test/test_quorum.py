@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Testes da coleta de respostas das rodadas de prepare, accept e lease (nodes/quorum.py).
+
+Uso:
+    python -m pytest test/test_quorum.py
+    python test/test_quorum.py
+"""
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nodes"))
+from quorum import QuorumCollector, PENDING, QUORUM, IMPOSSIBLE, ABANDONED
+
+class QuorumCollectorTest(unittest.TestCase):
+    def test_resolves_as_soon_as_the_quorum_acks(self):
+        collector = QuorumCollector(5, 3)
+        self.assertFalse(collector.ack())
+        self.assertFalse(collector.nack())
+        self.assertFalse(collector.ack())
+        self.assertFalse(collector.done)
+
+        # A terceira resposta positiva resolve a rodada sem esperar as demais
+        self.assertTrue(collector.ack())
+        self.assertEqual(collector.wait(0), QUORUM)
+        self.assertIsNotNone(collector.resolved_at)
+
+    def test_enough_nacks_make_the_quorum_impossible(self):
+        collector = QuorumCollector(5, 3)
+        self.assertFalse(collector.nack())
+        self.assertFalse(collector.nack())
+        self.assertTrue(collector.nack())
+        self.assertEqual(collector.wait(0), IMPOSSIBLE)
+
+    def test_late_responses_do_not_change_the_outcome(self):
+        collector = QuorumCollector(3, 2)
+        collector.ack()
+        collector.ack()
+
+        # Respostas de envios já em andamento são contadas, mas não resolvem de novo
+        self.assertFalse(collector.nack())
+        self.assertFalse(collector.ack())
+        self.assertEqual(collector.stats(), {"acks": 3, "nacks": 1, "quorum": 2, "total": 3, "outcome": QUORUM})
+
+    def test_abandon_releases_waiters_and_pending_sends(self):
+        collector = QuorumCollector(3, 2)
+        outcome = []
+        waiter = threading.Thread(target=lambda: outcome.append(collector.wait(5)))
+        waiter.start()
+
+        collector.abandon()
+        waiter.join(1)
+        self.assertEqual(outcome, [ABANDONED])
+
+        # O backoff de um envio pendente acorda e não tenta de novo
+        started = time.monotonic()
+        self.assertFalse(collector.sleep(5))
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertFalse(collector.ack())
+        self.assertEqual(collector.outcome, ABANDONED)
+
+    def test_abandon_keeps_a_resolved_outcome(self):
+        collector = QuorumCollector(1, 1)
+        collector.ack()
+        collector.abandon()
+        self.assertEqual(collector.outcome, QUORUM)
+
+    def test_wait_times_out_while_pending(self):
+        collector = QuorumCollector(3, 2)
+        self.assertEqual(collector.wait(0.01), PENDING)
+        self.assertTrue(collector.sleep(0.01))
+
+if __name__ == "__main__":
+    unittest.main()
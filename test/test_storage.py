@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Testes de recuperação dos armazenamentos duráveis (nodes/storage.py).
+
+Uso:
+    python -m pytest test/test_storage.py
+    python test/test_storage.py
+"""
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nodes"))
+from storage import WALAcceptorStore, SegmentLearnerLog, MemoryLearnerLog
+
+class WALAcceptorStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="paxos-wal-test-")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def _open(self):
+        store = WALAcceptorStore(self.data_dir)
+        return store, store.load()
+
+    def _append(self, store, record):
+        self.assertTrue(store.wait_durable(store.append(record), timeout=5))
+
+    def test_torn_tail_is_truncated_before_new_records(self):
+        store, _ = self._open()
+        self._append(store, {"type": "promise", "proposal_number": 5})
+        self._append(store, {"type": "accept", "proposal_number": 5, "slot": 1, "value": "a", "client_id": 1})
+        store.close()
+
+        # Queda no meio da gravação de um registro
+        with open(store.wal_path, "a") as f:
+            f.write('{"type": "accept", "proposal_num')
+
+        store, state = self._open()
+        self.assertEqual(state["highest_promised_number"], 5)
+        self.assertEqual(set(state["accepted_log"]), {1})
+        self._append(store, {"type": "accept", "proposal_number": 7, "slot": 2, "value": "b", "client_id": 1})
+        store.close()
+
+        store, state = self._open()
+        store.close()
+        self.assertEqual(state["highest_promised_number"], 7)
+        self.assertEqual(state["accepted_log"][2]["value"], "b")
+        self.assertEqual(state["accepted_log"][2]["proposal_number"], 7)
+        self.assertEqual(state["last_accepted_slot"], 2)
+
+    def test_record_without_newline_is_treated_as_torn(self):
+        store, _ = self._open()
+        self._append(store, {"type": "promise", "proposal_number": 3})
+        store.close()
+
+        # JSON válido, mas sem a quebra de linha final: gravação interrompida
+        with open(store.wal_path, "a") as f:
+            f.write('{"type": "promise", "proposal_number": 9}')
+
+        store, state = self._open()
+        self._append(store, {"type": "promise", "proposal_number": 4})
+        store.close()
+        self.assertEqual(state["highest_promised_number"], 3)
+
+        store, state = self._open()
+        store.close()
+        self.assertEqual(state["highest_promised_number"], 4)
+
+    def test_records_after_the_rotation_survive_the_snapshot(self):
+        store, _ = self._open()
+        self._append(store, {"type": "accept", "proposal_number": 5, "slot": 1, "value": "a", "client_id": 1})
+        seq = store.rotate()
+        state = {"highest_promised_number": 5, "accepted_proposal_number": 5,
+                 "accepted_log": {1: {"proposal_number": 5, "value": "a", "client_id": 1}}}
+
+        # Accept recebido entre a cópia do estado e a gravação do snapshot
+        self._append(store, {"type": "accept", "proposal_number": 6, "slot": 2, "value": "b", "client_id": 1})
+        store.snapshot(state, seq)
+        self.assertEqual(store._rotated_wals(), [])
+        store.close()
+
+        store, state = self._open()
+        store.close()
+        self.assertEqual(set(state["accepted_log"]), {1, 2})
+        self.assertEqual(state["highest_promised_number"], 6)
+
+    def test_rotated_wal_is_replayed_if_the_snapshot_did_not_finish(self):
+        store, _ = self._open()
+        self._append(store, {"type": "promise", "proposal_number": 5})
+        store.rotate()
+        store.close()
+
+        # Queda antes do snapshot: o WAL rotacionado ainda é reaplicado
+        store, state = self._open()
+        self.assertEqual(state["highest_promised_number"], 5)
+        self._append(store, {"type": "promise", "proposal_number": 7})
+        seq = store.rotate()
+        store.snapshot({"highest_promised_number": 7, "accepted_proposal_number": 0, "accepted_log": {}}, seq)
+
+        # A numeração continua após a do WAL anterior, que é coberto e removido
+        self.assertEqual(store._rotated_wals(), [])
+        store.close()
+
+    def test_compaction_survives_replay_and_snapshot(self):
+        store, _ = self._open()
+        for slot in (1, 2, 3):
+            self._append(store, {"type": "accept", "proposal_number": 5, "slot": slot, "value": "a", "client_id": 1})
+        self._append(store, {"type": "compact", "slot": 2})
+        store.close()
+
+        store, state = self._open()
+        self.assertEqual((set(state["accepted_log"]), state["compacted_slot"]), ({3}, 2))
+        seq = store.rotate()
+        store.snapshot(state, seq)
+        store.close()
+
+        store, state = self._open()
+        store.close()
+        self.assertEqual((set(state["accepted_log"]), state["compacted_slot"]), ({3}, 2))
+        self.assertEqual(state["last_accepted_slot"], 3)
+
+    def test_failed_fsync_is_not_reported_durable(self):
+        store, _ = self._open()
+        self._append(store, {"type": "promise", "proposal_number": 3})
+
+        # O disco volta a aceitar fsync apenas depois de liberado
+        healthy = threading.Event()
+        fsync = os.fsync
+        def flaky_fsync(fd):
+            if not healthy.is_set():
+                raise OSError(5, "Input/output error")
+            fsync(fd)
+
+        with mock.patch("storage.os.fsync", side_effect=flaky_fsync):
+            ticket = store.append({"type": "accept", "proposal_number": 5, "slot": 1, "value": "a", "client_id": 1})
+            self.assertFalse(store.wait_durable(ticket, timeout=0.3))
+            self.assertGreater(store.stats()["write_errors"], 0)
+            # O lote não confirmado não fica no WAL
+            with open(store.wal_path) as f:
+                self.assertEqual(len(f.readlines()), 1)
+
+            healthy.set()
+            self.assertTrue(store.wait_durable(ticket, timeout=5))
+        self._append(store, {"type": "promise", "proposal_number": 7})
+        store.close()
+
+        # O lote regravado aparece uma única vez e os registros seguintes não se perdem
+        with open(store.wal_path) as f:
+            self.assertEqual(len(f.readlines()), 3)
+        store, state = self._open()
+        store.close()
+        self.assertEqual(state["accepted_log"][1]["value"], "a")
+        self.assertEqual(state["highest_promised_number"], 7)
+
+class SegmentLearnerLogTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp(prefix="paxos-segment-test-")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def _open(self):
+        log = SegmentLearnerLog(self.data_dir, segment_size=100)
+        return log, log.load()
+
+    @staticmethod
+    def _close(log):
+        # O log não tem close: basta fechar o segmento ativo
+        log.segment_file.close()
+
+    def test_torn_tail_is_truncated_before_new_entries(self):
+        log, _ = self._open()
+        log.append_slot(1, 5, [{"value": "a", "client_id": 1}, {"value": "b", "client_id": 1}])
+        self._close(log)
+
+        with open(log._segment_path(0), "a") as f:
+            f.write('{"index": 2, "slot"')
+
+        log, state = self._open()
+        self.assertEqual(state, {"last_applied_slot": 1, "values_count": 2})
+        log.append_slot(2, 5, [{"value": "c", "client_id": 1}])
+        self._close(log)
+
+        log, state = self._open()
+        self.assertEqual(state, {"last_applied_slot": 2, "values_count": 3})
+        self.assertEqual([entry["value"] for entry in log.read(0)], ["a", "b", "c"])
+        self._close(log)
+
+    def test_rolling_segments_honours_the_fsync_flag(self):
+        for fsync in (False, True):
+            log = SegmentLearnerLog(os.path.join(self.data_dir, str(fsync)), segment_size=1, fsync=fsync)
+            log.load()
+            with mock.patch("storage.os.fsync") as synced:
+                log.append_slot(1, 5, [{"value": "a", "client_id": 1}, {"value": "b", "client_id": 1}])
+            self._close(log)
+            self.assertEqual(len(log.segments), 2)
+            self.assertEqual(synced.called, fsync)
+
+class MemoryLearnerLogTest(unittest.TestCase):
+    def test_advance_to_skips_values_applied_elsewhere(self):
+        log = MemoryLearnerLog()
+        log.append_slot(1, 5, [{"value": "a", "client_id": 1}])
+        log.advance_to(4, 10)
+        self.assertEqual((log.last_applied_slot, log.values_count), (4, 10))
+
+        # Slot já aplicado não faz o log recuar
+        log.advance_to(2, 3)
+        self.assertEqual((log.last_applied_slot, log.values_count), (4, 10))
+
+        log.append_slot(5, 5, [{"value": "b", "client_id": 1}])
+        self.assertEqual([(entry["index"], entry["value"]) for entry in log.read(0)], [(10, "b")])
+
+if __name__ == "__main__":
+    unittest.main()
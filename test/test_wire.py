@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Testes da negociação da codificação msgpack (nodes/wire.py e nodes/transport.py).
+As respostas dos peers são simuladas no lugar da sessão HTTP do transporte;
+o lado do servidor usa o cliente de teste do Flask.
+
+Uso:
+    python -m pytest test/test_wire.py
+    python test/test_wire.py
+"""
+import os
+import sys
+import json
+import unittest
+from unittest import mock
+
+import requests
+from flask import Flask, request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "nodes"))
+from wire import MSGPACK_MIMETYPE, WireRequest, jsonify, encode, decode
+from transport import HttpTransport
+
+PEER = "http://127.0.0.1:9001"
+
+def _response(status, body, content_type):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers["Content-Type"] = content_type
+    response.request = requests.Request("POST", PEER).prepare()
+    return response
+
+class FakeSession:
+    """Sessão de teste: registra as requisições e devolve as respostas da fila"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.sent.append({"headers": headers, **kwargs})
+        return self.responses.pop(0)
+
+class NegotiationTest(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(os.environ, {"WIRE_FORMAT": "auto"}):
+            self.transport = HttpTransport()
+
+    def _post(self, *responses, path="/accept"):
+        self.transport.session = FakeSession(*responses)
+        response = self.transport.post(PEER + path, json={"slot": 1}, timeout=1)
+        return response, self.transport.session.sent
+
+    def _negotiate(self):
+        self._post(_response(200, encode({"status": "accepted"}), MSGPACK_MIMETYPE))
+
+    def test_msgpack_only_after_the_peer_answers_in_msgpack(self):
+        response, sent = self._post(_response(200, encode({"status": "accepted"}), MSGPACK_MIMETYPE))
+        self.assertEqual(sent[0]["json"], {"slot": 1})
+        self.assertIn(MSGPACK_MIMETYPE, sent[0]["headers"]["Accept"])
+        self.assertEqual(response.json(), {"status": "accepted"})
+
+        _, sent = self._post(_response(200, encode({"status": "accepted"}), MSGPACK_MIMETYPE))
+        self.assertEqual(sent[0]["headers"]["Content-Type"], MSGPACK_MIMETYPE)
+        self.assertEqual(decode(sent[0]["data"]), {"slot": 1})
+
+    def test_unsupported_media_type_is_resent_as_json(self):
+        self._negotiate()
+        response, sent = self._post(_response(415, b"<p>no msgpack</p>", "text/html"),
+                                    _response(200, b'{"status": "accepted"}', "application/json"))
+        self.assertEqual(len(sent), 2)
+        self.assertEqual(sent[1]["json"], {"slot": 1})
+        self.assertEqual(response.json(), {"status": "accepted"})
+        self.assertEqual(self.transport.stats()["binary_peers"], [])
+
+    def test_decode_failure_is_resent_as_json(self):
+        self._negotiate()
+        _, sent = self._post(_response(400, b"<p>Invalid msgpack body</p>", "text/html"),
+                             _response(200, b'{"status": "accepted"}', "application/json"))
+        self.assertEqual(len(sent), 2)
+
+    def test_handler_errors_are_not_resent(self):
+        self._negotiate()
+        response, sent = self._post(_response(500, b"<p>Internal Server Error</p>", "text/html"))
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(response.status_code, 500)
+
+        # A próxima mensagem renegocia em JSON
+        _, sent = self._post(_response(200, b'{"status": "accepted"}', "application/json"))
+        self.assertEqual(sent[0]["json"], {"slot": 1})
+
+    def test_non_idempotent_routes_stay_in_json(self):
+        self._negotiate()
+        for path in ("/propose", "/notify"):
+            _, sent = self._post(_response(200, b'{"status": "ok"}', "application/json"), path=path)
+            self.assertEqual(sent[0]["json"], {"slot": 1})
+            self.assertNotIn("Accept", sent[0]["headers"])
+
+class ServerTest(unittest.TestCase):
+    def setUp(self):
+        app = Flask(__name__)
+        app.request_class = WireRequest
+
+        @app.route("/accept", methods=["POST"])
+        def accept():
+            return jsonify({"echo": request.json})
+
+        self.client = app.test_client()
+
+    def _post(self):
+        return self.client.post("/accept", data=encode({"slot": 1}),
+                                headers={"Content-Type": MSGPACK_MIMETYPE, "Accept": MSGPACK_MIMETYPE})
+
+    def test_msgpack_body_and_reply(self):
+        with mock.patch.dict(os.environ, {"WIRE_FORMAT": "auto"}):
+            response = self._post()
+        self.assertEqual(response.mimetype, MSGPACK_MIMETYPE)
+        self.assertEqual(decode(response.data), {"echo": {"slot": 1}})
+
+    def test_json_only_node_rejects_msgpack(self):
+        with mock.patch.dict(os.environ, {"WIRE_FORMAT": "json"}):
+            response = self._post()
+        self.assertEqual(response.status_code, 415)
+
+        with mock.patch.dict(os.environ, {"WIRE_FORMAT": "json"}):
+            response = self.client.post("/accept", json={"slot": 1}, headers={"Accept": MSGPACK_MIMETYPE})
+        self.assertEqual(json.loads(response.data), {"echo": {"slot": 1}})
+
+if __name__ == "__main__":
+    unittest.main()